@@ -0,0 +1,78 @@
+"""
+Session user resolution from a cached snapshot.
+
+``AuthenticationMiddleware`` resolves ``request.user`` through the backend
+stored in the session, and ``ModelBackend.get_user`` reads the ``User`` row
+on every request. ``CachedModelBackend`` keeps a snapshot of the user in the
+cache instead, stored under a per-user version (see ``backend.core.versioning``).
+User saves and deletes and logouts bump that version. A password change is a
+save, and Django also checks the snapshot's session auth hash against the
+session, so sessions from before the change stop working.
+
+``QuerySet.update()`` sends no signals, so a user changed that way (say,
+deactivated by a script) is served from the snapshot until it expires after
+``CACHE_TIMEOUT``; call ``invalidate_cached_user`` to apply it at once.
+
+The snapshot leaves out the password hash: it holds the session auth hash
+Django checks on every request instead, and the password field is deferred,
+so code that needs it loads it from the database.
+"""
+
+import copy
+from typing import Optional
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from backend.core.versioning import bump_version, get_version
+
+CACHE_TIMEOUT = 60
+
+
+def _snapshot(user):
+    snapshot = copy.copy(user)
+    del snapshot.__dict__["password"]
+    return snapshot, user.get_session_auth_hash()
+
+
+class _SessionAuthHash:
+    """
+    ``get_session_auth_hash`` of a restored snapshot: the cached hash, until
+    the password is loaded (or changed) and can be hashed again.
+    """
+
+    def __init__(self, user, session_auth_hash: str):
+        self.user = user
+        self.session_auth_hash = session_auth_hash
+
+    def __call__(self) -> str:
+        if "password" in self.user.__dict__:
+            return type(self.user).get_session_auth_hash(self.user)
+        return self.session_auth_hash
+
+
+def _restore(user, session_auth_hash):
+    user.get_session_auth_hash = _SessionAuthHash(user, session_auth_hash)
+    return user
+
+
+def _version_key(user_id) -> str:
+    return f"auth-user-version:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = f"auth-user:{user_id}:{get_version(_version_key(user_id))}"
+        cached = cache.get(key)
+        if cached is not None:
+            return _restore(*cached)
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, _snapshot(user), CACHE_TIMEOUT)
+        return user
+
+
+def invalidate_cached_user(user_id: Optional[int]) -> None:
+    """Make the next request of ``user_id`` reload the user row."""
+    if user_id is not None:
+        bump_version(_version_key(user_id))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import models
+
+
+class ApiToken(models.Model):
+    """
+    Personal access token for scripted clients.
+
+    Only a keyed hash of the token is stored (see ``tokens.hash_token``);
+    the unique index on it makes authentication a single indexed lookup.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="api_tokens",
+    )
+    name = models.CharField(max_length=100, help_text="What the token is for")
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    prefix = models.CharField(
+        max_length=12, editable=False, help_text="Start of the token, for display"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}…)"
@@ -1,8 +1,17 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from .models import ApiToken
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ("id", "username", "email", "is_superuser", "is_staff")
+
+
+class ApiTokenSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApiToken
+        fields = ("id", "name", "prefix", "created_at", "last_used_at")
+        read_only_fields = ("prefix", "created_at", "last_used_at")
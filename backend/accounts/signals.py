@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_cached_user
+from .models import ApiToken
+from .tokens import forget_token
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_user_on_logout(sender, request, user, **kwargs):
+    invalidate_cached_user(getattr(user, "pk", None))
+
+
+@receiver(post_delete, sender=ApiToken)
+def forget_revoked_token(sender, instance, **kwargs):
+    forget_token(instance.key_hash)
@@ -0,0 +1,115 @@
+"""
+Tests for resolving session users from the cached user snapshot.
+"""
+
+import pickle
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from backend.accounts.backends import CachedModelBackend
+
+IDENTITY_URL = "/api/accounts/identity/"
+
+
+def _user_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if '"auth_user"' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_warm_identity_and_api_reads_make_no_user_queries(client):
+    assert client.get(IDENTITY_URL).json()["authenticated"] is True
+    with CaptureQueriesContext(connection) as ctx:
+        identity = client.get(IDENTITY_URL)
+        questions = client.get("/api/questions/")
+    assert identity.json()["user"]["username"] == "slugtestuser"
+    assert questions.status_code == 200
+    assert _user_queries(ctx) == []
+
+
+@pytest.mark.django_db
+def test_identity_needs_no_queries_at_all(client):
+    client.get(IDENTITY_URL)
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(IDENTITY_URL)
+    assert ctx.captured_queries == []
+
+
+@pytest.mark.django_db
+def test_user_updates_show_up_immediately(client, user):
+    client.get(IDENTITY_URL)
+    user.email = "new@example.com"
+    user.save()
+    assert client.get(IDENTITY_URL).json()["user"]["email"] == "new@example.com"
+
+
+@pytest.mark.django_db
+def test_password_change_ends_other_sessions(client, user):
+    client.get(IDENTITY_URL)
+    user.set_password("changed")
+    user.save()
+    assert client.get(IDENTITY_URL).json()["authenticated"] is False
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_logged_out(client, user):
+    client.get(IDENTITY_URL)
+    user.is_active = False
+    user.save()
+    assert client.get(IDENTITY_URL).json()["authenticated"] is False
+
+
+@pytest.mark.django_db
+def test_logout_ends_the_session(client, user):
+    other = Client()
+    other.login(username="slugtestuser", password="pass")
+    client.get(IDENTITY_URL)
+
+    assert client.post("/api/accounts/logout/").status_code == 200
+    assert client.get(IDENTITY_URL).json()["authenticated"] is False
+    # Other sessions of the same user are unaffected
+    assert other.get(IDENTITY_URL).json()["authenticated"] is True
+
+
+@pytest.mark.django_db
+def test_deleted_user_is_logged_out(client, user):
+    client.get(IDENTITY_URL)
+    get_user_model().objects.filter(pk=user.pk).delete()
+    assert client.get(IDENTITY_URL).json()["authenticated"] is False
+
+
+@pytest.mark.django_db
+def test_snapshot_leaves_out_the_password_hash(client, user):
+    client.get(IDENTITY_URL)
+    snapshots = [
+        value
+        for key, value in caches["default"]._tier.entries.items()
+        if ":auth-user:" in key
+    ]
+    assert snapshots
+    assert all(user.password.encode() not in value for value, _ in snapshots)
+
+
+@pytest.mark.django_db
+def test_cached_user_loads_the_password_on_demand(user):
+    backend = CachedModelBackend()
+    backend.get_user(user.pk)
+    cached = backend.get_user(user.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        assert cached.check_password("pass")
+    assert len(_user_queries(ctx)) == 1
+
+
+@pytest.mark.django_db
+def test_password_change_on_a_cached_user_rehashes(user):
+    backend = CachedModelBackend()
+    backend.get_user(user.pk)
+    cached = backend.get_user(user.pk)
+    before = cached.get_session_auth_hash()
+    cached.set_password("changed")
+    assert cached.get_session_auth_hash() != before
+    pickle.loads(pickle.dumps(cached))
@@ -1,6 +1,12 @@
 from django.urls import path
 
-from .views import IdentityView, LoginViewSet, LogoutViewSet, RegisterViewSet
+from .views import (
+    ApiTokenViewSet,
+    IdentityView,
+    LoginViewSet,
+    LogoutViewSet,
+    RegisterViewSet,
+)
 
 urlpatterns = [
     path(
@@ -23,4 +29,14 @@ urlpatterns = [
         IdentityView.as_view(),
         name="accounts-identity",
     ),
+    path(
+        "accounts/tokens/",
+        ApiTokenViewSet.as_view({"get": "list", "post": "create"}),
+        name="accounts-token-list",
+    ),
+    path(
+        "accounts/tokens/<int:pk>/",
+        ApiTokenViewSet.as_view({"delete": "destroy"}),
+        name="accounts-token-detail",
+    ),
 ]
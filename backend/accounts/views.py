@@ -8,7 +8,9 @@ from rest_framework.views import APIView
 
 from backend.core.serializers import LoginSerializer, RegisterSerializer
 
-from .serializers import UserSerializer
+from .models import ApiToken
+from .serializers import ApiTokenSerializer, UserSerializer
+from .tokens import create_token
 
 logger = logging.getLogger(__name__)
 
@@ -59,19 +61,13 @@ class LoginViewSet(viewsets.GenericViewSet):
             return Response({"detail": "Invalid credentials"}, status=400)
         login(request, user)
         logger.info(f"User {user.username} logged in successfully.")
-        user_data = UserSerializer(user).data
-        # Store user info in session for whoami
-        request.session["whoami"] = user_data
-        return Response(user_data)
+        return Response(UserSerializer(user).data)
 
 
 class LogoutViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.AllowAny]
 
     def create(self, request, *args, **kwargs):
-        # Remove whoami info from session on logout
-        if "whoami" in request.session:
-            del request.session["whoami"]
         logout(request)
         return Response({"detail": "Logged out"})
 
@@ -80,24 +76,40 @@ class IdentityView(APIView):
     # No IsAuthenticated permission, allow all
 
     def get(self, request, *args, **kwargs):
-        # NOTE: Per-session caching of user info means that if the user updates their
-        # profile in another tab or device, this session may show stale info until the
-        # cache is refreshed (e.g., after logout/login or manual update). This is a
-        # common tradeoff for performance.
+        # request.user is the cached snapshot from CachedModelBackend, which
+        # user updates invalidate, so a warm cache answers this without a
+        # user query and nothing needs copying into the session
         if not request.user.is_authenticated:
             return Response(
                 {"authenticated": False, "user": None}, status=status.HTTP_200_OK
             )
+        return Response(
+            {"authenticated": True, "user": UserSerializer(request.user).data},
+            status=status.HTTP_200_OK,
+        )
 
-        # Check if user info is already in session
-        data = request.session.get("whoami")
-        if data:
-            return Response(
-                {"authenticated": True, "user": data}, status=status.HTTP_200_OK
-            )
 
-        user = request.user
-        data = request.session["whoami"] = UserSerializer(user).data
+class ApiTokenViewSet(
+    mixins.ListModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet
+):
+    """
+    Personal access tokens of the logged-in user.
+
+    ``POST`` returns the plain token under ``token``; it is never shown
+    again. ``DELETE`` revokes a token.
+    """
+
+    serializer_class = ApiTokenSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):  # type: ignore[override]
+        return ApiToken.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        api_token, token = create_token(request.user, serializer.validated_data["name"])
+        logger.info(f"User {request.user.username} created API token {api_token.pk}.")
         return Response(
-            {"authenticated": True, "user": data}, status=status.HTTP_200_OK
+            {**self.get_serializer(api_token).data, "token": token}, status=201
         )
@@ -1,6 +1,12 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-from .models import Question, QuestionLog, Tag
+from .models import ImportJob, Question, QuestionLog, RequestProfile, Tag
+from .profiling import load_summary, profile_path
 
 
 @admin.register(Tag)
@@ -24,3 +30,100 @@ class QuestionLogAdmin(admin.ModelAdmin):
     list_display = ("question", "user", "date_attempted", "outcome", "time_spent_min")
     search_fields = ("question__title", "solution_approach", "self_notes")
     list_filter = ("outcome", "date_attempted", "user")
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "user",
+        "platform",
+        "username",
+        "status",
+        "items_fetched",
+        "questions_created",
+        "logs_created",
+    )
+    list_filter = ("status", "platform", "created_at")
+    search_fields = ("username", "user__username")
+    readonly_fields = (
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+        "attempts",
+    )
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "query_ms",
+        "user",
+    )
+    list_filter = ("method", "status_code", "created_at")
+    search_fields = ("path", "user__username")
+    readonly_fields = (
+        "created_at",
+        "user",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "query_ms",
+        "download",
+        "top_functions",
+        "queries",
+    )
+    exclude = ("name",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="core_requestprofile_download",
+            )
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        try:
+            stats = open(profile_path(profile.name, ".prof"), "rb")
+        except FileNotFoundError:
+            raise Http404("Profile data is gone")
+        return FileResponse(
+            stats, as_attachment=True, filename=f"profile-{profile.pk}.prof"
+        )
+
+    @admin.display(description="cProfile stats")
+    def download(self, obj):
+        url = reverse("admin:core_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">Download .prof</a>', url)
+
+    @admin.display(description="Top functions (cumulative)")
+    def top_functions(self, obj):
+        return format_html("<pre>{}</pre>", load_summary(obj.name)["top_functions"])
+
+    @admin.display(description="Queries")
+    def queries(self, obj):
+        lines = [
+            f"{query['ms']:>9.3f} ms  {query['sql']}"
+            for query in load_summary(obj.name)["queries"]
+        ]
+        return format_html("<pre>{}</pre>", "\n".join(lines))
@@ -8,4 +8,11 @@ class CoreConfig(AppConfig):
     def ready(self):
         """Import signal handlers when the app is ready."""
         # Import signals to ensure they are registered
+        from django.core import checks
+
         from . import signals  # noqa: F401
+        from .cache import check_shared_cache
+        from .metrics import instrument_serializers
+
+        instrument_serializers()
+        checks.register(check_shared_cache, checks.Tags.caches)
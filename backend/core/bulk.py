@@ -0,0 +1,269 @@
+"""
+Bulk question and question log writes.
+
+A whole batch of creates, updates and deletes is validated up front with
+``QuestionSerializer`` (sharing one preloaded set of the user's tag IDs), and
+is only written if every item is valid. Writes then run in one transaction
+with a constant number of queries: batched slug allocation, ``bulk_create`` /
+``bulk_update``, and a single through-table insert for the tag rows.
+
+Log ingestion inserts with ``bulk_create`` (which sends no ``post_save``) and
+then recomputes aggregates once per distinct question instead of per log.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Question, QuestionLog
+from .search import refresh_search_vectors
+from .serializers import QuestionLogBulkItemSerializer, QuestionSerializer
+from .signals import recompute_question_aggregates, suppress_aggregate_updates
+from .tag_catalog import get_tag_catalog
+from .utils import SlugGenerator
+from .versioning import bump_user_data_version
+
+SEARCH_FIELDS = {"title", "content", "source"}
+
+
+@dataclass
+class BulkQuestionResult:
+    created: List[Question] = field(default_factory=list)
+    updated: List[Question] = field(default_factory=list)
+    deleted: List[int] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class BulkLogResult:
+    created: List[QuestionLog] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def bulk_write_questions(
+    user,
+    create: List[Dict[str, Any]],
+    update: List[Dict[str, Any]],
+    delete: List[int],
+    context: Optional[Dict[str, Any]] = None,
+) -> BulkQuestionResult:
+    """
+    Validate and apply a batch of question writes for ``user``.
+
+    Returns a result whose ``errors`` list is non-empty (and nothing written)
+    if any item failed validation.
+    """
+    context = dict(context or {})
+    context["user_tag_ids"] = get_tag_catalog(user).ids
+    result = BulkQuestionResult()
+
+    to_create = _validate_creates(create, context, result.errors)
+    to_update = _validate_updates(user, update, context, result.errors)
+    existing = set(
+        Question.objects.filter(user=user, id__in=delete).values_list("id", flat=True)
+    )
+    for index, question_id in enumerate(delete):
+        if question_id not in existing:
+            result.errors.append(_error("delete", index, {"id": ["Not found."]}))
+    if result.errors:
+        return result
+
+    with transaction.atomic():
+        result.created = _create(user, to_create)
+        result.updated = _update(to_update)
+        Question.objects.filter(user=user, id__in=existing).delete()
+        result.deleted = list(delete)
+        # bulk_create/bulk_update send no signals
+        bump_user_data_version(user.pk)
+    return result
+
+
+def create_valid_questions(
+    user, items: List[Dict[str, Any]], context: Optional[Dict[str, Any]] = None
+) -> BulkQuestionResult:
+    """
+    Like the creates of ``bulk_write_questions``, but the valid items are
+    written even if others failed validation; those are in ``errors``.
+    """
+    context = dict(context or {})
+    context["user_tag_ids"] = get_tag_catalog(user).ids
+    result = BulkQuestionResult()
+    to_create = _validate_creates(items, context, result.errors)
+    if to_create:
+        with transaction.atomic():
+            result.created = _create(user, to_create)
+            bump_user_data_version(user.pk)
+    return result
+
+
+def _error(op: str, index: int, errors: Any) -> Dict[str, Any]:
+    return {"op": op, "index": index, "errors": errors}
+
+
+def _validate_creates(items, context, errors) -> List[Dict[str, Any]]:
+    validated = []
+    for index, item in enumerate(items):
+        serializer = QuestionSerializer(data=item, context=context)
+        if serializer.is_valid():
+            validated.append(dict(serializer.validated_data))
+        else:
+            errors.append(_error("create", index, serializer.errors))
+    return validated
+
+
+def _validate_updates(
+    user, items, context, errors
+) -> List[Tuple[Question, Dict[str, Any]]]:
+    instances = Question.objects.filter(
+        user=user, id__in=[item["id"] for item in items]
+    ).in_bulk()
+    validated = []
+    for index, item in enumerate(items):
+        instance = instances.get(item["id"])
+        if instance is None:
+            errors.append(_error("update", index, {"id": ["Not found."]}))
+            continue
+        data = {key: value for key, value in item.items() if key != "id"}
+        serializer = QuestionSerializer(
+            instance, data=data, partial=True, context=context
+        )
+        if serializer.is_valid():
+            validated.append((instance, dict(serializer.validated_data)))
+        else:
+            errors.append(_error("update", index, serializer.errors))
+    return validated
+
+
+def _create(user, items: List[Dict[str, Any]]) -> List[Question]:
+    if not items:
+        return []
+    slugs = SlugGenerator.generate_unique_slugs(
+        Question, [item.get("title") for item in items]
+    )
+    tag_ids = [item.pop("tag_ids", None) or [] for item in items]
+    questions = SlugGenerator.bulk_create_with_unique_slugs(
+        Question,
+        [Question(user=user, slug=slug, **item) for item, slug in zip(items, slugs)],
+        [item.get("title") for item in items],
+    )
+    _set_tags(questions, tag_ids)
+    refresh_search_vectors(Question.objects.filter(pk__in=[q.pk for q in questions]))
+    return questions
+
+
+def _update(items: List[Tuple[Question, Dict[str, Any]]]) -> List[Question]:
+    if not items:
+        return []
+    now = timezone.now()
+    fields = {"updated_at"}
+    retagged, tag_ids = [], []
+    for instance, data in items:
+        new_tag_ids = data.pop("tag_ids", None)
+        if new_tag_ids is not None:
+            retagged.append(instance)
+            tag_ids.append(new_tag_ids)
+        for name, value in data.items():
+            setattr(instance, name, value)
+        instance.updated_at = now
+        fields.update(data)
+
+    questions = [instance for instance, _ in items]
+    Question.objects.bulk_update(questions, sorted(fields))
+    if retagged:
+        Question.tags.through.objects.filter(
+            question_id__in=[q.pk for q in retagged]
+        ).delete()
+        _set_tags(retagged, tag_ids)
+    if fields & SEARCH_FIELDS:
+        refresh_search_vectors(
+            Question.objects.filter(pk__in=[q.pk for q in questions])
+        )
+    return questions
+
+
+def _set_tags(questions: List[Question], tag_ids: List[List[int]]) -> None:
+    """Write all question-tag rows with a single through-table insert."""
+    through = Question.tags.through
+    through.objects.bulk_create(
+        through(question_id=question.pk, tag_id=tag_id)
+        for question, ids in zip(questions, tag_ids)
+        for tag_id in dict.fromkeys(ids)
+    )
+
+
+def bulk_create_question_logs(
+    user, items: List[Dict[str, Any]], context: Optional[Dict[str, Any]] = None
+) -> BulkLogResult:
+    """
+    Validate and ingest many QuestionLog items for ``user``.
+
+    Returns a result whose ``errors`` list is non-empty (and nothing written)
+    if any item failed validation.
+    """
+    result = BulkLogResult()
+    logs = _validate_logs(user, items, context, result.errors)
+    if not result.errors:
+        result.created = ingest_question_logs(logs)
+    return result
+
+
+def create_valid_question_logs(
+    user, items: List[Dict[str, Any]], context: Optional[Dict[str, Any]] = None
+) -> BulkLogResult:
+    """
+    Like ``bulk_create_question_logs``, but the valid items are ingested even
+    if others failed validation; those are in ``errors``.
+    """
+    result = BulkLogResult()
+    logs = _validate_logs(user, items, context, result.errors)
+    if logs:
+        result.created = ingest_question_logs(logs)
+    return result
+
+
+def _validate_logs(user, items, context, errors) -> List[QuestionLog]:
+    context = dict(context or {})
+    context["user_question_ids"] = set(
+        Question.objects.filter(
+            user=user, id__in=_referenced_question_ids(items)
+        ).values_list("id", flat=True)
+    )
+    logs = []
+    for index, item in enumerate(items):
+        serializer = QuestionLogBulkItemSerializer(data=item, context=context)
+        if not serializer.is_valid():
+            errors.append(_error("create", index, serializer.errors))
+            continue
+        data = dict(serializer.validated_data)
+        logs.append(QuestionLog(user=user, question_id=data.pop("question"), **data))
+    return logs
+
+
+def _referenced_question_ids(items) -> Set[int]:
+    """
+    The question IDs the items refer to, parsed like the item serializer does;
+    invalid values are left for its per-item errors.
+    """
+    question_field = QuestionLogBulkItemSerializer().fields["question"]
+    ids = set()
+    for item in items:
+        try:
+            ids.add(question_field.to_internal_value(item.get("question")))
+        except ValidationError:
+            pass
+    return ids
+
+
+def ingest_question_logs(logs: List[QuestionLog], batch_size: int = 1000):
+    """
+    Insert already-validated logs and refresh aggregates once per question.
+    """
+    with transaction.atomic(), suppress_aggregate_updates():
+        created = QuestionLog.objects.bulk_create(logs, batch_size=batch_size)
+        recompute_question_aggregates({log.question_id for log in created})
+        for user_id in {log.user_id for log in created}:
+            bump_user_data_version(user_id)
+    return created
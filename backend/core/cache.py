@@ -0,0 +1,384 @@
+"""
+Cache backends with hit / miss / eviction counters.
+
+``CountingLocMemCache`` is Django's ``LocMemCache`` (so ``MAX_ENTRIES`` and
+``CULL_FREQUENCY`` bound its size) that also counts its hits, misses and the
+entries it culls to stay under that bound.
+
+``TieredCache`` puts a small in-process L1 (TTL + LRU) in front of a shared
+L2 cache alias, such as Redis or a file-based cache on the same host, so
+every gunicorn worker sees the same sessions and counters. Writes go to L2
+and are announced in an invalidation log kept in L2, a fixed ring of
+``LOG_SIZE`` keys, so it never grows the cache. Each worker replays that log
+at most every ``SYNC_INTERVAL`` seconds and drops the L1 entries other
+workers changed. An L1 entry is never older than ``L1_TIMEOUT``, even if an
+announcement is lost, and never outlives its L2 entry.
+
+Use Redis as L2 when several processes share the cache: a file-based L2
+increments the log sequence with a get and a set, so two concurrent writers
+can take the same slot and one announcement is lost (the entry is then
+stale for up to ``L1_TIMEOUT``). ``check_shared_cache`` warns about it.
+
+Counters are kept per ``LOCATION``, like the cache storage itself, and read
+with ``cache_stats``.
+"""
+
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class CacheStats:
+    """
+    Process-wide counters for one cache.
+
+    - ``hits``: reads that found a live entry (in L1, for a tiered cache)
+    - ``l2_hits``: tiered reads that missed L1 but found the entry in L2
+    - ``misses``: reads that found nothing, or an expired entry
+    - ``evictions``: live entries dropped to respect ``MAX_ENTRIES``
+    - ``invalidations``: L1 entries dropped because another worker changed
+      them
+    """
+
+    FIELDS = ("hits", "misses", "evictions")
+
+    def __init__(self, fields: Tuple[str, ...] = FIELDS):
+        self.fields = fields
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def incr(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += count
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: self._counts[name] for name in self.fields}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+_stats: Dict[str, CacheStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats_for(name: str, fields: Tuple[str, ...] = CacheStats.FIELDS) -> CacheStats:
+    with _stats_lock:
+        return _stats.setdefault(name, CacheStats(fields))
+
+
+class CountingLocMemCache(LocMemCache):
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self.stats = _stats_for(name)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.stats.incr("misses")
+            return default
+        self.stats.incr("hits")
+        return value
+
+    def _cull(self):
+        # Called with the lock held, just before a set would overflow
+        before = len(self._cache)
+        super()._cull()
+        self.stats.incr("evictions", before - len(self._cache))
+
+
+class _LocalTier:
+    """
+    The L1 of one ``TieredCache`` location, shared by its per-thread
+    backend instances.
+
+    Values are stored pickled, so callers that mutate what they read (the
+    session store does) can't change the cached copy.
+    """
+
+    def __init__(self, max_entries: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self.stats = stats
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # Last invalidation sequence replayed, None before the first sync
+        self.seq: Optional[int] = None
+        self.next_sync = 0.0
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+            pickled, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return _MISSING
+            self.entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key: str, value, ttl: float) -> None:
+        if ttl <= 0:
+            self.delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.entries[key] = (pickled, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            return self.entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+_tiers: Dict[str, _LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    In-process L1 in front of the shared cache alias named by ``LOCATION``.
+
+    ``OPTIONS``:
+
+    - ``MAX_ENTRIES``: L1 size; the least recently used entry goes first
+    - ``L1_TIMEOUT``: seconds an entry may be served from L1 (default 5)
+    - ``SYNC_INTERVAL``: seconds between invalidation log replays
+      (default 0.5); 0 replays before every read
+
+    ``add``, ``incr`` and ``decr`` are delegated to L2, so they are as
+    atomic as L2 makes them.
+
+    Entries written with a timeout get a companion key in L2 holding their
+    expiry time, so a worker that reads them from L2 keeps them in L1 no
+    longer than L2 does.
+    """
+
+    FIELDS = ("hits", "l2_hits", "misses", "evictions", "invalidations")
+    SEQ_KEY = "tiered-cache:seq"
+    # Invalidation log slots; sequence ``seq`` is written to slot seq % LOG_SIZE
+    LOG_SIZE = 256
+    # Invalidation log entries only need to outlive the slowest replay
+    LOG_TIMEOUT = 60 * 5
+    # Further behind than this, the slots were reused: drop all of L1
+    MAX_REPLAY = LOG_SIZE
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = location
+        self._l1_timeout = float(options.get("L1_TIMEOUT", 5))
+        self._sync_interval = float(options.get("SYNC_INTERVAL", 0.5))
+        self.stats = _stats_for(f"tiered:{location}", self.FIELDS)
+        with _tiers_lock:
+            self._tier = _tiers.setdefault(
+                location, _LocalTier(self._max_entries, self.stats)
+            )
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    def _l1_ttl(self, timeout) -> float:
+        if timeout is None:
+            return self._l1_timeout
+        return min(self._l1_timeout, timeout)
+
+    def _timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _expires_key(self, key) -> str:
+        return f"tiered-cache:expires:{key}"
+
+    def _set_expiry(self, key, timeout, version=None) -> None:
+        # Without a timeout a stale companion key only shortens L1 TTLs, and
+        # expires by itself
+        if timeout is not None and timeout > 0:
+            self.l2.set(
+                self._expires_key(key), time.time() + timeout, timeout, version=version
+            )
+
+    # Invalidation log
+
+    def _log_key(self, seq: int) -> str:
+        return f"tiered-cache:log:{seq % self.LOG_SIZE}"
+
+    def _publish(self, keys: Iterable[str]) -> None:
+        """Tell the other workers that ``keys`` (L1 keys) changed in L2."""
+        l2 = self.l2
+        try:
+            seq = l2.incr(self.SEQ_KEY)
+        except ValueError:
+            l2.add(self.SEQ_KEY, 0, timeout=None)
+            seq = l2.incr(self.SEQ_KEY)
+        l2.set(self._log_key(seq), (seq, list(keys)), self.LOG_TIMEOUT)
+        if self._tier.seq == seq - 1:
+            # Nobody else wrote since our last replay; skip our own entry
+            self._tier.seq = seq
+
+    def _sync(self) -> None:
+        tier = self._tier
+        now = time.monotonic()
+        if now < tier.next_sync:
+            return
+        tier.next_sync = now + self._sync_interval
+
+        l2 = self.l2
+        remote = l2.get(self.SEQ_KEY)
+        seen = tier.seq
+        if seen is None or remote == seen:
+            tier.seq = remote
+            return
+        if remote is None or remote < seen or remote - seen > self.MAX_REPLAY:
+            # L2 was cleared or we're too far behind
+            self._drop_all()
+            tier.seq = remote
+            return
+
+        seqs = range(seen + 1, remote + 1)
+        logged = l2.get_many([self._log_key(seq) for seq in seqs])
+        entries = [logged.get(self._log_key(seq)) for seq in seqs]
+        if any(entry is None or entry[0] != seq for seq, entry in zip(seqs, entries)):
+            # An entry expired, its writer hasn't logged it yet, or its slot
+            # was reused
+            self._drop_all()
+        else:
+            for _, keys in entries:
+                for key in keys:
+                    if tier.delete(key):
+                        self.stats.incr("invalidations")
+        tier.seq = remote
+
+    def _drop_all(self) -> None:
+        self.stats.incr("invalidations", len(self._tier.entries))
+        self._tier.clear()
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        value = self._tier.get(l1_key)
+        if value is not _MISSING:
+            self.stats.incr("hits")
+            return value
+        expires_key = self._expires_key(key)
+        found = self.l2.get_many([key, expires_key], version=version)
+        if key not in found:
+            self.stats.incr("misses")
+            return default
+        self.stats.incr("l2_hits")
+        value = found[key]
+        ttl = self._l1_timeout
+        if expires_key in found:
+            ttl = min(ttl, found[expires_key] - time.time())
+        self._tier.set(l1_key, value, ttl)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        self.l2.set(key, value, timeout, version=version)
+        self._set_expiry(key, timeout, version=version)
+        self._publish([l1_key])
+        self._tier.set(l1_key, value, self._l1_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        if not self.l2.add(key, value, timeout, version=version):
+            return False
+        self._set_expiry(key, timeout, version=version)
+        self._publish([l1_key])
+        self._tier.set(l1_key, value, self._l1_ttl(timeout))
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        value = self.l2.incr(key, delta, version=version)
+        self._publish([l1_key])
+        # L2 keeps the entry's own expiry; don't guess it here
+        self._tier.delete(l1_key)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        if not self.l2.touch(key, timeout, version=version):
+            return False
+        self._set_expiry(key, timeout, version=version)
+        return True
+
+    def delete(self, key, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        deleted = self.l2.delete(key, version=version)
+        self.l2.delete(self._expires_key(key), version=version)
+        self._publish([l1_key])
+        self._tier.delete(l1_key)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        l1_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        expires_keys = [self._expires_key(key) for key in keys]
+        self.l2.delete_many(keys + expires_keys, version=version)
+        self._publish(l1_keys)
+        for l1_key in l1_keys:
+            self._tier.delete(l1_key)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        # Dropping the sequence key makes the other workers drop their L1
+        self.l2.clear()
+        self._tier.clear()
+        self._tier.seq = None
+        self._tier.next_sync = 0.0
+
+
+def check_shared_cache(app_configs=None, **kwargs) -> List[checks.CheckMessage]:
+    """Warn when a tiered cache shares its L2 through the file system."""
+    if settings.DEBUG:
+        return []
+    messages = []
+    for alias, params in settings.CACHES.items():
+        if params.get("BACKEND") != f"{__name__}.TieredCache":
+            continue
+        if isinstance(caches[params.get("LOCATION", "")], FileBasedCache):
+            messages.append(
+                checks.Warning(
+                    f"Cache {alias!r} shares its L2 through a file-based cache.",
+                    hint=(
+                        "Invalidations can be lost between workers. Set "
+                        "SHARED_CACHE_URL to a redis:// URL."
+                    ),
+                    id="core.W001",
+                )
+            )
+    return messages
+
+
+def cache_stats(alias: str = "default") -> Dict[str, int]:
+    """Counters for the cache ``alias``; empty if it doesn't keep any."""
+    stats = getattr(caches[alias], "stats", None)
+    return stats.snapshot() if stats is not None else {}
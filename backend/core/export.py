@@ -0,0 +1,159 @@
+"""
+Streaming export of a user's questions, tags and logs as CSV or NDJSON.
+
+Rows are read with ``.values_list(...).iterator(chunk_size=...)``, which
+on PostgreSQL is a server-side cursor, so no more than one chunk is held in
+memory. The tags of each chunk of questions are fetched with one query.
+Each chunk is encoded to a single bytes block and yielded, which keeps the
+number of writes (and of gzip flushes) per response small.
+
+Questions carry their tag names, and logs refer to their question by slug,
+so an export stays meaningful outside this database.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .models import Question, QuestionLog, Tag
+
+CHUNK_SIZE = 2000
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Tag names are joined with this in CSV; NDJSON has a list
+CSV_TAG_SEPARATOR = ";"
+
+QUESTION_FIELDS = (
+    "slug",
+    "title",
+    "source",
+    "difficulty",
+    "content",
+    "is_active",
+    "created_at",
+    "updated_at",
+    "attempts_count",
+    "solved_count",
+    "last_attempted_at",
+    "tags",
+)
+TAG_FIELDS = ("name", "description", "created_at")
+LOG_FIELDS = (
+    "question",
+    "date_attempted",
+    "time_spent_min",
+    "outcome",
+    "solution_approach",
+    "self_notes",
+)
+
+
+def _chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _question_chunks(user, size: int) -> Iterator[List[Dict[str, Any]]]:
+    columns = QUESTION_FIELDS[:-1]
+    rows = (
+        Question.objects.filter(user=user)
+        .order_by("id")
+        .values_list("id", *columns)
+        .iterator(chunk_size=size)
+    )
+    through = Question.tags.through
+    for chunk in _chunks(rows, size):
+        tags: Dict[int, List[str]] = {}
+        for question_id, name in (
+            through.objects.filter(question_id__in=[row[0] for row in chunk])
+            .order_by("tag__name")
+            .values_list("question_id", "tag__name")
+        ):
+            tags.setdefault(question_id, []).append(name)
+        yield [
+            {**dict(zip(columns, row[1:])), "tags": tags.get(row[0], [])}
+            for row in chunk
+        ]
+
+
+def _tag_chunks(user, size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = (
+        Tag.objects.filter(user=user)
+        .order_by("id")
+        .values_list(*TAG_FIELDS)
+        .iterator(chunk_size=size)
+    )
+    for chunk in _chunks(rows, size):
+        yield [dict(zip(TAG_FIELDS, row)) for row in chunk]
+
+
+def _log_chunks(user, size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = (
+        # Logs follow their question; some were written without a user
+        QuestionLog.objects.filter(question__user=user)
+        .order_by("id")
+        .values_list("question__slug", *LOG_FIELDS[1:])
+        .iterator(chunk_size=size)
+    )
+    for chunk in _chunks(rows, size):
+        yield [dict(zip(LOG_FIELDS, row)) for row in chunk]
+
+
+EXPORTS: Dict[str, Tuple[Sequence[str], Callable]] = {
+    "questions": (QUESTION_FIELDS, _question_chunks),
+    "tags": (TAG_FIELDS, _tag_chunks),
+    "logs": (LOG_FIELDS, _log_chunks),
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return CSV_TAG_SEPARATOR.join(value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_csv(fields: Sequence[str], chunks) -> Iterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    for chunk in chunks:
+        writer.writerows([_csv_value(row[f]) for f in fields] for row in chunk)
+        yield out.getvalue().encode()
+        out.seek(0)
+        out.truncate()
+    # A header alone if there were no rows
+    if out.tell():
+        yield out.getvalue().encode()
+
+
+def _encode_ndjson(fields: Sequence[str], chunks) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps({f: _json_value(row[f]) for f in fields}) + "\n" for row in chunk
+        ).encode()
+
+
+def export_stream(user, kind: str, fmt: str, chunk_size: Optional[int] = None):
+    """Encoded blocks of ``user``'s ``kind`` rows, in ``fmt`` ("csv"/"ndjson")."""
+    fields, chunks = EXPORTS[kind]
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    return encode(fields, chunks(user, chunk_size or CHUNK_SIZE))
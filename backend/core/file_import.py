@@ -0,0 +1,235 @@
+"""
+Import of questions and logs from CSV or NDJSON files.
+
+The file is decoded and parsed a line at a time straight from the upload
+stream, so it is never held in memory whole. Rows are handled in batches of
+``BATCH_SIZE``:
+
+- questions: the batch's tag names are resolved to IDs, and tags the user
+  doesn't have yet are created, with one insert and one select. Rows are
+  then validated (and their content sanitized) by ``QuestionSerializer`` and
+  the valid ones written with ``bulk.create_valid_questions``.
+- logs: the batch's question slugs are resolved with one query, and the
+  valid rows are ingested with ``bulk.create_valid_question_logs``, which
+  recomputes each touched question's aggregates once.
+
+Each batch commits on its own. Invalid rows are skipped and reported by
+line number, so one bad row doesn't sink the file. The columns are the
+ones the export writes (see ``export``); the others, such as ``slug`` or
+the timestamps, are ignored.
+"""
+
+import codecs
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .bulk import create_valid_question_logs, create_valid_questions
+from .export import CSV_TAG_SEPARATOR, LOG_FIELDS
+from .models import Question, Tag
+from .tag_catalog import get_tag_catalog, invalidate_tag_catalog
+from .versioning import bump_user_data_version
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Only the first errors are listed; error_count has them all
+MAX_REPORTED_ERRORS = 100
+QUESTION_COLUMNS = ("title", "source", "difficulty", "content", "is_active")
+TAG_NAME_LENGTH = Tag._meta.get_field("name").max_length
+
+# (line number, row, parse error)
+ParsedRow = Tuple[Optional[int], Optional[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    batches: int = 0
+    error_count: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line: Optional[int], errors: Any) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            # Plain dicts; serializer errors hold a reference to the serializer
+            if isinstance(errors, dict):
+                errors = dict(errors)
+            self.errors.append({"line": line, "errors": errors})
+
+
+def _lines(stream) -> Iterator[str]:
+    # utf-8-sig drops the byte order mark spreadsheets like to add
+    return codecs.iterdecode(iter(stream.readline, b""), "utf-8-sig")
+
+
+def _csv_rows(stream) -> Iterator[ParsedRow]:
+    reader = csv.DictReader(_lines(stream))
+    for record in reader:
+        # Empty cells are missing values, not empty strings to validate
+        row = {
+            key.strip(): value
+            for key, value in record.items()
+            if key is not None and value not in ("", None)
+        }
+        yield reader.line_num, row, None
+
+
+def _ndjson_rows(stream) -> Iterator[ParsedRow]:
+    for number, line in enumerate(_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON."
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object."
+            continue
+        yield number, row, None
+
+
+def _until_unreadable(rows: Iterator[ParsedRow]) -> Iterator[ParsedRow]:
+    """Report a file that can't be decoded or parsed further as a last error."""
+    try:
+        yield from rows
+    except (UnicodeDecodeError, csv.Error) as exc:
+        yield None, None, f"The rest of the file could not be read: {exc}"
+
+
+def _batches(rows: Iterable[ParsedRow], size: int) -> Iterator[List[ParsedRow]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _tag_names(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(CSV_TAG_SEPARATOR)
+    elif not isinstance(value, list):
+        return []
+    return list(dict.fromkeys(str(name).strip() for name in value if str(name).strip()))
+
+
+def resolve_tag_names(user, names: Set[str]) -> Dict[str, int]:
+    """
+    IDs of ``user``'s tags with these names, creating the missing ones.
+    Names too long, or already used by another user's tag, are left out.
+    """
+    catalog = get_tag_catalog(user)
+    ids = {name: catalog.id_for(name) for name in names}
+    missing = [
+        name
+        for name, tag_id in ids.items()
+        if tag_id is None and len(name) <= TAG_NAME_LENGTH
+    ]
+    if missing:
+        # Names taken by another user's tag are skipped by the unique index
+        Tag.objects.bulk_create(
+            [Tag(name=name, user=user) for name in missing], ignore_conflicts=True
+        )
+        ids.update(
+            Tag.objects.filter(user=user, name__in=missing).values_list("name", "id")
+        )
+        # bulk_create sends no signals
+        invalidate_tag_catalog(user.pk)
+        bump_user_data_version(user.pk)
+    return {name: tag_id for name, tag_id in ids.items() if tag_id is not None}
+
+
+def _import_questions(user, rows, context, result: ImportResult) -> None:
+    names = {number: _tag_names(row.get("tags")) for number, row in rows}
+    tag_ids = resolve_tag_names(user, set().union(*names.values()))
+    items, lines = [], []
+    for number, row in rows:
+        unavailable = [name for name in names[number] if name not in tag_ids]
+        if unavailable:
+            result.add_error(
+                number,
+                {"tags": [f"Tag names not available: {', '.join(unavailable)}"]},
+            )
+            continue
+        item = {key: row[key] for key in QUESTION_COLUMNS if key in row}
+        item["tag_ids"] = [tag_ids[name] for name in names[number]]
+        items.append(item)
+        lines.append(number)
+    written = create_valid_questions(user, items, context)
+    result.created += len(written.created)
+    for error in written.errors:
+        result.add_error(lines[error["index"]], error["errors"])
+
+
+def _import_logs(user, rows, context, result: ImportResult) -> None:
+    slugs = {row.get("question") for _, row in rows}
+    ids = dict(
+        Question.objects.filter(
+            user=user, slug__in=[slug for slug in slugs if isinstance(slug, str)]
+        ).values_list("slug", "id")
+    )
+    items, lines = [], []
+    for number, row in rows:
+        question = row.get("question")
+        if isinstance(question, str) and question in ids:
+            question = ids[question]
+        elif isinstance(question, str) and question.isdigit():
+            question = int(question)
+        elif not isinstance(question, int):
+            result.add_error(number, {"question": [f"Unknown question: {question}"]})
+            continue
+        items.append(
+            {
+                **{key: row[key] for key in LOG_FIELDS if key in row},
+                "question": question,
+            }
+        )
+        lines.append(number)
+    written = create_valid_question_logs(user, items, context)
+    result.created += len(written.created)
+    for error in written.errors:
+        result.add_error(lines[error["index"]], error["errors"])
+
+
+def import_file(
+    user,
+    kind: str,
+    fmt: str,
+    stream,
+    context: Optional[Dict[str, Any]] = None,
+    batch_size: Optional[int] = None,
+) -> ImportResult:
+    """
+    Import ``kind`` ("questions"/"logs") rows for ``user`` from a binary
+    ``stream`` in ``fmt`` ("csv"/"ndjson"). ``context`` is passed to the
+    serializers, which need the request.
+    """
+    parse = _csv_rows if fmt == "csv" else _ndjson_rows
+    write = _import_questions if kind == "questions" else _import_logs
+    result = ImportResult()
+    for batch in _batches(_until_unreadable(parse(stream)), batch_size or BATCH_SIZE):
+        result.batches += 1
+        rows = []
+        for number, row, error in batch:
+            if error is not None:
+                result.add_error(number, error)
+            else:
+                rows.append((number, row))
+            if number is not None:
+                result.rows += 1
+        if rows:
+            write(user, rows, context, result)
+        logger.info(
+            "Import of %s for user %s: %d rows, %d created, %d errors",
+            kind,
+            user.pk,
+            result.rows,
+            result.created,
+            result.error_count,
+        )
+    # Parse errors were added before their batch's validation errors
+    result.errors.sort(key=lambda error: (error["line"] is None, error["line"] or 0))
+    return result
@@ -0,0 +1,155 @@
+"""
+Server-side filtering and sorting for the question list endpoints.
+
+Query parameters are validated with a serializer and translated into
+predicates that line up with the composite indexes declared on
+``Question.Meta.indexes``:
+
+- ``difficulty``: comma-separated list of difficulties
+- ``tags``: comma-separated tag IDs, matched per ``tags_match`` (``any``/``all``)
+- ``source``: exact source match
+- ``is_active``: ``true``/``false``
+- ``last_attempted_at_after`` / ``last_attempted_at_before``
+- ``attempts_count_min`` / ``attempts_count_max``
+- ``solved_count_min`` / ``solved_count_max``
+- ``q``: full-text search over title, source and content (see ``search.py``)
+- ``ordering``: one of ``QuestionOrderingFilter.ordering_fields``, ``-`` for
+  descending; search results default to best match first
+"""
+
+from typing import Any, Dict, List
+
+from django.db.models import Exists, OuterRef
+from rest_framework import filters, serializers
+from rest_framework.exceptions import ValidationError
+
+from .models import SOURCE_PREFIX_LENGTH, Question, solve_ratio, source_prefix
+from .search import search_questions
+
+MAX_TAG_FILTERS = 20
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """ListField that also accepts a single comma-separated string."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [item.strip() for item in data.split(",") if item.strip()]
+        return super().to_internal_value(data)
+
+
+class QuestionFilterSerializer(serializers.Serializer):
+    """Validates question list query parameters"""
+
+    difficulty = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=["Easy", "Medium", "Hard"]),
+        required=False,
+    )
+    tags = CommaSeparatedListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=MAX_TAG_FILTERS,
+    )
+    tags_match = serializers.ChoiceField(
+        choices=["any", "all"], required=False, default="any"
+    )
+    source = serializers.CharField(required=False, allow_blank=True)
+    is_active = serializers.BooleanField(required=False, allow_null=True, default=None)
+    last_attempted_at_after = serializers.DateTimeField(required=False)
+    last_attempted_at_before = serializers.DateTimeField(required=False)
+    attempts_count_min = serializers.IntegerField(required=False, min_value=0)
+    attempts_count_max = serializers.IntegerField(required=False, min_value=0)
+    solved_count_min = serializers.IntegerField(required=False, min_value=0)
+    solved_count_max = serializers.IntegerField(required=False, min_value=0)
+    q = serializers.CharField(required=False, allow_blank=True, max_length=200)
+
+    def to_internal_value(self, data):
+        # QueryDicts return the last value per key; flatten repeated params
+        if hasattr(data, "getlist"):
+            data = {
+                key: (
+                    ",".join(data.getlist(key))
+                    if key in ("difficulty", "tags")
+                    else data.get(key)
+                )
+                for key in data
+            }
+        return super().to_internal_value(data)
+
+
+class QuestionFilterBackend(filters.BaseFilterBackend):
+    """Applies validated question filters to the queryset"""
+
+    range_lookups = {
+        "last_attempted_at_after": "last_attempted_at__gte",
+        "last_attempted_at_before": "last_attempted_at__lte",
+        "attempts_count_min": "attempts_count__gte",
+        "attempts_count_max": "attempts_count__lte",
+        "solved_count_min": "solved_count__gte",
+        "solved_count_max": "solved_count__lte",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = QuestionFilterSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors)
+        params: Dict[str, Any] = serializer.validated_data
+
+        if params.get("difficulty"):
+            queryset = queryset.filter(difficulty__in=params["difficulty"])
+        if params.get("is_active") is not None:
+            queryset = queryset.filter(is_active=params["is_active"])
+        if "source" in params:
+            # Match on the indexed prefix first, then on the full value
+            queryset = queryset.alias(source_prefix=source_prefix()).filter(
+                source_prefix=params["source"][:SOURCE_PREFIX_LENGTH],
+                source=params["source"],
+            )
+        for param, lookup in self.range_lookups.items():
+            if param in params:
+                queryset = queryset.filter(**{lookup: params[param]})
+        if params.get("tags"):
+            queryset = self.filter_tags(queryset, params["tags"], params["tags_match"])
+        if params.get("q", "").strip():
+            queryset = search_questions(queryset, params["q"])
+        return queryset
+
+    @staticmethod
+    def filter_tags(queryset, tag_ids: List[int], match: str):
+        """
+        Filter by tags with EXISTS subqueries on the through table, which avoid
+        the row duplication (and DISTINCT) of joining through the M2M.
+        """
+        through = Question.tags.through.objects.filter(question_id=OuterRef("pk"))
+        if match == "any":
+            return queryset.filter(Exists(through.filter(tag_id__in=tag_ids)))
+        for tag_id in set(tag_ids):
+            queryset = queryset.filter(Exists(through.filter(tag_id=tag_id)))
+        return queryset
+
+
+class QuestionOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that also supports sorting by solve ratio"""
+
+    ordering_fields = [
+        "created_at",
+        "title",
+        "last_attempted_at",
+        "attempts_count",
+        "solved_count",
+        "solve_ratio",
+    ]
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            # Rank search results; otherwise fall back to Meta.ordering
+            if "search_rank" in queryset.query.annotations:
+                return queryset.order_by("-search_rank")
+            return queryset
+        if any(field.lstrip("-") == "solve_ratio" for field in ordering):
+            queryset = queryset.annotate(solve_ratio=solve_ratio())
+        return queryset.order_by(*ordering)
+
+    def get_default_ordering(self, view):
+        return None
@@ -0,0 +1,345 @@
+"""
+Background imports of a user's history from a coding platform.
+
+``POST /api/import/<platform>/`` only creates an ``ImportJob`` and queues it,
+so a web worker is never tied up by a slow platform. The job is run
+elsewhere, fetching a page at a time and saving each page's questions and
+logs (and the job's progress counters) before fetching the next; clients
+poll ``/api/import/jobs/<id>/``.
+
+The queue is chosen by ``IMPORT_QUEUE_BACKEND``:
+
+- ``"sqs"``: a message per job is published to ``IMPORT_QUEUE_URL`` with
+  ``backend.aws.publish_sqs_message``; consumers pass message bodies to
+  ``handle_message``.
+- ``"database"``: the queued rows are the queue; ``run_pending_jobs`` (the
+  ``run_import_worker`` command) claims and runs them.
+- ``"thread"``: jobs run in a thread pool of the web process, for
+  development.
+
+A job is claimed with a conditional update, so a job queued twice (an SQS
+message delivered again, two workers) runs once. A running job's heartbeat
+is refreshed with every page it saves; a job whose heartbeat is older than
+``IMPORT_JOB_TIMEOUT`` was left by a dead worker and can be claimed again, up to
+``IMPORT_JOB_MAX_ATTEMPTS`` runs; after that ``fail_abandoned_jobs`` marks it
+failed. Every write of a run is keyed on its attempt number, so a run whose
+job was claimed again stops at its next page instead of racing the new one.
+Imports are idempotent: questions are matched by URL and logs by question and
+date, and a user's pages are stored one at a time, so a rerun adds only
+what's new.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .bulk import create_valid_question_logs, create_valid_questions
+from .models import (
+    SOURCE_PREFIX_LENGTH,
+    ImportJob,
+    Question,
+    QuestionLog,
+    source_prefix,
+)
+from .platforms import Completion, Page, PlatformError, get_platform
+
+logger = logging.getLogger(__name__)
+
+IMPORT_ACTION = "import"
+TITLE_LENGTH = Question._meta.get_field("title").max_length
+APPROACH_LENGTH = QuestionLog._meta.get_field("solution_approach").max_length
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class JobSuperseded(Exception):
+    """The running job was claimed again by another worker."""
+
+
+def start_import_job(user, platform: str, username: str) -> Tuple[ImportJob, bool]:
+    """
+    Create and queue a job, or return the user's unfinished job for the same
+    profile; the flag is whether the job was created.
+    """
+    with transaction.atomic():
+        job = ImportJob.objects.filter(
+            user=user,
+            platform=platform,
+            username=username,
+            status__in=ImportJob.ACTIVE_STATUSES,
+        ).first()
+        if job is not None:
+            return job, False
+        job = ImportJob.objects.create(user=user, platform=platform, username=username)
+        # Workers must not see the job before it is committed
+        transaction.on_commit(partial(enqueue_import_job, job))
+    return job, True
+
+
+def enqueue_import_job(job: ImportJob) -> None:
+    backend = settings.IMPORT_QUEUE_BACKEND
+    if backend == "sqs":
+        try:
+            # boto3 is only needed where SQS is used
+            from backend.aws import publish_sqs_message
+
+            publish_sqs_message(
+                settings.IMPORT_QUEUE_URL,
+                IMPORT_ACTION,
+                {"job_id": job.pk},
+                region_name=settings.IMPORT_QUEUE_REGION or None,
+                request_meta={"user_id": job.user_id},
+            )
+        except Exception:
+            logger.exception("Import job %s could not be queued", job.pk)
+            ImportJob.objects.filter(pk=job.pk, status=ImportJob.QUEUED).update(
+                status=ImportJob.FAILED,
+                error="The import could not be queued.",
+                finished_at=timezone.now(),
+            )
+    elif backend == "thread":
+        _thread_pool().submit(_run_in_thread, job.pk)
+    # "database": the row is the message
+
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="import")
+    return _executor
+
+
+def _run_in_thread(job_id: int) -> None:
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Import job %s crashed", job_id)
+    finally:
+        # Connections are per thread; don't leave this one open
+        connections.close_all()
+
+
+def _runnable() -> Q:
+    stale = timezone.now() - timedelta(seconds=settings.IMPORT_JOB_TIMEOUT)
+    return (
+        Q(status=ImportJob.QUEUED) | Q(status=ImportJob.RUNNING, heartbeat_at__lt=stale)
+    ) & Q(attempts__lt=settings.IMPORT_JOB_MAX_ATTEMPTS)
+
+
+def claim_job(job_id: int) -> Optional[ImportJob]:
+    """Mark the job running if it can run; None if it can't (or is taken)."""
+    fail_abandoned_jobs()
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(_runnable(), pk=job_id).update(
+        status=ImportJob.RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+        attempts=F("attempts") + 1,
+    )
+    if not claimed:
+        return None
+    return ImportJob.objects.select_related("user").get(pk=job_id)
+
+
+def run_job(job_id: int) -> Optional[ImportJob]:
+    """Claim and run a job; None if it was not runnable."""
+    job = claim_job(job_id)
+    if job is None:
+        logger.info("Import job %s is not runnable, skipped", job_id)
+        return None
+    platform = get_platform(job.platform)
+    if platform is None:
+        return _finish(job, ImportJob.FAILED, f"Unknown platform: {job.platform}")
+    try:
+        # Closed on errors too, which stops the fetches still running
+        with closing(platform.fetch(job.username)) as pages:
+            for page in pages:
+                _store_page(job, page)
+    except JobSuperseded:
+        logger.warning("Import job %s was claimed again, run stopped", job.pk)
+        return None
+    except PlatformError as exc:
+        logger.warning("Import job %s failed: %s", job.pk, exc)
+        return _finish(job, ImportJob.FAILED, str(exc))
+    except Exception:
+        logger.exception("Import job %s crashed", job.pk)
+        return _finish(job, ImportJob.FAILED, "The import failed unexpectedly.")
+    logger.info(
+        "Import job %s done: %d items, %d questions and %d logs created",
+        job.pk,
+        job.items_fetched,
+        job.questions_created,
+        job.logs_created,
+    )
+    return _finish(job, ImportJob.SUCCEEDED)
+
+
+def _this_run(job: ImportJob):
+    """The job's row, if this run still owns it."""
+    return ImportJob.objects.filter(
+        pk=job.pk, status=ImportJob.RUNNING, attempts=job.attempts
+    )
+
+
+def _store_page(job: ImportJob, page: Page) -> None:
+    """
+    Store a page and record the progress (and heartbeat) in one transaction,
+    rolled back with ``JobSuperseded`` if the job was claimed again meanwhile.
+    """
+    with transaction.atomic():
+        # One page of a user at a time, so the existence checks of
+        # store_completions can't race another run's inserts
+        get_user_model().objects.select_for_update().filter(pk=job.user_id).exists()
+        questions, logs = store_completions(job.user, page.completions)
+        job.pages_fetched += 1
+        job.items_fetched += len(page.completions)
+        job.questions_created += questions
+        job.logs_created += logs
+        if page.total_items is not None:
+            job.total_items = page.total_items
+        job.heartbeat_at = timezone.now()
+        updated = _this_run(job).update(
+            pages_fetched=job.pages_fetched,
+            items_fetched=job.items_fetched,
+            questions_created=job.questions_created,
+            logs_created=job.logs_created,
+            total_items=job.total_items,
+            heartbeat_at=job.heartbeat_at,
+        )
+        if not updated:
+            raise JobSuperseded(job.pk)
+
+
+def _finish(job: ImportJob, status: str, error: str = "") -> Optional[ImportJob]:
+    """Record the outcome; None if the job was claimed again meanwhile."""
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    updated = _this_run(job).update(
+        status=status, error=error, finished_at=job.finished_at
+    )
+    if not updated:
+        logger.warning("Import job %s was claimed again, outcome dropped", job.pk)
+        return None
+    return job
+
+
+def store_completions(user, completions: List[Completion]) -> Tuple[int, int]:
+    """
+    Save completions as questions (one per URL) with a Solved log each,
+    skipping what an earlier import saved. Returns the numbers created.
+    """
+    by_url = {completion.url: completion for completion in completions}
+    if not by_url:
+        return 0, 0
+    # The prefix is indexed; the full comparison keeps the match exact
+    existing = dict(
+        Question.objects.alias(source_prefix=source_prefix())
+        .filter(
+            user=user,
+            source_prefix__in={url[:SOURCE_PREFIX_LENGTH] for url in by_url},
+            source__in=list(by_url),
+        )
+        .values_list("source", "id")
+    )
+    new = [url for url in by_url if url not in existing]
+    created = create_valid_questions(
+        user,
+        [{"title": by_url[url].title[:TITLE_LENGTH], "source": url} for url in new],
+    )
+    for error in created.errors:
+        logger.warning("Imported question %s rejected: %s", new[error["index"]], error)
+    ids = {**existing, **{question.source: question.pk for question in created.created}}
+
+    logged = set(
+        QuestionLog.objects.filter(user=user, question_id__in=ids.values()).values_list(
+            "question_id", "date_attempted"
+        )
+    )
+    items = [
+        {
+            "question": ids[url],
+            "date_attempted": completion.completed_at,
+            "outcome": "Solved",
+            "solution_approach": ", ".join(completion.languages)[:APPROACH_LENGTH],
+        }
+        for url, completion in by_url.items()
+        if url in ids and (ids[url], completion.completed_at) not in logged
+    ]
+    logs = create_valid_question_logs(user, items)
+    for error in logs.errors:
+        logger.warning("Imported log rejected: %s", error)
+    return len(created.created), len(logs.created)
+
+
+def run_pending_jobs(limit: Optional[int] = None) -> int:
+    """Run runnable jobs, oldest first, until none are left; the number run."""
+    ran = 0
+    while limit is None or ran < limit:
+        job_id = (
+            ImportJob.objects.filter(_runnable())
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            break
+        if run_job(job_id) is not None:
+            ran += 1
+    return ran
+
+
+def fail_abandoned_jobs() -> int:
+    """
+    Fail the jobs still running after their last allowed attempt timed out;
+    the number failed.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.IMPORT_JOB_TIMEOUT)
+    return ImportJob.objects.filter(
+        status=ImportJob.RUNNING,
+        heartbeat_at__lt=stale,
+        attempts__gte=settings.IMPORT_JOB_MAX_ATTEMPTS,
+    ).update(
+        status=ImportJob.FAILED,
+        error="The import timed out.",
+        finished_at=timezone.now(),
+    )
+
+
+def message_job_id(body: Union[str, Dict[str, Any]]) -> Optional[int]:
+    """
+    The job of a queue message (as published by ``enqueue_import_job``);
+    None for malformed messages and other actions, which are logged.
+    """
+    try:
+        message = json.loads(body) if isinstance(body, str) else body
+        if message.get("action") != IMPORT_ACTION:
+            logger.warning("Ignored queue message: %s", message.get("action"))
+            return None
+        return int(message["data"]["job_id"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        logger.warning("Ignored malformed queue message: %.200r", body)
+        return None
+
+
+def handle_message(body: Union[str, Dict[str, Any]]) -> Optional[ImportJob]:
+    """Run the job of a queue message; None if there is none or it can't run."""
+    job_id = message_job_id(body)
+    return run_job(job_id) if job_id is not None else None
+
+
+def job_settled(job_id: int) -> bool:
+    """Whether the job is finished (or gone), so its message can be dropped."""
+    return not ImportJob.objects.filter(
+        pk=job_id, status__in=ImportJob.ACTIVE_STATUSES
+    ).exists()
@@ -1,52 +1,400 @@
+"""
+Generate realistic fake users, tags, questions and logs at scale.
+
+Usage is skewed as in real data. Questions per user follow a log-normal
+distribution (a few heavy users, many light ones). Logs per question are
+geometric, so many questions are never attempted. Tag, source and difficulty
+popularity are weighted, and later attempts are more likely to be solved.
+Every user's data is drawn from a generator seeded with ``--seed`` and the
+user's index, so a seed reproduces the same data whatever the worker count.
+Slugs are the exception: they keep their random suffix.
+
+Users are split into batches of about ``--chunk-size`` questions and the
+batches are written with ``bulk_create`` by ``--workers`` processes. No
+per-row signal runs, so the aggregates are filled in by one grouped pass
+(``rebuild_chunk``) over the new questions at the end.
+"""
+
+import math
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Dict, List, Tuple
 
-from django.core.management.base import BaseCommand
-from django.utils.timezone import make_aware
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
 from faker import Faker
 
+from backend.core.management.commands.rebuild_question_aggregates import (
+    rebuild_chunk,
+)
 from backend.core.models import Question, QuestionLog, Tag
+from backend.core.search import refresh_search_vectors
+from backend.core.utils import SlugGenerator
+
+FAKE_PASSWORD = "password"
+
+TOPICS = [
+    "arrays",
+    "strings",
+    "hash-tables",
+    "two-pointers",
+    "sliding-window",
+    "binary-search",
+    "linked-lists",
+    "stacks",
+    "queues",
+    "trees",
+    "graphs",
+    "heaps",
+    "greedy",
+    "backtracking",
+    "dynamic-programming",
+    "bit-manipulation",
+    "math",
+    "sorting",
+    "tries",
+    "system-design",
+]
+SOURCES = (
+    ("LeetCode", 50),
+    ("HackerRank", 12),
+    ("Cracking the Coding Interview", 10),
+    ("Phone screen", 8),
+    ("Onsite interview", 8),
+    ("Codeforces", 6),
+    ("", 6),
+)
+DIFFICULTIES = (("Easy", 30), ("Medium", 50), ("Hard", 20))
+MINUTES_BY_DIFFICULTY = {"Easy": 15, "Medium": 30, "Hard": 50}
+APPROACHES = [
+    "Brute force",
+    "Optimized",
+    "Two pointers",
+    "Memoization",
+    "Bottom-up DP",
+    "BFS",
+    "DFS",
+    "Sorting",
+    "Hash map",
+    "",
+]
+# Number of tags on a question: 0..4
+TAG_COUNT_WEIGHTS = (10, 35, 35, 15, 5)
+# Days back of a question's first attempt, and between attempts
+FIRST_ATTEMPT_MEAN_DAYS = 90
+RETRY_MEAN_DAYS = 7
+MAX_AGE_DAYS = 365
+
+
+@dataclass
+class UserPlan:
+    index: int
+    user_id: int
+    questions: int
+
+
+def skewed_count(rng: random.Random, mean: float, sigma: float = 1.0) -> int:
+    """A log-normal count with the given mean."""
+    if mean <= 0:
+        return 0
+    return round(rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma))
+
+
+def geometric_count(rng: random.Random, mean: float) -> int:
+    """A geometric count (0, 1, 2, ...) with the given mean."""
+    if mean <= 0:
+        return 0
+    return int(math.log(1.0 - rng.random()) / math.log(mean / (mean + 1)))
+
+
+def build_vocabulary(seed: int) -> Dict[str, List[str]]:
+    """Word and text pools; drawing from them is much cheaper than Faker."""
+    fake = Faker()
+    fake.seed_instance(seed)
+    return {
+        "words": fake.words(400, unique=True),
+        "paragraphs": [fake.paragraph(nb_sentences=5) for _ in range(200)],
+        "notes": [fake.sentence(nb_words=12) for _ in range(200)],
+    }
+
+
+class BatchWriter:
+    """Writes the data of one batch of users, ``chunk_size`` questions at a time."""
+
+    def __init__(
+        self,
+        seed: int,
+        vocabulary: Dict[str, List[str]],
+        logs_per_question: float,
+        tags_per_user: int,
+        chunk_size: int,
+    ):
+        self.seed = seed
+        self.vocabulary = vocabulary
+        self.logs_per_question = logs_per_question
+        self.tags_per_user = tags_per_user
+        self.chunk_size = chunk_size
+        self.now = datetime.now(timezone.utc)
+        self.counts = {"tags": 0, "questions": 0, "logs": 0}
+        self.spans: List[Tuple[int, int]] = []
+        self._reset()
+
+    def _reset(self):
+        self.questions: List[Question] = []
+        self.question_tags: List[List[int]] = []
+        self.question_logs: List[List[QuestionLog]] = []
+
+    def write(self, plans: List[UserPlan]) -> Dict[str, Any]:
+        for plan in plans:
+            self._add_user(plan)
+        self._flush()
+        return {**self.counts, "spans": self.spans}
+
+    def _add_user(self, plan: UserPlan) -> None:
+        rng = random.Random(f"{self.seed}:{plan.index}")
+        topics = rng.sample(TOPICS, min(self.tags_per_user, len(TOPICS)))
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"{topic}-u{plan.user_id}", user_id=plan.user_id)
+            for topic in topics
+        )
+        self.counts["tags"] += len(tags)
+        # Zipf-like: a user's first topics are their most used
+        tag_weights = [1 / (rank + 1) for rank in range(len(tags))]
+
+        for _ in range(plan.questions):
+            question = self._question(rng, plan.user_id)
+            self.questions.append(question)
+            count = rng.choices(range(len(TAG_COUNT_WEIGHTS)), TAG_COUNT_WEIGHTS)[0]
+            picked = rng.choices(tags, tag_weights, k=count) if tags else []
+            self.question_tags.append(list({tag.pk: None for tag in picked}))
+            self.question_logs.append(self._logs(rng, plan.user_id, question))
+            if len(self.questions) >= self.chunk_size:
+                self._flush()
+
+    def _question(self, rng: random.Random, user_id: int) -> Question:
+        words = rng.sample(self.vocabulary["words"], rng.randint(3, 8))
+        title = " ".join(words).capitalize()
+        slug, _ = SlugGenerator.generate_slug_candidate(SlugGenerator.base_slug(title))
+        return Question(
+            user_id=user_id,
+            title=title,
+            slug=slug,
+            content=" ".join(
+                rng.choices(self.vocabulary["paragraphs"], k=rng.randint(1, 3))
+            ),
+            source=rng.choices(*zip(*SOURCES))[0],
+            difficulty=rng.choices(*zip(*DIFFICULTIES))[0],
+            is_active=rng.random() < 0.95,
+        )
+
+    def _logs(
+        self, rng: random.Random, user_id: int, question: Question
+    ) -> List[QuestionLog]:
+        logs = []
+        attempted = self.now - timedelta(
+            days=min(rng.expovariate(1 / FIRST_ATTEMPT_MEAN_DAYS), MAX_AGE_DAYS)
+        )
+        for attempt in range(geometric_count(rng, self.logs_per_question)):
+            solved = min(0.85, 0.35 + 0.15 * attempt)
+            logs.append(
+                QuestionLog(
+                    user_id=user_id,
+                    date_attempted=attempted,
+                    time_spent_min=max(
+                        1,
+                        round(
+                            MINUTES_BY_DIFFICULTY.get(question.difficulty, 30)
+                            * rng.lognormvariate(0, 0.4)
+                        ),
+                    ),
+                    outcome=rng.choices(
+                        ("Solved", "Partial", "Failed"),
+                        (solved, 0.2, max(0.0, 0.8 - solved)),
+                    )[0],
+                    solution_approach=rng.choice(APPROACHES),
+                    self_notes=(
+                        rng.choice(self.vocabulary["notes"])
+                        if rng.random() < 0.5
+                        else ""
+                    ),
+                )
+            )
+            attempted = min(
+                self.now,
+                attempted + timedelta(days=rng.expovariate(1 / RETRY_MEAN_DAYS)),
+            )
+        return logs
+
+    def _flush(self) -> None:
+        if not self.questions:
+            return
+        through = Question.tags.through
+        with transaction.atomic():
+            questions = SlugGenerator.bulk_create_with_unique_slugs(
+                Question, self.questions, [q.title for q in self.questions]
+            )
+            through.objects.bulk_create(
+                through(question_id=question.pk, tag_id=tag_id)
+                for question, tag_ids in zip(questions, self.question_tags)
+                for tag_id in tag_ids
+            )
+            logs = []
+            for question, question_logs in zip(questions, self.question_logs):
+                for log in question_logs:
+                    log.question_id = question.pk
+                    logs.append(log)
+            QuestionLog.objects.bulk_create(logs, batch_size=self.chunk_size)
+            ids = [question.pk for question in questions]
+            if connection.vendor == "postgresql":
+                # SQLite keeps its FTS index in sync with triggers
+                refresh_search_vectors(Question.objects.filter(pk__in=ids))
+        self.counts["questions"] += len(questions)
+        self.counts["logs"] += len(logs)
+        self.spans.append((min(ids), max(ids)))
+        self._reset()
+
+
+def write_batch(plans: List[UserPlan], **writer_options) -> Dict[str, Any]:
+    return BatchWriter(**writer_options).write(plans)
+
+
+def _init_worker():
+    django.setup()
 
 
 class Command(BaseCommand):
-    help = "Create fake data for testing purposes"
-
-    def handle(self, *args, **kwargs):
-        fake = Faker()
-
-        # Create Tags
-        tags = []
-        for _ in range(10):
-            tag_name = fake.word()
-            tag, _ = Tag.objects.get_or_create(name=tag_name)
-            tags.append(tag)
-
-        # Create Questions
-        questions = []
-        for _ in range(50):
-            question = Question.objects.create(
-                title=fake.sentence(),
-                source=fake.company(),
-                difficulty=random.choice(["Easy", "Medium", "Hard"]),
-                content=fake.text(),
-                slug=f"{fake.word()}-{fake.uuid4()}",
-                is_active=random.choice([True, False]),
-                attempts_count=random.randint(1, 5),
-                solved_count=random.randint(0, 5),
-                last_attempted_at=make_aware(fake.date_time_this_year()),
+    help = (
+        "Create fake users, tags, questions and logs with realistic, skewed "
+        "distributions, using bulk inserts across worker processes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5)
+        parser.add_argument(
+            "--questions-per-user",
+            type=float,
+            default=50,
+            help="Mean questions per user (log-normal)",
+        )
+        parser.add_argument(
+            "--logs-per-question",
+            type=float,
+            default=3,
+            help="Mean logs per question (geometric)",
+        )
+        parser.add_argument("--tags-per-user", type=int, default=10)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed for reproducible data (default: random)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes to write in (PostgreSQL only)",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--users, --chunk-size and --workers must be positive")
+        if options["questions_per_user"] < 0 or options["logs_per_question"] < 0:
+            raise CommandError(
+                "--questions-per-user and --logs-per-question must not be negative"
             )
-            question.tags.set(random.sample(tags, random.randint(1, 5)))
-            questions.append(question)
-
-        # Create QuestionLogs
-        for question in questions:
-            for _ in range(random.randint(1, 3)):
-                QuestionLog.objects.create(
-                    question=question,
-                    date_attempted=make_aware(fake.date_time_this_year()),
-                    time_spent_min=random.randint(5, 120),
-                    outcome=random.choice(["Solved", "Partial", "Failed"]),
-                    solution_approach=fake.word(),
-                    self_notes=fake.text(),
-                )
+        seed = options["seed"]
+        if seed is None:
+            seed = random.randrange(2**31)
+        workers = options["workers"]
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stdout.write("SQLite serializes writes; using a single worker")
+            workers = 1
+
+        started = time.monotonic()
+        plans = self._create_users(seed, options)
+        batches = self._batches(plans, options["chunk_size"])
+        write = partial(
+            write_batch,
+            seed=seed,
+            vocabulary=build_vocabulary(seed),
+            logs_per_question=options["logs_per_question"],
+            tags_per_user=options["tags_per_user"],
+            chunk_size=options["chunk_size"],
+        )
+        totals = {"tags": 0, "questions": 0, "logs": 0}
+        spans: List[Tuple[int, int]] = []
+
+        if workers == 1:
+            spans = self._collect(map(write, batches), totals)
+            updated = sum(rebuild_chunk(span)["updated"] for span in spans)
+        else:
+            # Children must open their own connections rather than share ours
+            connections.close_all()
+            with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                spans = self._collect(pool.map(write, batches), totals)
+                updated = sum(r["updated"] for r in pool.map(rebuild_chunk, spans))
 
-        self.stdout.write(self.style.SUCCESS("Successfully created fake data"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(plans)} users, {totals['tags']} tags, "
+                f"{totals['questions']} questions and {totals['logs']} logs "
+                f"(aggregates of {updated} questions) with seed {seed} "
+                f"in {time.monotonic() - started:.1f}s. "
+                f"Users are fake-{seed}-<n>, password '{FAKE_PASSWORD}'"
+            )
+        )
+
+    def _create_users(self, seed: int, options) -> List[UserPlan]:
+        User = get_user_model()
+        prefix = f"fake-{seed}-"
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Fake users for seed {seed} already exist")
+        rng = random.Random(seed)
+        counts = [
+            skewed_count(rng, options["questions_per_user"])
+            for _ in range(options["users"])
+        ]
+        # One hash for everyone; hashing per user would dominate small runs
+        password = make_password(FAKE_PASSWORD)
+        users = User.objects.bulk_create(
+            User(username=f"{prefix}{i}", password=password)
+            for i in range(options["users"])
+        )
+        return [
+            UserPlan(index=i, user_id=user.pk, questions=count)
+            for i, (user, count) in enumerate(zip(users, counts))
+        ]
+
+    def _batches(self, plans: List[UserPlan], chunk_size: int) -> List[List[UserPlan]]:
+        """Group users into batches of about ``chunk_size`` questions."""
+        batches: List[List[UserPlan]] = []
+        batch: List[UserPlan] = []
+        size = 0
+        for plan in plans:
+            batch.append(plan)
+            size += plan.questions
+            if size >= chunk_size:
+                batches.append(batch)
+                batch, size = [], 0
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _collect(self, results, totals: Dict[str, int]) -> List[Tuple[int, int]]:
+        spans: List[Tuple[int, int]] = []
+        for result in results:
+            for name in totals:
+                totals[name] += result[name]
+            spans.extend(result["spans"])
+            self.stdout.write(
+                f"  {totals['questions']} questions, {totals['logs']} logs written"
+            )
+        return spans
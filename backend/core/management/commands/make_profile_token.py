@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.profiling import HEADER, make_profile_token
+
+
+class Command(BaseCommand):
+    help = "Print an X-Profile header value that profiles requests sending it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=60,
+            help="How long the token stays valid (default: 60)",
+        )
+
+    def handle(self, *args, **options):
+        token = make_profile_token(max_age=options["minutes"] * 60)
+        self.stdout.write(f"{HEADER}: {token}")
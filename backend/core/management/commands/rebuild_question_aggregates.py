@@ -0,0 +1,256 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from backend.core.models import Question, QuestionLog
+from backend.core.versioning import bump_user_data_version
+
+SAMPLE_SIZE = 5
+
+Chunk = Tuple[int, int]
+
+
+def _aggregate_sql(user_ids: Optional[Sequence[int]]) -> Tuple[str, List[Any]]:
+    """
+    Per-question aggregates for the questions in an ID range, as a subquery
+    with columns (question_id, attempts, solved, latest).
+    """
+    qn = connection.ops.quote_name
+    question, log = Question._meta.db_table, QuestionLog._meta.db_table
+    sql = f"""
+        SELECT q.id AS question_id,
+               COUNT(l.id) AS attempts,
+               COALESCE(SUM(CASE WHEN l.outcome = %s THEN 1 ELSE 0 END), 0)
+                   AS solved,
+               MAX(l.date_attempted) AS latest
+        FROM {qn(question)} q
+        LEFT JOIN {qn(log)} l ON l.question_id = q.id
+        WHERE q.id >= %s AND q.id <= %s
+    """
+    params: List[Any] = ["Solved"]
+    if user_ids is not None:
+        sql += f" AND q.user_id IN ({', '.join(['%s'] * len(user_ids))})"
+        params.extend(user_ids)
+    return sql + " GROUP BY q.id", params
+
+
+def _drift_condition(table: str) -> str:
+    distinct = "IS DISTINCT FROM" if connection.vendor == "postgresql" else "IS NOT"
+    return (
+        f"({table}.attempts_count <> a.attempts"
+        f" OR {table}.solved_count <> a.solved"
+        f" OR {table}.last_attempted_at {distinct} a.latest)"
+    )
+
+
+def rebuild_chunk(
+    chunk: Chunk, user_ids: Optional[Sequence[int]] = None, dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Recompute (or, with ``dry_run``, only compare) the aggregates of the
+    questions whose IDs fall in ``chunk`` with one grouped statement.
+    """
+    low, high = chunk
+    aggregate_sql, params = _aggregate_sql(user_ids)
+    params = params[:1] + [low, high] + params[1:]
+    question = connection.ops.quote_name(Question._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT q.id, q.attempts_count, q.solved_count, q.last_attempted_at,
+                   a.attempts, a.solved, a.latest, q.user_id
+            FROM {question} q JOIN ({aggregate_sql}) a ON a.question_id = q.id
+            WHERE {_drift_condition("q")}
+            ORDER BY q.id
+            """,
+            params,
+        )
+        drifted = cursor.fetchall()
+        updated = 0
+        if drifted and not dry_run:
+            with transaction.atomic():
+                cursor.execute(
+                    f"""
+                    UPDATE {question}
+                    SET attempts_count = a.attempts,
+                        solved_count = a.solved,
+                        last_attempted_at = a.latest
+                    FROM ({aggregate_sql}) a
+                    WHERE {question}.id = a.question_id
+                      AND {_drift_condition(question)}
+                    """,
+                    params,
+                )
+                updated = cursor.rowcount
+    return {
+        "chunk": chunk,
+        "drifted": len(drifted),
+        "updated": updated,
+        "user_ids": sorted({row[7] for row in drifted}) if updated else [],
+        "samples": [
+            {
+                "id": row[0],
+                "stored": [row[1], row[2], str(row[3]) if row[3] else None],
+                "actual": [row[4], row[5], str(row[6]) if row[6] else None],
+            }
+            for row in drifted[:SAMPLE_SIZE]
+        ],
+    }
+
+
+def _init_worker():
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Question attempts_count, solved_count and last_attempted_at "
+        "from QuestionLog, one grouped UPDATE per chunk of questions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="users",
+            metavar="USERNAME",
+            help="Only rebuild this user's questions (repeatable)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes to run chunks in (PostgreSQL only)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report questions whose aggregates have drifted",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            metavar="PATH",
+            help=(
+                "File recording finished chunks; rerun with the same file to "
+                "resume after an interruption. Removed once the rebuild completes"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+        user_ids = self._user_ids(options["users"])
+        chunks = self._chunks(user_ids, options["chunk_size"])
+        dry_run = options["dry_run"]
+        workers = options["workers"]
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stdout.write("SQLite serializes writes; using a single worker")
+            workers = 1
+
+        checkpoint = None if dry_run else options["checkpoint"]
+        state = self._load_checkpoint(checkpoint, user_ids, options["chunk_size"])
+        done = {tuple(chunk) for chunk in state["completed"]}
+        pending = [chunk for chunk in chunks if chunk not in done]
+        if done:
+            self.stdout.write(
+                f"Resuming: {len(chunks) - len(pending)} of {len(chunks)} "
+                "chunks already done"
+            )
+
+        drifted = updated = 0
+        for result in self._run(pending, user_ids, dry_run, workers):
+            drifted += result["drifted"]
+            updated += result["updated"]
+            for user_id in result["user_ids"]:
+                bump_user_data_version(user_id)
+            for sample in result["samples"] if dry_run else ():
+                self.stdout.write(
+                    f"  question {sample['id']}: stored {sample['stored']}, "
+                    f"actual {sample['actual']}"
+                )
+            if checkpoint:
+                state["completed"].append(list(result["chunk"]))
+                self._save_checkpoint(checkpoint, state)
+
+        if dry_run:
+            self.stdout.write(
+                f"{drifted} questions have drifted aggregates "
+                f"({len(pending)} chunks checked)"
+            )
+            return
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt aggregates: {updated} questions updated "
+                f"in {len(pending)} chunks"
+            )
+        )
+
+    def _user_ids(self, usernames: Optional[List[str]]) -> Optional[List[int]]:
+        if not usernames:
+            return None
+        users = dict(
+            get_user_model()
+            .objects.filter(username__in=usernames)
+            .values_list("username", "id")
+        )
+        missing = sorted(set(usernames) - set(users))
+        if missing:
+            raise CommandError(f"Unknown users: {', '.join(missing)}")
+        return sorted(users.values())
+
+    def _chunks(self, user_ids: Optional[List[int]], size: int) -> List[Chunk]:
+        """Split the selected question IDs into inclusive ranges of ``size``."""
+        questions = Question.objects.order_by("id")
+        if user_ids is not None:
+            questions = questions.filter(user_id__in=user_ids)
+        ids = questions.values_list("id", flat=True)
+        chunks = []
+        low = ids.first()
+        while low is not None:
+            start, stop = size - 1, size + 1
+            boundary = list(ids.filter(id__gte=low)[start:stop])
+            high = boundary[0] if boundary else ids.last()
+            chunks.append((low, high))
+            low = boundary[1] if len(boundary) > 1 else None
+        return chunks
+
+    def _run(self, chunks, user_ids, dry_run, workers):
+        if workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield rebuild_chunk(chunk, user_ids, dry_run)
+            return
+        # Children must open their own connections rather than share ours
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(rebuild_chunk, chunk, user_ids, dry_run) for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _load_checkpoint(self, path, user_ids, chunk_size) -> Dict[str, Any]:
+        state = {"users": user_ids, "chunk_size": chunk_size, "completed": []}
+        if not path or not os.path.exists(path):
+            return state
+        with open(path) as f:
+            saved = json.load(f)
+        if (saved.get("users"), saved.get("chunk_size")) != (user_ids, chunk_size):
+            raise CommandError(
+                f"Checkpoint {path} was written with different --user/--chunk-size"
+            )
+        return saved
+
+    def _save_checkpoint(self, path, state) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
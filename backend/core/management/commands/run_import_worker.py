@@ -0,0 +1,119 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.core.import_jobs import (
+    fail_abandoned_jobs,
+    job_settled,
+    message_job_id,
+    run_job,
+    run_pending_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest wait SQS allows for a receive
+SQS_WAIT_SECONDS = 20
+# Longest visibility timeout SQS allows
+SQS_MAX_VISIBILITY = 12 * 60 * 60
+# Seconds between sweeps for jobs abandoned by dead workers
+SWEEP_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued platform import jobs: the queued rows with the database "
+        "queue, or the messages of IMPORT_QUEUE_URL with SQS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs waiting now, then exit",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between checks of an empty database queue",
+        )
+
+    def handle(self, *args, **options):
+        self.next_sweep = 0.0
+        backend = settings.IMPORT_QUEUE_BACKEND
+        if backend == "sqs":
+            self._consume_sqs(options["once"])
+        elif backend == "database":
+            self._drain_database(options["once"], options["poll_interval"])
+        else:
+            raise CommandError(
+                f"IMPORT_QUEUE_BACKEND={backend!r} runs jobs in the web process; "
+                "the worker needs 'database' or 'sqs'."
+            )
+
+    def _sweep(self):
+        """Fail the abandoned jobs no worker will claim again, now and then."""
+        now = time.monotonic()
+        if now < self.next_sweep:
+            return
+        self.next_sweep = now + SWEEP_INTERVAL
+        failed = fail_abandoned_jobs()
+        if failed:
+            self.stdout.write(f"Failed {failed} abandoned import job(s)")
+
+    def _drain_database(self, once: bool, poll_interval: float):
+        while True:
+            self._sweep()
+            ran = run_pending_jobs()
+            if ran:
+                self.stdout.write(f"Ran {ran} import job(s)")
+            if once:
+                return
+            time.sleep(poll_interval)
+
+    def _consume_sqs(self, once: bool):
+        from backend.aws import get_sqs_client
+
+        sqs = get_sqs_client(region_name=settings.IMPORT_QUEUE_REGION or None)
+        while True:
+            self._sweep()
+            messages = sqs.receive_message(
+                QueueUrl=settings.IMPORT_QUEUE_URL,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=0 if once else SQS_WAIT_SECONDS,
+            ).get("Messages", [])
+            for message in messages:
+                try:
+                    self._handle_sqs_message(sqs, message)
+                except Exception:
+                    # Left on the queue, so it is delivered again
+                    logger.exception("Import message %s failed", message["MessageId"])
+            if once and not messages:
+                return
+
+    def _handle_sqs_message(self, sqs, message):
+        """
+        Run the message's job and delete the message once the job is
+        finished. A job still running elsewhere keeps its message, hidden
+        until the job would time out: if that worker died, the job is claimed
+        again then, or failed by the sweep.
+        """
+        job_id = message_job_id(message["Body"])
+        if job_id is not None:
+            run_job(job_id)
+        if job_id is None or job_settled(job_id):
+            sqs.delete_message(
+                QueueUrl=settings.IMPORT_QUEUE_URL,
+                ReceiptHandle=message["ReceiptHandle"],
+            )
+            self.stdout.write(f"Handled message {message['MessageId']}")
+        else:
+            sqs.change_message_visibility(
+                QueueUrl=settings.IMPORT_QUEUE_URL,
+                ReceiptHandle=message["ReceiptHandle"],
+                VisibilityTimeout=min(settings.IMPORT_JOB_TIMEOUT, SQS_MAX_VISIBILITY),
+            )
+            self.stdout.write(f"Deferred message {message['MessageId']}")
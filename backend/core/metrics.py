@@ -0,0 +1,167 @@
+"""
+Per-route request metrics in Prometheus format.
+
+``MetricsMiddleware`` records, per route name and method, request latency,
+response size, the number and duration of database queries (through
+``connection.execute_wrapper``) and the time spent building serializer
+output. ``render_metrics`` produces the text served at ``/api/metrics/``.
+
+With several gunicorn workers set ``PROMETHEUS_MULTIPROC_DIR`` (see
+``gunicorn.conf.py``): every worker then writes its samples to memory-mapped
+files in that directory and the endpoint adds them up, whichever worker
+answers the scrape.
+"""
+
+import os
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from django.db import connections
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from rest_framework import serializers
+
+LABELS = ("route", "method")
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests",
+    "Requests handled, by route, method and status code.",
+    LABELS + ("status",),
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from the request reaching the middleware to the response leaving it.",
+    LABELS,
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per request.",
+    LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float("inf")),
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time per request spent in database queries.",
+    LABELS,
+)
+SERIALIZER_TIME = Histogram(
+    "http_request_serializer_duration_seconds",
+    "Time per request spent building serializer output, excluding queries.",
+    LABELS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response body; streaming responses aren't counted.",
+    LABELS,
+    buckets=tuple(4**i for i in range(3, 12)) + (float("inf"),),
+)
+
+
+class RequestMetrics:
+    """What one request has spent so far."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        # Nested serializer .data reads are already inside the outer one
+        self.serializer_depth = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def _route(request) -> Tuple[str, str]:
+    match = getattr(request, "resolver_match", None)
+    route = match.view_name if match is not None else UNMATCHED_ROUTE
+    return route or UNMATCHED_ROUTE, request.method
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+
+        labels = _route(request)
+        REQUESTS.labels(*labels, str(response.status_code)).inc()
+        LATENCY.labels(*labels).observe(elapsed)
+        DB_QUERIES.labels(*labels).observe(metrics.queries)
+        DB_TIME.labels(*labels).observe(metrics.db_seconds)
+        SERIALIZER_TIME.labels(*labels).observe(metrics.serializer_seconds)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+
+def _timed_data(data_property):
+    """Wrap a serializer ``data`` property to add its time to the request."""
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializer_depth:
+            return data_property.fget(self)
+        metrics.serializer_depth += 1
+        db_before = metrics.db_seconds
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            metrics.serializer_depth -= 1
+            # Lazy querysets run while serializing; they count as DB time
+            metrics.serializer_seconds += (time.perf_counter() - start) - (
+                metrics.db_seconds - db_before
+            )
+
+    return property(data)
+
+
+def instrument_serializers() -> None:
+    """Time ``.data`` of every DRF serializer; called once at app start."""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, "timed", False):
+            cls.data = _timed_data(cls.data)
+            cls.data.fget.timed = True
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """The Prometheus exposition of all workers' metrics, and its type."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
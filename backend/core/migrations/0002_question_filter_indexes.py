@@ -0,0 +1,126 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:03
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="question",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, help_text="Timestamp when the record was created"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="is_active",
+            field=models.BooleanField(
+                default=True, help_text="Indicates if the record is active"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, help_text="Timestamp when the record was last updated"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tag",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, help_text="Timestamp when the record was created"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tag",
+            name="is_active",
+            field=models.BooleanField(
+                default=True, help_text="Indicates if the record is active"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tag",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, help_text="Timestamp when the record was last updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "-created_at", "title", "id"],
+                name="question_user_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "difficulty", "-created_at", "title"],
+                name="question_user_difficulty_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "is_active", "-created_at", "title"],
+                name="question_user_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                models.F("user"),
+                django.db.models.functions.text.Left("source", 255),
+                name="question_user_source_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "-last_attempted_at"], name="question_user_last_att_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "attempts_count"], name="question_user_attempts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["user", "solved_count"], name="question_user_solved_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                models.F("user"),
+                django.db.models.functions.comparison.Coalesce(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.functions.comparison.Cast(
+                            "solved_count", models.FloatField()
+                        ),
+                        "/",
+                        django.db.models.functions.comparison.NullIf(
+                            "attempts_count", 0
+                        ),
+                    ),
+                    models.Value(0.0),
+                ),
+                name="question_user_ratio_idx",
+            ),
+        ),
+    ]
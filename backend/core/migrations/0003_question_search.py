@@ -0,0 +1,75 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:06
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The search index is vendor specific (see backend/core/search.py), so it is
+# created here rather than declared in Question.Meta.indexes.
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX question_search_vector_idx ON core_question "
+    "USING gin (search_vector)",
+    "UPDATE core_question SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(source, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+]
+POSTGRES_REVERSE = ["DROP INDEX IF EXISTS question_search_vector_idx"]
+
+# Column order must match SEARCH_COLUMNS in backend/core/search.py
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_question_fts USING fts5("
+    "title, source, content, content='core_question', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER core_question_fts_ai AFTER INSERT ON core_question BEGIN "
+    "INSERT INTO core_question_fts(rowid, title, source, content) "
+    "VALUES (new.id, new.title, new.source, new.content); END",
+    "CREATE TRIGGER core_question_fts_ad AFTER DELETE ON core_question BEGIN "
+    "INSERT INTO core_question_fts(core_question_fts, rowid, title, source, content) "
+    "VALUES ('delete', old.id, old.title, old.source, old.content); END",
+    "CREATE TRIGGER core_question_fts_au AFTER UPDATE OF title, source, content "
+    "ON core_question BEGIN "
+    "INSERT INTO core_question_fts(core_question_fts, rowid, title, source, content) "
+    "VALUES ('delete', old.id, old.title, old.source, old.content); "
+    "INSERT INTO core_question_fts(rowid, title, source, content) "
+    "VALUES (new.id, new.title, new.source, new.content); END",
+    "INSERT INTO core_question_fts(core_question_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_question_fts_ai",
+    "DROP TRIGGER IF EXISTS core_question_fts_ad",
+    "DROP TRIGGER IF EXISTS core_question_fts_au",
+    "DROP TABLE IF EXISTS core_question_fts",
+]
+
+
+def _run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {"postgresql": postgres, "sqlite": sqlite}.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_question_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            _run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            _run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_request_profile"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("platform", models.CharField(max_length=50)),
+                (
+                    "username",
+                    models.CharField(
+                        help_text="The user's name on the platform", max_length=255
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "total_items",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Items the platform reported, if known",
+                        null=True,
+                    ),
+                ),
+                ("pages_fetched", models.PositiveIntegerField(default=0)),
+                ("items_fetched", models.PositiveIntegerField(default=0)),
+                ("questions_created", models.PositiveIntegerField(default=0)),
+                ("logs_created", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-created_at"], name="importjob_user_idx"
+                    ),
+                    models.Index(
+                        fields=["status", "created_at"], name="importjob_status_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
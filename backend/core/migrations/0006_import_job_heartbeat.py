@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:03
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_heartbeats(apps, schema_editor):
+    # Running jobs get a heartbeat, or they could never be found abandoned
+    ImportJob = apps.get_model("core", "ImportJob")
+    ImportJob.objects.update(heartbeat_at=F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_import_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,27 @@
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, router
+from django.db.models.functions import Cast, Coalesce, Left, NullIf
 
+from .search import search_vector_from_values
 from .utils import SlugGenerator
 
+# Length of the indexed source prefix; source itself is too long for a btree
+SOURCE_PREFIX_LENGTH = 255
+
+
+def solve_ratio():
+    """Solved/attempted ratio expression; 0 for never-attempted questions."""
+    return Coalesce(
+        Cast("solved_count", models.FloatField()) / NullIf("attempts_count", 0),
+        models.Value(0.0),
+    )
+
+
+def source_prefix():
+    """Indexed prefix of ``Question.source`` used for exact-match filtering."""
+    return Left("source", SOURCE_PREFIX_LENGTH)
+
 
 class BaseModel(models.Model):
     """Base model with common fields and behavior"""
@@ -84,14 +103,74 @@ class Question(BaseModel):
         null=True, blank=True, help_text="Timestamp of the last attempt"
     )
 
+    # Full-text search document (PostgreSQL only; see backend/core/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ["-created_at", "title"]
+        # Every list filter and sort key is scoped to a user, so each index
+        # leads with user_id. See backend/core/filters.py for the consumers.
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "title", "id"],
+                name="question_user_created_idx",
+            ),
+            models.Index(
+                fields=["user", "difficulty", "-created_at", "title"],
+                name="question_user_difficulty_idx",
+            ),
+            models.Index(
+                fields=["user", "is_active", "-created_at", "title"],
+                name="question_user_active_idx",
+            ),
+            models.Index(
+                models.F("user"), source_prefix(), name="question_user_source_idx"
+            ),
+            models.Index(
+                fields=["user", "-last_attempted_at"],
+                name="question_user_last_att_idx",
+            ),
+            models.Index(
+                fields=["user", "attempts_count"], name="question_user_attempts_idx"
+            ),
+            models.Index(
+                fields=["user", "solved_count"], name="question_user_solved_idx"
+            ),
+            models.Index(
+                models.F("user"), solve_ratio(), name="question_user_ratio_idx"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        """Override save to generate slug before saving"""
-        if not self.slug:
-            self.slug = SlugGenerator.generate_unique_slug(self.__class__, self.title)
-        super().save(*args, **kwargs)
+        """Override save to generate slug and search vector before saving"""
+        refresh_search_vector = self._set_search_vector(kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            SlugGenerator.save_with_unique_slug(
+                self, self.title, lambda: super(Question, self).save(*args, **kwargs)
+            )
+        if refresh_search_vector:
+            # Drop the expression so the stored vector is lazily re-read
+            del self.search_vector
+
+    def _set_search_vector(self, save_kwargs):
+        """
+        Refresh the PostgreSQL search vector in the same write as the row.
+        SQLite keeps its FTS5 index in sync with triggers instead.
+        """
+        using = save_kwargs.get("using") or router.db_for_write(self.__class__)
+        if connections[using].vendor != "postgresql":
+            return False
+        update_fields = save_kwargs.get("update_fields")
+        if update_fields is not None:
+            if not {"title", "content", "source"} & set(update_fields):
+                return False
+            save_kwargs["update_fields"] = {*update_fields, "search_vector"}
+        self.search_vector = search_vector_from_values(
+            title=self.title, content=self.content, source=self.source
+        )
+        return True
 
     def __str__(self):
         return f"{self.title} [{self.slug}]"
@@ -133,3 +212,90 @@ class QuestionLog(models.Model):
             self.date_attempted.strftime("%Y-%m-%d") if self.date_attempted else "N/A"
         )
         return f"{self.question.title} ({self.outcome}) - {date_str}"
+
+
+class RequestProfile(models.Model):
+    """
+    A profiled request (see ``backend.core.profiling``).
+
+    The cProfile stats and captured queries live in ``PROFILE_DIR`` under
+    ``name``; the row keeps what the admin lists.
+    """
+
+    name = models.CharField(max_length=64, unique=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_ms = models.FloatField()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class ImportJob(models.Model):
+    """
+    An import of a user's history from a coding platform, run in the
+    background (see ``backend.core.import_jobs``); clients poll it for progress.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    platform = models.CharField(max_length=50)
+    username = models.CharField(
+        max_length=255, help_text="The user's name on the platform"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed with every page saved; a stale heartbeat means a dead worker
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # Progress counters, updated after each page
+    total_items = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Items the platform reported, if known"
+    )
+    pages_fetched = models.PositiveIntegerField(default=0)
+    items_fetched = models.PositiveIntegerField(default=0)
+    questions_created = models.PositiveIntegerField(default=0)
+    logs_created = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="importjob_user_idx"),
+            models.Index(fields=["status", "created_at"], name="importjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.platform}:{self.username} ({self.status})"
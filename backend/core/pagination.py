@@ -0,0 +1,186 @@
+"""
+Keyset (cursor) pagination for the core list endpoints.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+last row served, so fetching page N is a single indexed range scan no matter
+how deep N is. The ordering follows the queryset's explicit ``order_by`` or
+the model's ``Meta.ordering``, with ``id`` appended as a unique tie-breaker.
+NULLs sort as the largest value: last in ascending order, first in
+descending order.
+
+Pagination is opt-in: requests without ``cursor`` or ``page_size`` keep the
+historical bare-list response so existing clients are unaffected.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Opaque-cursor keyset pagination with an optional total count."""
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    page_size = 50
+    max_page_size = 500
+    tie_breaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.count = None
+        if params.get(self.count_query_param, "").lower() in ("1", "true"):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self._order_expressions(queryset))
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(self._after_filter(queryset, cursor))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset: QuerySet) -> List[str]:
+        """Return the ordering fields, always ending with the tie-breaker."""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        names = {field.lstrip("-") for field in ordering}
+        if self.tie_breaker not in names:
+            ordering.append(self.tie_breaker)
+        return ordering
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [self._value(last, name) for name, _ in self._fields()]
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(values)
+        )
+
+    def encode_cursor(self, values: List[Any]) -> str:
+        payload = json.dumps({"o": self.ordering, "v": values}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request) -> Optional[List[Any]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(payload, dict)
+            or payload.get("o") != self.ordering
+            or len(payload.get("v") or []) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return payload["v"]
+
+    def _fields(self) -> List[Tuple[str, bool]]:
+        """(name, descending) pairs for the current ordering."""
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.ordering]
+
+    def _is_nullable(self, queryset: QuerySet, name: str) -> bool:
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            # Annotations can't be introspected, so assume they may be NULL
+            return True
+
+    def _order_expressions(self, queryset: QuerySet):
+        """
+        Order NULLs as the largest value (PostgreSQL's native behaviour) on
+        every backend, so plain btree indexes serve both directions. NULLs
+        therefore come last ascending but first descending.
+        """
+        expressions = []
+        for name, descending in self._fields():
+            if not self._is_nullable(queryset, name):
+                expressions.append(f"-{name}" if descending else name)
+            elif descending:
+                expressions.append(F(name).desc(nulls_first=True))
+            else:
+                expressions.append(F(name).asc(nulls_last=True))
+        return expressions
+
+    def _after_filter(self, queryset: QuerySet, values: List[Any]) -> Q:
+        """
+        Build ``(a, b, c) > (x, y, z)`` for mixed directions as a disjunction
+        of prefix-equal terms, e.g. ``a > x OR (a = x AND b > y) OR ...``,
+        with NULL above every value as in ``_order_expressions``.
+        """
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (name, descending), value in zip(self._fields(), values):
+            nullable = self._is_nullable(queryset, name)
+            if value is None:
+                # NULLs come first descending and last ascending
+                if descending:
+                    condition |= prefix & Q(**{f"{name}__isnull": False})
+                prefix &= Q(**{f"{name}__isnull": True})
+                continue
+            lookup = "lt" if descending else "gt"
+            after = Q(**{f"{name}__{lookup}": value})
+            if nullable and not descending:
+                after |= Q(**{f"{name}__isnull": True})
+            condition |= prefix & after
+            prefix &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _value(obj, name: str) -> Any:
+        value = getattr(obj, name)
+        return value.isoformat() if hasattr(value, "isoformat") else value
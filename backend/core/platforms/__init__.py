@@ -0,0 +1,23 @@
+"""
+Coding platforms a user's history can be imported from.
+
+A platform turns a username into pages of ``Completion`` items, the problems
+the user solved there; ``backend.core.import_jobs`` stores them as questions
+and logs. Platforms are looked up by name in ``PLATFORMS``, which is also the
+list of names ``/api/import/<platform>/`` accepts.
+"""
+
+from typing import Dict, Optional, Type
+
+from .base import Completion, Page, Platform  # noqa: F401
+from .codewars import CodewarsPlatform
+from .errors import PlatformError, ProfileNotFound  # noqa: F401
+
+PLATFORMS: Dict[str, Type[Platform]] = {
+    CodewarsPlatform.name: CodewarsPlatform,
+}
+
+
+def get_platform(name: str) -> Optional[Platform]:
+    platform_class = PLATFORMS.get(name)
+    return platform_class() if platform_class else None
@@ -0,0 +1,68 @@
+"""Types shared by the platform adapters."""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from .http import PlatformClient, rate_limit
+
+
+@dataclass(frozen=True)
+class Completion:
+    """A problem solved on a platform."""
+
+    title: str
+    url: str
+    completed_at: Optional[datetime] = None
+    languages: Tuple[str, ...] = ()
+
+
+@dataclass
+class Page:
+    completions: List[Completion] = field(default_factory=list)
+    # Across all pages, when the platform reports it
+    total_items: Optional[int] = None
+
+
+class Platform(ABC):
+    """Base class of the platform adapters; they implement ``fetch``."""
+
+    name = ""
+    # For messages
+    label = ""
+    # The platform's rate limit, shared by all the jobs of a process
+    requests_per_second = 2.0
+    burst = 4
+
+    def __init__(
+        self, client: Optional[PlatformClient] = None, workers: Optional[int] = None
+    ):
+        self.client = client
+        self.fetch_workers = workers or settings.IMPORT_FETCH_WORKERS
+
+    @contextmanager
+    def connect(self) -> Iterator[PlatformClient]:
+        """The client given to the platform, or a new one for one import."""
+        if self.client is not None:
+            yield self.client
+            return
+        client = PlatformClient(
+            self.label or self.name,
+            rate_limit(self.name, self.requests_per_second, self.burst),
+            pool_size=self.fetch_workers,
+            cache_dir=settings.IMPORT_HTTP_CACHE_DIR or None,
+            cache_max_age=settings.IMPORT_HTTP_CACHE_MAX_AGE,
+            cache_max_bytes=settings.IMPORT_HTTP_CACHE_MAX_BYTES,
+        )
+        try:
+            yield client
+        finally:
+            client.close()
+
+    @abstractmethod
+    def fetch(self, username: str) -> Iterator[Page]:
+        """The user's completions, a page at a time."""
@@ -0,0 +1,86 @@
+"""
+Codewars: the completed katas of a user, from the public API.
+
+https://dev.codewars.com/#get-user-completed-challenges
+
+The first page gives the number of pages; the others are then fetched
+concurrently (see ``http.fetch_ordered``).
+"""
+
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import quote
+
+from .base import Completion, Page, Platform
+from .errors import PlatformError, ProfileNotFound
+from .http import PlatformClient, fetch_ordered
+
+API_URL = "https://www.codewars.com/api/v1"
+KATA_URL = "https://www.codewars.com/kata/{id}"
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class CodewarsPlatform(Platform):
+    name = "codewars"
+    label = "Codewars"
+    # Codewars doesn't publish a limit; this stays well clear of throttling
+    requests_per_second = 4.0
+    burst = 8
+
+    def __init__(
+        self,
+        api_url: str = API_URL,
+        client: Optional[PlatformClient] = None,
+        workers: Optional[int] = None,
+    ):
+        super().__init__(client=client, workers=workers)
+        self.api_url = api_url
+
+    def _get_page(
+        self, client: PlatformClient, username: str, number: int
+    ) -> Dict[str, Any]:
+        response = client.get(
+            f"{self.api_url}/users/{quote(username, safe='')}"
+            f"/code-challenges/completed?page={number}"
+        )
+        if response.status_code == 404:
+            raise ProfileNotFound(f"Codewars user {username!r} was not found.")
+        if response.status_code != 200:
+            raise PlatformError(f"Codewars responded with {response.status_code}.")
+        return response.json()
+
+    def _page(self, body: Dict[str, Any]) -> Page:
+        return Page(
+            completions=[
+                Completion(
+                    title=item.get("name") or item.get("slug") or item["id"],
+                    url=KATA_URL.format(id=item["id"]),
+                    completed_at=_parse_time(item.get("completedAt")),
+                    languages=tuple(item.get("completedLanguages") or ()),
+                )
+                for item in body.get("data") or ()
+                if item.get("id")
+            ],
+            total_items=body.get("totalItems"),
+        )
+
+    def fetch(self, username: str) -> Iterator[Page]:
+        with self.connect() as client:
+            first = self._get_page(client, username, 0)
+            yield self._page(first)
+            rest = fetch_ordered(
+                partial(self._get_page, client, username),
+                range(1, first.get("totalPages") or 0),
+                self.fetch_workers,
+            )
+            for body in rest:
+                yield self._page(body)
@@ -0,0 +1,6 @@
+class PlatformError(Exception):
+    """An upstream failure; the message is shown to the user on the job."""
+
+
+class ProfileNotFound(PlatformError):
+    pass
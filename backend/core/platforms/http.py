@@ -0,0 +1,304 @@
+"""
+HTTP for the platform adapters: pooled keep-alive connections, a rate limit
+per platform, retries with backoff and an on-disk cache of responses.
+
+- One ``requests.Session`` per client, with a connection pool as large as the
+  number of fetch threads, so pages reuse connections instead of opening one
+  (and a TLS handshake) each.
+- A ``TokenBucket`` per platform name, shared by every client in the process,
+  keeps concurrent jobs under the platform's rate limit together.
+- Connection errors, 429 and 5xx responses are retried with exponential
+  backoff and jitter; a ``Retry-After`` header sets the wait instead.
+- 200 responses that carry an ``ETag`` or ``Last-Modified`` are stored in
+  ``IMPORT_HTTP_CACHE_DIR``. The next request for the URL is conditional, and
+  a ``304 Not Modified`` is answered from the cache, so a re-import only
+  transfers the pages that changed. When a client closes, entries unused for
+  ``cache_max_age`` seconds are deleted, then the least recently used ones
+  until the cache fits in ``cache_max_bytes``.
+
+``fetch_ordered`` runs a page fetcher on a thread pool and yields the results
+in order, a bounded number of pages ahead of the consumer.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .errors import PlatformError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Seconds to connect and between bytes
+TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF = 0.5
+# Longest Retry-After honoured; a platform asking for more is failed instead
+MAX_RETRY_AFTER = 60
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Seconds an unused cache entry is kept, and the cache's size limit
+CACHE_MAX_AGE = 30 * 24 * 3600
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` acquisitions per second on average, in bursts of up to
+    ``capacity``. ``acquire`` blocks until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Taken now, possibly into debt; the debt is the wait
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            self.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def rate_limit(name: str, rate: float, capacity: float) -> TokenBucket:
+    """The process-wide bucket of platform ``name``."""
+    with _buckets_lock:
+        if name not in _buckets:
+            _buckets[name] = TokenBucket(rate, capacity)
+        return _buckets[name]
+
+
+class ResponseCache:
+    """
+    Response bodies and their validators, a JSON file per URL. A file's
+    modification time is its last use.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_age: float = CACHE_MAX_AGE,
+        max_bytes: int = CACHE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with open(path) as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def set(self, url: str, entry: Dict[str, Any]) -> None:
+        path = self._path(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Written aside and renamed, so readers never see half an entry
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not cache %s: %s", url, exc)
+
+    def prune(self) -> int:
+        """
+        Delete the entries unused for ``max_age`` seconds, then the least
+        recently used until the rest fit in ``max_bytes``; the number deleted.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        expired = time.time() - self.max_age
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for mtime, size, path in entries:
+            # Entries being written are only ever removed once expired
+            if mtime >= expired and (
+                total <= self.max_bytes or not path.endswith(".json")
+            ):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        return deleted
+
+
+@dataclass
+class Response:
+    status_code: int
+    text: str
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        try:
+            return json.loads(self.text)
+        except ValueError as exc:
+            raise PlatformError("The platform sent an invalid response.") from exc
+
+
+class PlatformClient:
+    """GET requests to one platform, rate limited, retried and cached."""
+
+    def __init__(
+        self,
+        name: str,
+        bucket: TokenBucket,
+        pool_size: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_max_age: float = CACHE_MAX_AGE,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF,
+    ):
+        self.name = name
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = (
+            ResponseCache(cache_dir, cache_max_age, cache_max_bytes)
+            if cache_dir
+            else None
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "interview-q-import"
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache:
+            self.cache.prune()
+
+    def get(self, url: str) -> Response:
+        """
+        GET ``url`` (with its query string); a 304 is answered from the
+        cache. Other responses are returned whatever their status.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = self._send(url, headers)
+        if response.status_code == 304 and cached:
+            return Response(200, cached["body"], from_cache=True)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.cache and response.status_code == 200 and (etag or last_modified):
+            self.cache.set(
+                url,
+                {"etag": etag, "last_modified": last_modified, "body": response.text},
+            )
+        return Response(response.status_code, response.text)
+
+    def _send(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=TIMEOUT)
+            except requests.RequestException as exc:
+                logger.warning("%s request failed: %s", self.name, exc)
+                if attempt == self.max_retries:
+                    raise PlatformError(f"{self.name} could not be reached.") from exc
+                retry_after = None
+            else:
+                status = response.status_code
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                logger.info("%s responded %s, retrying", self.name, status)
+                retry_after = response.headers.get("Retry-After")
+            self._wait(attempt, retry_after)
+            attempt += 1
+
+    def _wait(self, attempt: int, retry_after: Optional[str] = None) -> None:
+        if retry_after is not None and retry_after.isdigit():
+            delay = float(retry_after)
+            if delay > MAX_RETRY_AFTER:
+                raise PlatformError(f"{self.name} is rate limiting requests.")
+        else:
+            # Full jitter keeps concurrent retries from arriving together
+            delay = random.uniform(0, self.backoff * 2**attempt)
+        time.sleep(delay)
+
+
+def fetch_ordered(
+    fetch: Callable[[T], R], items: Iterable[T], workers: int
+) -> Iterator[R]:
+    """
+    ``fetch`` of each item, run on ``workers`` threads, yielded in the order
+    of ``items``. At most twice ``workers`` results are fetched ahead of the
+    consumer; the rest are cancelled if it stops early.
+    """
+    items = iter(items)
+    pending = []
+    with ThreadPoolExecutor(workers, thread_name_prefix="fetch") as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(fetch, item))
+                if len(pending) >= workers * 2:
+                    yield pending.pop(0).result()
+            while pending:
+                yield pending.pop(0).result()
+        finally:
+            for future in pending:
+                future.cancel()
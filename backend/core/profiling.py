@@ -0,0 +1,170 @@
+"""
+On-demand request profiling.
+
+With ``PROFILING_ENABLED`` on, ``ProfilingMiddleware`` profiles a request
+when it carries a valid ``X-Profile`` token (see ``make_profile_token``) or
+when a staff user adds ``?profile=1``. The request runs under ``cProfile``
+and every query is captured with its duration. The stats and queries are
+written to ``PROFILE_DIR``, a ``RequestProfile`` row records the request, and
+the response gets an ``X-Profile-Id`` header. Only the newest
+``PROFILE_MAX_COUNT`` profiles are kept. Staff browse and download them in
+the admin.
+
+With ``PROFILING_ENABLED`` off the middleware removes itself at startup, so
+it costs nothing.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import uuid
+from contextlib import ExitStack
+from typing import List, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .models import RequestProfile
+
+HEADER = "X-Profile"
+TOKEN_SALT = "backend.core.profiling"
+# Queries beyond this are counted but not kept
+MAX_CAPTURED_QUERIES = 1000
+TOP_FUNCTIONS = 40
+
+
+def make_profile_token(max_age: int = 60 * 60) -> str:
+    """A value for the ``X-Profile`` header, valid for ``max_age`` seconds."""
+    return signing.dumps({"until": time.time() + max_age}, salt=TOKEN_SALT)
+
+
+def _valid_token(token: str) -> bool:
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        return False
+    return payload.get("until", 0) > time.time()
+
+
+def profile_dir() -> str:
+    return settings.PROFILE_DIR
+
+
+def profile_path(name: str, suffix: str) -> str:
+    """``suffix`` is ``.prof`` (cProfile stats) or ``.json`` (summary)."""
+    return os.path.join(profile_dir(), f"{name}{suffix}")
+
+
+class QueryCapture:
+    def __init__(self):
+        self.queries: List[dict] = []
+        self.count = 0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.total_ms += duration_ms
+            if len(self.queries) < MAX_CAPTURED_QUERIES:
+                self.queries.append({"sql": sql, "ms": round(duration_ms, 3)})
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.wants_profile(request):
+            return self.get_response(request)
+
+        capture = QueryCapture()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(capture))
+            response = profiler.runcall(self.get_response, request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        saved = save_profile(request, response, profiler, capture, duration_ms)
+        response["X-Profile-Id"] = str(saved.pk)
+        return response
+
+    def wants_profile(self, request) -> bool:
+        token = request.headers.get(HEADER)
+        if token is not None:
+            return _valid_token(token)
+        if request.GET.get("profile") == "1":
+            user = getattr(request, "user", None)
+            return bool(user is not None and user.is_staff)
+        return False
+
+
+def _top_functions(profiler) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+def save_profile(
+    request, response, profiler, capture: QueryCapture, duration_ms: float
+) -> RequestProfile:
+    name = uuid.uuid4().hex
+    os.makedirs(profile_dir(), exist_ok=True)
+    profiler.dump_stats(profile_path(name, ".prof"))
+    with open(profile_path(name, ".json"), "w") as f:
+        json.dump(
+            {"top_functions": _top_functions(profiler), "queries": capture.queries},
+            f,
+        )
+
+    user = getattr(request, "user", None)
+    profile = RequestProfile.objects.create(
+        name=name,
+        user=user if user is not None and user.is_authenticated else None,
+        method=request.method,
+        path=request.get_full_path()[:2000],
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        query_count=capture.count,
+        query_ms=capture.total_ms,
+    )
+    prune_profiles()
+    return profile
+
+
+def prune_profiles(keep: Optional[int] = None) -> None:
+    """Delete all but the newest ``keep`` (``PROFILE_MAX_COUNT``) profiles."""
+    keep = settings.PROFILE_MAX_COUNT if keep is None else keep
+    stale = RequestProfile.objects.values_list("pk", flat=True)[keep:]
+    # delete() fires post_delete, which removes the files
+    for profile in RequestProfile.objects.filter(pk__in=list(stale)):
+        profile.delete()
+
+
+def delete_profile_files(name: str) -> None:
+    for suffix in (".prof", ".json"):
+        try:
+            os.remove(profile_path(name, suffix))
+        except FileNotFoundError:
+            pass
+
+
+def load_summary(name: str) -> dict:
+    try:
+        with open(profile_path(name, ".json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"top_functions": "", "queries": []}
@@ -0,0 +1,128 @@
+"""
+Full-text search over question title, source and content.
+
+Two backends share one interface:
+
+- PostgreSQL: a weighted ``tsvector`` stored in ``Question.search_vector``
+  (GIN-indexed, refreshed on ``Question.save``), queried with
+  ``websearch_to_tsquery`` and ranked with ``ts_rank``.
+- SQLite (DEBUG): an external-content FTS5 table, ``core_question_fts``, kept
+  in sync by triggers and ranked with ``bm25``.
+
+Both annotate ``search_rank`` (higher is better) and ``search_snippet``
+(content with matches wrapped in ``<mark>``) so callers can sort and paginate
+identically on either database. The schema lives in migration 0003.
+"""
+
+import re
+from typing import Optional
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections
+from django.db.models import F, FloatField, QuerySet, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "core_question_fts"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# (column, tsvector weight, bm25 weight); title matches matter most
+SEARCH_COLUMNS = (
+    ("title", "A", 10.0),
+    ("source", "B", 5.0),
+    ("content", "C", 1.0),
+)
+
+
+def search_vector_from_values(**values: Optional[str]) -> SearchVector:
+    """
+    Build the weighted tsvector from literal column values, so it can be
+    written in the same INSERT/UPDATE as the row itself.
+    """
+    return _weighted_vector(
+        lambda column: Value(values.get(column) or "", output_field=TextField())
+    )
+
+
+def refresh_search_vectors(queryset: QuerySet) -> int:
+    """
+    Recompute stored search vectors from the row's own columns in one UPDATE.
+    Used by bulk writes, which bypass ``Question.save``. No-op on SQLite,
+    where triggers maintain the FTS5 index.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return 0
+    return queryset.update(search_vector=_weighted_vector(lambda column: column))
+
+
+def _weighted_vector(source) -> SearchVector:
+    """Concatenate one weighted vector per search column."""
+    combined = None
+    for column, weight, _ in SEARCH_COLUMNS:
+        vector = SearchVector(source(column), weight=weight, config=SEARCH_CONFIG)
+        combined = vector if combined is None else combined + vector
+    return combined
+
+
+def fts5_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so FTS5
+    operators in user input are inert) and all words must match.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join('"{}"'.format(word) for word in words)
+
+
+def search_questions(queryset: QuerySet, text: str) -> QuerySet:
+    """Filter ``queryset`` to questions matching ``text``, annotating rank."""
+    if connections[queryset.db].vendor == "postgresql":
+        return _search_postgres(queryset, text)
+    return _search_sqlite(queryset, text)
+
+
+def _search_postgres(queryset: QuerySet, text: str) -> QuerySet:
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=query).annotate(
+        # ts_rank() is float4; widen it so cursor values round-trip exactly
+        search_rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+        search_snippet=SearchHeadline(
+            "content",
+            query,
+            config=SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START,
+            stop_sel=HIGHLIGHT_STOP,
+            max_fragments=2,
+        ),
+    )
+
+
+def _search_sqlite(queryset: QuerySet, text: str) -> QuerySet:
+    match = fts5_query(text)
+    if not match:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    weights = ", ".join(str(bm25) for _, _, bm25 in SEARCH_COLUMNS)
+    content_column = [column for column, _, _ in SEARCH_COLUMNS].index("content")
+    matches = f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    correlated = f"{matches} AND rowid = {table}.id"
+    return queryset.filter(pk__in=RawSQL(f"SELECT rowid {matches}", [match])).annotate(
+        # bm25() is lower-is-better; negate it to match ts_rank's direction
+        search_rank=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) {correlated}",
+            [match],
+            output_field=FloatField(),
+        ),
+        search_snippet=RawSQL(
+            f"SELECT snippet({FTS_TABLE}, {content_column}, %s, %s, '…', 24) "
+            f"{correlated}",
+            [HIGHLIGHT_START, HIGHLIGHT_STOP, match],
+            output_field=TextField(),
+        ),
+    )
@@ -4,7 +4,8 @@ from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from .models import Question, QuestionLog, Tag
+from .models import ImportJob, Question, QuestionLog, Tag
+from .tag_catalog import get_tag_catalog
 from .utils import sanitize_html
 
 
@@ -26,6 +27,9 @@ class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "name"]
+        # Names are checked against the tag catalog in the views, with the
+        # unique index as the backstop, instead of a query per validation
+        extra_kwargs = {"name": {"validators": []}}
 
 
 class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
@@ -41,6 +45,9 @@ class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     last_attempted_at = serializers.DateTimeField(read_only=True)
     attempts_count = serializers.IntegerField(read_only=True)
+    # Only present on search results (?q=); skipped when not annotated
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.CharField(read_only=True)
 
     class Meta:
         model = Question
@@ -58,6 +65,8 @@ class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
             "updated_at",
             "last_attempted_at",
             "attempts_count",
+            "search_rank",
+            "search_snippet",
         ]
         read_only_fields = [
             "id",
@@ -78,8 +87,10 @@ class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
         if not user:
             raise serializers.ValidationError("Authentication required")
 
-        # Get valid tag IDs for this user
-        valid_tag_ids = set(Tag.objects.filter(user=user).values_list("id", flat=True))
+        # Get valid tag IDs for this user; bulk callers preload them once
+        valid_tag_ids = self.context.get("user_tag_ids")
+        if valid_tag_ids is None:
+            valid_tag_ids = get_tag_catalog(user).ids
         provided_tag_ids = set(value)
 
         # Check for invalid tag IDs
@@ -129,8 +140,8 @@ class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
     def _update_tags(self, instance: Question, tag_ids: Optional[List[int]]) -> None:
         """Update tags for a question instance"""
         if tag_ids is not None:
-            tags = Tag.objects.filter(id__in=tag_ids, user=instance.user)
-            instance.tags.set(tags)
+            # validate_tag_ids has checked ownership against the tag catalog
+            instance.tags.set(tag_ids)
 
     def update(self, instance: Question, validated_data: Dict[str, Any]) -> Question:
         """Update a question instance"""
@@ -157,6 +168,45 @@ class QuestionSerializer(BaseValidationMixin, serializers.ModelSerializer):
         return instance
 
 
+class QuestionBulkSerializer(serializers.Serializer):
+    """Envelope for bulk question writes; items are validated individually"""
+
+    MAX_ITEMS = 5000
+
+    create = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list
+    )
+    update = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list
+    )
+    delete = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+    def validate_update(self, value: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate that every update names a distinct question id"""
+        ids = [item.get("id") for item in value]
+        if not all(isinstance(item_id, int) for item_id in ids):
+            raise serializers.ValidationError("Every update must include an id.")
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Duplicate ids in updates.")
+        return value
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the batch size and that no question is updated and deleted"""
+        total = sum(len(attrs[op]) for op in ("create", "update", "delete"))
+        if total > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_ITEMS} items are allowed per request."
+            )
+        overlap = {item["id"] for item in attrs["update"]} & set(attrs["delete"])
+        if overlap:
+            raise serializers.ValidationError(
+                f"Questions cannot be updated and deleted together: {sorted(overlap)}"
+            )
+        return attrs
+
+
 class QuestionLogSerializer(serializers.ModelSerializer):
     """Serializer for QuestionLog model"""
 
@@ -191,6 +241,73 @@ class QuestionLogSerializer(serializers.ModelSerializer):
         return value
 
 
+class QuestionLogBulkItemSerializer(QuestionLogSerializer):
+    """
+    QuestionLog item in a bulk request. Question ownership is checked against
+    the IDs preloaded into ``context["user_question_ids"]`` instead of one
+    query per item.
+    """
+
+    question = serializers.IntegerField()
+
+    class Meta(QuestionLogSerializer.Meta):
+        fields = [
+            "question",
+            "date_attempted",
+            "time_spent_min",
+            "outcome",
+            "solution_approach",
+            "self_notes",
+        ]
+
+    def validate_question(self, value: int) -> int:
+        """Validate that the question belongs to the current user"""
+        if value not in self.context.get("user_question_ids", ()):
+            raise serializers.ValidationError(f"Invalid question ID: {value}")
+        return value
+
+
+class QuestionLogBulkSerializer(serializers.Serializer):
+    """Envelope for bulk log ingestion; items are validated individually"""
+
+    MAX_ITEMS = 10000
+
+    logs = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_ITEMS
+    )
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """An import job and its progress; all read-only"""
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "platform",
+            "username",
+            "status",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "total_items",
+            "pages_fetched",
+            "items_fetched",
+            "questions_created",
+            "logs_created",
+            "error",
+        ]
+        read_only_fields = fields
+
+
+class ImportRequestSerializer(serializers.Serializer):
+    """Body of a platform import request"""
+
+    username = serializers.CharField(
+        max_length=ImportJob._meta.get_field("username").max_length
+    )
+
+
 class AuthSerializerMixin:
     """Mixin for authentication-related serializers"""
 
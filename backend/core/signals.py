@@ -3,13 +3,124 @@ Signal handlers for the core app.
 
 This module contains Django signal handlers that automatically update
 Question aggregation fields when QuestionLog instances are created,
-updated, or deleted.
+updated, or deleted. They also invalidate the per-user tag catalog when Tags
+change, and bump the per-user data version (see ``versioning``) on any
+change to a user's questions, logs or tags.
+
+Aggregates are maintained incrementally: each log write applies a single
+``UPDATE`` with ``F()`` deltas, so its cost does not grow with the number of
+logs and concurrent writers cannot overwrite each other's counts. The logs
+are only rescanned when a delta can't be determined, e.g. when the latest
+attempt is deleted or moved earlier.
+
+Inside a transaction the deltas are not written straight away: they are
+merged per question and applied once, after commit, by a single
+``on_commit`` callback per connection, so N log writes to one question cost
+one aggregate update and no Question row locks are held while the
+transaction runs. Deltas written in a savepoint that rolls back are dropped
+with it. ``aggregate_stats`` counts how many were coalesced.
 """
 
-from django.db.models.signals import post_delete, post_save
+import threading
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import QuestionLog
+from .models import Question, QuestionLog, RequestProfile, Tag
+from .profiling import delete_profile_files
+from .tag_catalog import invalidate_tag_catalog
+from .versioning import bump_user_data_version
+
+SOLVED = "Solved"
+
+# Fields whose values feed the Question aggregates
+AGGREGATE_SOURCE_FIELDS = {"question", "question_id", "outcome", "date_attempted"}
+
+_aggregates_suppressed: ContextVar[bool] = ContextVar(
+    "aggregates_suppressed", default=False
+)
+
+
+@contextmanager
+def suppress_aggregate_updates():
+    """
+    Skip the per-log aggregate signal handlers inside this block.
+
+    Callers that write many logs at once are then responsible for calling
+    ``recompute_question_aggregates`` for the questions they touched.
+    """
+    token = _aggregates_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _aggregates_suppressed.reset(token)
+
+
+def _per_question(**aggregate):
+    """Correlated subquery computing one aggregate over a question's logs."""
+    (name,) = aggregate
+    return Subquery(
+        QuestionLog.objects.filter(question=OuterRef("pk"))
+        .order_by()
+        .values("question")
+        .annotate(**aggregate)
+        .values(name)
+    )
+
+
+def recompute_question_aggregates(
+    question_ids: Iterable[int], chunk_size: int = 500
+) -> int:
+    """
+    Recompute aggregation fields for many questions with one UPDATE per chunk.
+
+    Args:
+        question_ids: IDs of the questions to update
+        chunk_size: Maximum number of questions per UPDATE statement
+
+    Returns:
+        The number of questions updated
+    """
+    question_ids = sorted(set(question_ids))
+    aggregates = {
+        "attempts_count": Coalesce(
+            _per_question(n=Count("id")), Value(0), output_field=IntegerField()
+        ),
+        "solved_count": Coalesce(
+            _per_question(n=Count("id", filter=Q(outcome=SOLVED))),
+            Value(0),
+            output_field=IntegerField(),
+        ),
+        # Max() ignores NULL dates on every backend
+        "last_attempted_at": _per_question(latest=Max("date_attempted")),
+    }
+    updated = 0
+    for start in range(0, len(question_ids), chunk_size):
+        end = start + chunk_size
+        chunk = question_ids[start:end]
+        updated += Question.objects.filter(pk__in=chunk).update(**aggregates)
+    return updated
 
 
 def update_question_aggregates(question):
@@ -19,25 +130,254 @@ def update_question_aggregates(question):
     Args:
         question: The Question instance to update
     """
-    from .models import Question
+    recompute_question_aggregates([question.pk])
 
-    logs = question.logs.all()
 
-    # Calculate aggregates
-    attempts_count = logs.count()
-    solved_count = logs.filter(outcome="Solved").count()
+def apply_aggregate_delta(
+    question_id: int,
+    attempts: int = 0,
+    solved: int = 0,
+    added_date: Optional[datetime] = None,
+    removed_dates: Iterable[datetime] = (),
+) -> None:
+    """
+    Apply a change in a question's logs to its aggregates with one UPDATE.
 
-    # Get the most recent attempt date
-    latest_log = logs.order_by("-date_attempted").first()
-    last_attempted_at = (
-        latest_log.date_attempted if latest_log and latest_log.date_attempted else None
-    )
+    Args:
+        question_id: ID of the question whose logs changed
+        attempts: Change in the number of logs
+        solved: Change in the number of solved logs
+        added_date: Latest ``date_attempted`` among logs that were added
+        removed_dates: ``date_attempted`` values of logs that were removed
+
+    The question's logs are only rescanned when its current
+    ``last_attempted_at`` may have been one of the removed dates.
+    """
+    removed_dates = sorted(set(removed_dates))
+    updates = {}
+    if attempts:
+        updates["attempts_count"] = _add_count("attempts_count", attempts)
+    if solved:
+        updates["solved_count"] = _add_count("solved_count", solved)
+    superseded = Q(last_attempted_at__isnull=True)
+    if added_date is not None:
+        superseded |= Q(last_attempted_at__lt=added_date)
+    if removed_dates:
+        # An added date may itself have been removed again, so anything but
+        # an untouched maximum is rescanned.
+        when = When(
+            superseded | Q(last_attempted_at__in=removed_dates),
+            then=_per_question(latest=Max("date_attempted")),
+        )
+    elif added_date is not None:
+        when = When(superseded, then=Value(added_date))
+    else:
+        when = None
+    if when is not None:
+        updates["last_attempted_at"] = Case(
+            when, default=F("last_attempted_at"), output_field=DateTimeField()
+        )
+    if not updates:
+        return
+
+    aggregate_stats.incr("updates")
+    questions = Question.objects.filter(pk=question_id)
+    if not removed_dates:
+        questions.update(**updates)
+        return
+    # Lock the row before the rescan so the subquery's snapshot includes every
+    # log whose writer has already updated this question.
+    with transaction.atomic():
+        list(questions.select_for_update().values_list("pk", flat=True))
+        questions.update(**updates)
+
+
+def _add_count(field: str, delta: int):
+    # Drifted counts must not go negative; rebuild_question_aggregates fixes them
+    if delta > 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, Value(0))
+
+
+class AggregateStats:
+    """
+    Process-wide counters for aggregate maintenance.
+
+    - ``updates``: aggregate UPDATEs issued for log writes
+    - ``deferred``: log writes queued until their transaction commits
+    - ``coalesced``: deferred writes merged into an update already queued
+      for the same question
+    """
+
+    FIELDS = ("updates", "deferred", "coalesced")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: self._counts[name] for name in self.FIELDS}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+aggregate_stats = AggregateStats()
+
+
+class _QueuedDelta:
+    """
+    One log write's delta. It is registered as an ``on_commit`` callback only
+    to share its savepoint's fate: when the savepoint rolls back, Django drops
+    the callback, which was the only strong reference to the delta, so it
+    leaves the pending set with it.
+    """
+
+    __slots__ = ("question_id", "owner_id", "delta", "__weakref__")
+
+    def __init__(
+        self, question_id: int, owner_id: Optional[int], delta: Dict[str, Any]
+    ):
+        self.question_id = question_id
+        self.owner_id = owner_id
+        self.delta = delta
+
+    def __call__(self) -> None:
+        pass
+
+
+class PendingAggregateDeltas:
+    """
+    ``on_commit`` callback applying the deltas queued on one connection in
+    its transaction: they are merged per question and written with one
+    ``apply_aggregate_delta`` per dirty question. The owners' data versions
+    are bumped again afterwards, since the transaction's own bumps ran
+    first if it saved a question before its first log write.
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+        self.queued: "weakref.WeakSet[_QueuedDelta]" = weakref.WeakSet()
+        self.applied = False
 
-    # Update the question with new aggregates
-    Question.objects.filter(pk=question.pk).update(
-        attempts_count=attempts_count,
-        solved_count=solved_count,
-        last_attempted_at=last_attempted_at,
+    def add(self, question_id: int, owner_id: Optional[int] = None, **delta) -> None:
+        aggregate_stats.incr("deferred")
+        queued = _QueuedDelta(question_id, owner_id, delta)
+        transaction.on_commit(queued, using=self.using)
+        self.queued.add(queued)
+
+    def _merged(self) -> Dict[int, Dict[str, Any]]:
+        deltas: Dict[int, Dict[str, Any]] = {}
+        for queued in list(self.queued):
+            if queued.question_id in deltas:
+                aggregate_stats.incr("coalesced")
+            merged = deltas.setdefault(
+                queued.question_id,
+                {
+                    "attempts": 0,
+                    "solved": 0,
+                    "added_date": None,
+                    "removed_dates": set(),
+                },
+            )
+            delta = queued.delta
+            merged["attempts"] += delta.get("attempts", 0)
+            merged["solved"] += delta.get("solved", 0)
+            added_date = delta.get("added_date")
+            if added_date is not None and (
+                merged["added_date"] is None or added_date > merged["added_date"]
+            ):
+                merged["added_date"] = added_date
+            merged["removed_dates"].update(delta.get("removed_dates", ()))
+        return deltas
+
+    def __call__(self) -> None:
+        self.applied = True
+        deltas = self._merged()
+        owners = {queued.owner_id for queued in self.queued} - {None}
+        self.queued = weakref.WeakSet()
+        for question_id, delta in sorted(deltas.items()):
+            apply_aggregate_delta(question_id, **delta)
+        for user_id in sorted(owners):
+            bump_user_data_version(user_id)
+
+
+# The pending deltas of each connection (connections are per thread). Only
+# the registered on_commit callback holds them strongly, so once it was
+# discarded with a rollback, or has run, the next write starts a new one.
+_pending = threading.local()
+
+
+def _pending_deltas(alias: str) -> PendingAggregateDeltas:
+    refs = _pending.__dict__.setdefault("refs", {})
+    pending = refs[alias]() if alias in refs else None
+    if pending is None or pending.applied:
+        pending = PendingAggregateDeltas(alias)
+        transaction.on_commit(pending, using=alias)
+        refs[alias] = weakref.ref(pending)
+    return pending
+
+
+def queue_aggregate_delta(
+    question_id: int, owner_id: Optional[int] = None, **delta
+) -> None:
+    """
+    Apply a delta now in autocommit mode, or add it to the transaction's
+    pending deltas so it is written once per question, after commit, with
+    ``owner_id``'s data version bumped after it.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        apply_aggregate_delta(question_id, **delta)
+        return
+    _pending_deltas(connection.alias).add(question_id, owner_id, **delta)
+
+
+def _log_owner_id(log) -> Optional[int]:
+    if log.user_id is not None:
+        return log.user_id
+    return log.question.user_id
+
+
+def _aggregate_state(log):
+    """The parts of a log that feed its question's aggregates."""
+    return log.question_id, log.outcome == SOLVED, log.date_attempted
+
+
+def _dates(date: Optional[datetime]) -> Tuple[datetime, ...]:
+    return () if date is None else (date,)
+
+
+def _touches_aggregates(update_fields) -> bool:
+    return update_fields is None or bool(AGGREGATE_SOURCE_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=QuestionLog)
+def capture_log_state_before_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Remember a log's stored aggregate inputs so the post-save handler can
+    apply the difference.
+
+    Args:
+        sender: The model class (QuestionLog)
+        instance: The QuestionLog instance about to be saved
+        update_fields: Fields being saved, or None for all fields
+        **kwargs: Additional keyword arguments
+    """
+    if _aggregates_suppressed.get() or instance._state.adding:
+        return
+    if not _touches_aggregates(update_fields):
+        return
+    instance._stored_aggregate_state = (
+        QuestionLog.objects.filter(pk=instance.pk)
+        .values_list("question_id", "outcome", "date_attempted")
+        .first()
     )
 
 
@@ -52,8 +392,49 @@ def update_question_on_log_save(sender, instance, created, **kwargs):
         created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if instance.question:
-        update_question_aggregates(instance.question)
+    if _aggregates_suppressed.get():
+        return
+    question_id, solved, date = _aggregate_state(instance)
+    owner_id = _log_owner_id(instance)
+    if created:
+        queue_aggregate_delta(
+            question_id, owner_id, attempts=1, solved=int(solved), added_date=date
+        )
+        return
+    if not _touches_aggregates(kwargs.get("update_fields")):
+        return
+
+    stored = instance.__dict__.pop("_stored_aggregate_state", None)
+    if stored is None:
+        # No prior state to diff against
+        if instance.question:
+            update_question_aggregates(instance.question)
+        return
+    old_question_id, old_outcome, old_date = stored
+    old_solved = old_outcome == SOLVED
+    if old_question_id != question_id:
+        queue_aggregate_delta(
+            old_question_id,
+            owner_id,
+            attempts=-1,
+            solved=-int(old_solved),
+            removed_dates=_dates(old_date),
+        )
+        queue_aggregate_delta(
+            question_id, owner_id, attempts=1, solved=int(solved), added_date=date
+        )
+    elif old_date == date:
+        queue_aggregate_delta(
+            question_id, owner_id, solved=int(solved) - int(old_solved)
+        )
+    else:
+        queue_aggregate_delta(
+            question_id,
+            owner_id,
+            solved=int(solved) - int(old_solved),
+            added_date=date,
+            removed_dates=_dates(old_date),
+        )
 
 
 @receiver(post_delete, sender=QuestionLog)
@@ -66,5 +447,69 @@ def update_question_on_log_delete(sender, instance, **kwargs):
         instance: The QuestionLog instance being deleted
         **kwargs: Additional keyword arguments
     """
-    if instance.question:
-        update_question_aggregates(instance.question)
+    if _aggregates_suppressed.get():
+        return
+    question_id, solved, date = _aggregate_state(instance)
+    queue_aggregate_delta(
+        question_id,
+        _log_owner_id(instance),
+        attempts=-1,
+        solved=-int(solved),
+        removed_dates=_dates(date),
+    )
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_catalog_on_change(sender, instance, **kwargs):
+    """
+    Drop the cached tag catalog of the tag's owner when a Tag changes.
+
+    Args:
+        sender: The model class (Tag)
+        instance: The Tag instance saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    invalidate_tag_catalog(instance.user_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+@receiver(post_save, sender=QuestionLog)
+@receiver(post_delete, sender=QuestionLog)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_user_data_version_on_change(sender, instance, **kwargs):
+    """
+    Bump the owner's data version when a question, log or tag changes.
+
+    Args:
+        sender: The model class
+        instance: The instance saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    if sender is QuestionLog:
+        bump_user_data_version(_log_owner_id(instance))
+    else:
+        bump_user_data_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def bump_user_data_version_on_retag(sender, instance, action, **kwargs):
+    """
+    Bump the owner's data version when a question's tags change.
+
+    Args:
+        sender: The question-tag through model
+        instance: The Question (or Tag, for reverse changes) being changed
+        action: The m2m_changed action
+        **kwargs: Additional keyword arguments
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_user_data_version(instance.user_id)
+
+
+@receiver(post_delete, sender=RequestProfile)
+def delete_request_profile_files(sender, instance, **kwargs):
+    """Remove a deleted profile's stats and query files."""
+    delete_profile_files(instance.name)
@@ -0,0 +1,59 @@
+"""
+Per-user tag catalog cache.
+
+Question writes validate ``tag_ids`` against the user's tags, and tag writes
+check the user's tag names for duplicates. Both read a ``TagCatalog``
+(id -> name) from the Django cache, so a warm cache answers them without any
+``Tag`` query.
+
+The catalog is stored under a per-user version (see ``versioning``). Tag
+saves and deletes bump the version, and the old catalog is left to expire.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+
+from django.core.cache import cache
+
+from .models import Tag
+from .versioning import bump_version, get_version
+
+CACHE_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class TagCatalog:
+    names: Dict[int, str]
+    ids_by_name: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "ids_by_name", {name: tag_id for tag_id, name in self.names.items()}
+        )
+
+    @property
+    def ids(self) -> FrozenSet[int]:
+        return frozenset(self.names)
+
+    def id_for(self, name: Optional[str]) -> Optional[int]:
+        return self.ids_by_name.get(name) if name is not None else None
+
+
+def _version_key(user_id: int) -> str:
+    return f"tag-catalog-version:{user_id}"
+
+
+def get_tag_catalog(user) -> TagCatalog:
+    """Return the user's tag catalog, loading it on a cache miss."""
+    key = f"tag-catalog:{user.pk}:{get_version(_version_key(user.pk))}"
+    names = cache.get(key)
+    if names is None:
+        names = dict(Tag.objects.filter(user=user).values_list("id", "name"))
+        cache.set(key, names, CACHE_TIMEOUT)
+    return TagCatalog(names)
+
+
+def invalidate_tag_catalog(user_id: Optional[int]) -> None:
+    """Make the next read reload the user's catalog."""
+    if user_id is not None:
+        bump_version(_version_key(user_id))
@@ -1,59 +1,85 @@
 import json
 import os
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from backend.core.platforms import PLATFORMS, Page, Platform, PlatformError
 
 API_URL = os.getenv("API_URL", "/api")  # Use relative path for Django test client
 
 
+class StubPlatform(Platform):
+    """Stands in for the upstream API: returns ``pages`` or raises ``error``."""
+
+    pages = []
+    error = None
+
+    def fetch(self, username):
+        if self.error:
+            raise self.error
+        for completions in self.pages:
+            yield Page(completions=completions)
+
+
+@pytest.fixture
+def codewars(monkeypatch):
+    monkeypatch.setitem(PLATFORMS, "codewars", StubPlatform)
+    monkeypatch.setattr(StubPlatform, "pages", [])
+    monkeypatch.setattr(StubPlatform, "error", None)
+    with override_settings(IMPORT_QUEUE_BACKEND="database"):
+        yield StubPlatform
+
+
+def _import(client, platform, user_profile):
+    return client.post(
+        f"{API_URL}/import/{platform}/",
+        data=json.dumps(user_profile),
+        content_type="application/json",
+    )
+
+
+def _finished_job(client, response):
+    call_command("run_import_worker", "--once", stdout=StringIO())
+    return client.get(response["Location"]).json()
+
+
 @pytest.mark.django_db
-@pytest.mark.xfail(reason="Import API is not stable or not implemented yet.")
-def test_import_questions(client, reset_database):
+def test_import_questions(reset_database, client, codewars):
     test_cases = [
-        ("codewars", {"username": "test_user"}, 200),
+        ("codewars", {"username": "test_user"}, 202),
         ("codewars", {"username": ""}, 400),
     ]
     for platform, user_profile, expected_status in test_cases:
-        data = json.dumps(user_profile) if user_profile is not None else None
-        response = client.post(
-            f"{API_URL}/import/{platform}/", data=data, content_type="application/json"
-        )
+        response = _import(client, platform, user_profile)
         assert response.status_code == expected_status
 
 
 @pytest.mark.django_db
-@pytest.mark.xfail(reason="Import API is not stable or not implemented yet.")
-def test_data_mapping(client, reset_database):
+def test_data_mapping(reset_database, client, codewars):
     test_cases = [
         ("codewars", [], 0),
     ]
     for platform, api_response, expected_question_count in test_cases:
-        mock_api_url = f"{API_URL}/mock/{platform}/"
-        client.post(
-            mock_api_url, data=json.dumps(api_response), content_type="application/json"
-        )
-        response = client.post(
-            f"{API_URL}/import/{platform}/",
-            data=json.dumps({"username": "test_user"}),
-            content_type="application/json",
-        )
-        assert response.status_code == 200
-        response = client.get(f"{API_URL}/questionlogs/")
+        codewars.pages = [api_response]
+        response = _import(client, platform, {"username": "test_user"})
+        assert response.status_code == 202
+        assert _finished_job(client, response)["status"] == "succeeded"
+        response = client.get(f"{API_URL}/questions/")
         assert len(response.json()) == expected_question_count
 
 
 @pytest.mark.django_db
-@pytest.mark.xfail(reason="Import API is not stable or not implemented yet.")
-def test_error_handling(client, reset_database):
+def test_error_handling(reset_database, client, codewars):
     test_cases = [
         ("codewars", 408),
     ]
     for platform, error_code in test_cases:
-        mock_api_url = f"{API_URL}/mock/{platform}/error/{error_code}/"
-        client.post(mock_api_url)
-        response = client.post(
-            f"{API_URL}/import/{platform}/",
-            data=json.dumps({"username": "test_user"}),
-            content_type="application/json",
-        )
-        assert response.status_code == 500
+        codewars.error = PlatformError(f"Codewars responded with {error_code}.")
+        response = _import(client, platform, {"username": "test_user"})
+        assert response.status_code == 202
+        job = _finished_job(client, response)
+        assert job["status"] == "failed"
+        assert str(error_code) in job["error"]
@@ -0,0 +1,85 @@
+"""
+Query-plan tests for the question filter indexes.
+
+These only run against PostgreSQL (DJANGO_DEBUG=False with RDS_* settings),
+where the planner output is stable enough to assert on. Sequential scans are
+disabled so the tiny test tables don't make the planner skip the indexes.
+"""
+
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from backend.core.filters import QuestionFilterBackend, QuestionOrderingFilter
+from backend.core.models import Question, Tag
+from backend.core.pagination import KeysetPagination
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "postgresql",
+        reason="Query plan assertions require PostgreSQL",
+    ),
+]
+
+
+def _plan(user, query):
+    """EXPLAIN the filtered, ordered page query the list endpoint would run."""
+    request = Request(APIRequestFactory().get(f"/api/questions/?{query}"))
+    queryset = Question.objects.filter(user=user)
+    for backend in (QuestionFilterBackend, QuestionOrderingFilter):
+        queryset = backend().filter_queryset(request, queryset, None)
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset[: KeysetPagination.page_size + 1].explain()
+
+
+@pytest.fixture()
+def questions(user):
+    """A few hundred mostly-uniform rows, with a handful matching each filter."""
+    tag = Tag.objects.create(name="plan-tag", user=user)
+    Question.objects.bulk_create(
+        Question(
+            title=f"Q{i}",
+            slug=f"q-{i}",
+            user=user,
+            difficulty="Easy" if i % 50 == 0 else "Medium",
+            source="LeetCode" if i % 50 == 0 else "Interview",
+            is_active=i % 50 != 0,
+            attempts_count=i % 50,
+            solved_count=i % 7,
+        )
+        for i in range(500)
+    )
+    tag.questions.add(*Question.objects.filter(user=user)[:5])
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE core_question")
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        ("", "question_user_created_idx"),
+        ("difficulty=Easy", "question_user_difficulty_idx"),
+        ("is_active=false", "question_user_active_idx"),
+        ("source=LeetCode&ordering=title", "question_user_source_idx"),
+        ("ordering=-last_attempted_at", "question_user_last_att_idx"),
+        ("attempts_count_min=49&ordering=attempts_count", "question_user_attempts_idx"),
+        ("solved_count_min=6&ordering=-solved_count", "question_user_solved_idx"),
+        ("ordering=-solve_ratio", "question_user_ratio_idx"),
+    ],
+    ids=[
+        "default ordering",
+        "difficulty",
+        "is_active",
+        "source",
+        "last attempted sort",
+        "attempts range",
+        "solved range",
+        "solve ratio sort",
+    ],
+)
+def test_filters_use_composite_indexes(user, questions, query, index):
+    assert index in _plan(user, query)
@@ -0,0 +1,118 @@
+"""
+Tests for ETag conditional GETs on the read endpoints.
+"""
+
+import json
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.models import Question, QuestionLog, Tag
+from backend.core.versioning import bump_user_data_version, user_data_version
+
+
+@pytest.fixture()
+def question(user):
+    return Question.objects.create(title="Cached", user=user)
+
+
+@pytest.fixture()
+def tag(user):
+    return Tag.objects.create(name="cached", user=user)
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/questions/",
+        "/api/questions/{question}/",
+        "/api/questions/{question}/logs/",
+        "/api/tags/",
+        "/api/tags/{tag}/",
+    ],
+)
+def test_matching_etag_returns_304_without_queries(client, question, tag, url):
+    url = url.format(question=question.id, tag=tag.id)
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert etag.startswith('W/"')
+    assert not response.has_header("Last-Modified")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = _revalidate(client, url, etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert not [q for q in ctx.captured_queries if '"core_' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_log_and_tag_changes_change_the_question_list_etag(
+    client, user, question, django_capture_on_commit_callbacks
+):
+    url = "/api/questions/"
+    etags = [client.get(url)["ETag"]]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        QuestionLog.objects.create(question=question, user=user, outcome="Solved")
+    response = _revalidate(client, url, etags[-1])
+    assert response.status_code == 200
+    assert response.json()[0]["attempts_count"] == 1
+    etags.append(response["ETag"])
+
+    tag = Tag.objects.create(name="fresh", user=user)
+    question.tags.add(tag)
+    response = _revalidate(client, url, etags[-1])
+    assert response.status_code == 200
+    assert [t["name"] for t in response.json()[0]["tags"]] == ["fresh"]
+    etags.append(response["ETag"])
+
+    assert len(set(etags)) == 3
+    assert _revalidate(client, url, etags[-1]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_bulk_writes_change_the_etag(client, question):
+    etag = client.get("/api/questions/")["ETag"]
+    client.post(
+        "/api/logs/bulk/",
+        data=json.dumps({"logs": [{"question": question.id}]}),
+        content_type="application/json",
+    )
+    assert _revalidate(client, "/api/questions/", etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_etags_are_per_user(client, question, django_user_model):
+    etag = client.get("/api/questions/")["ETag"]
+    django_user_model.objects.create_user(username="other", password="pw")
+    client.login(username="other", password="pw")
+    assert _revalidate(client, "/api/questions/", etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_if_modified_since_alone_is_not_a_validator(client, question):
+    url = f"/api/questions/{question.id}/"
+    client.get(url)
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_a_transaction_bumps_the_version_again_once_on_commit(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():
+            for user_id in (1, 2, 1):
+                bump_user_data_version(user_id)
+    assert len(callbacks) == 1
+    before = {user_id: user_data_version(user_id) for user_id in (1, 2)}
+    callbacks[0]()
+    assert all(user_data_version(user_id) > before[user_id] for user_id in (1, 2))
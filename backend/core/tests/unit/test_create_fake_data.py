@@ -0,0 +1,75 @@
+"""
+Tests for the create_fake_data management command.
+"""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F
+
+from backend.core.models import Question, QuestionLog, Tag
+
+
+def _create(*args):
+    out = StringIO()
+    call_command("create_fake_data", *args, stdout=out)
+    return out.getvalue()
+
+
+def _titles_by_user(seed):
+    return sorted(
+        Question.objects.filter(user__username__startswith=f"fake-{seed}-")
+        .order_by("user__username", "id")
+        .values_list("user__username", "title")
+    )
+
+
+@pytest.mark.django_db
+def test_creates_owned_data_with_aggregates():
+    # A small chunk size spreads the users over several batches and flushes
+    output = _create(
+        "--users=4",
+        "--questions-per-user=10",
+        "--logs-per-question=2",
+        "--seed=1",
+        "--chunk-size=7",
+    )
+    assert "Users are fake-1-<n>" in output
+    users = get_user_model().objects.filter(username__startswith="fake-1-")
+    assert users.count() == 4
+    assert Question.objects.exists()
+    assert QuestionLog.objects.exists()
+
+    assert not QuestionLog.objects.exclude(user=F("question__user")).exists()
+    through = Question.tags.through.objects
+    assert not through.exclude(tag__user=F("question__user")).exists()
+    assert Tag.objects.filter(user__in=users).count() == 40
+
+    out = StringIO()
+    call_command("rebuild_question_aggregates", "--dry-run", stdout=out)
+    assert "0 questions have drifted" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_chunk_size_does_not_change_the_data():
+    _create("--users=3", "--seed=2", "--chunk-size=5000")
+    expected = _titles_by_user(2)
+    get_user_model().objects.filter(username__startswith="fake-2-").delete()
+
+    _create("--users=3", "--seed=2", "--chunk-size=7")
+    assert _titles_by_user(2) == expected
+
+
+@pytest.mark.django_db
+def test_rejects_a_seed_that_was_already_used():
+    _create("--users=1", "--questions-per-user=1", "--seed=3")
+    with pytest.raises(CommandError):
+        _create("--users=1", "--seed=3")
+
+
+@pytest.mark.django_db
+def test_sqlite_writes_in_one_process():
+    output = _create("--users=1", "--questions-per-user=2", "--workers=4")
+    assert "using a single worker" in output
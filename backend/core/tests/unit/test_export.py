@@ -0,0 +1,128 @@
+"""
+Tests for the streaming exports, GET /api/export/<kind>.<csv|ndjson>.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from backend.core import export
+from backend.core.models import Question, QuestionLog, Tag
+
+
+def _get(client, path, **headers):
+    response = client.get(f"/api/export/{path}", headers=headers)
+    assert response.status_code == 200
+    body = b"".join(response.streaming_content)
+    return response, body
+
+
+@pytest.fixture()
+def data(user, django_user_model, django_capture_on_commit_callbacks):
+    graphs = Tag.objects.create(name="graphs", user=user)
+    arrays = Tag.objects.create(name="arrays", user=user)
+    questions = [
+        Question.objects.create(title=f"Export {i}", user=user, difficulty="Easy")
+        for i in range(5)
+    ]
+    questions[0].tags.set([graphs, arrays])
+    questions[1].tags.set([graphs])
+    with django_capture_on_commit_callbacks(execute=True):
+        QuestionLog.objects.create(
+            question=questions[0],
+            user=user,
+            outcome="Solved",
+            date_attempted=datetime(2025, 7, 1, tzinfo=timezone.utc),
+            self_notes='Commas, "quotes"\nand newlines',
+        )
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    Question.objects.create(title="Not mine", user=other)
+    return questions
+
+
+@pytest.mark.django_db
+def test_questions_csv(client, data):
+    response, body = _get(client, "questions.csv")
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert 'filename="questions.csv"' in response["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [row["title"] for row in rows] == [f"Export {i}" for i in range(5)]
+    assert rows[0]["tags"] == "arrays;graphs"
+    assert rows[0]["attempts_count"] == "1"
+    assert rows[2]["tags"] == ""
+
+
+@pytest.mark.django_db
+def test_logs_ndjson(client, data):
+    response, body = _get(client, "logs.ndjson")
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+    (log,) = [json.loads(line) for line in body.decode().splitlines()]
+    assert log["question"] == data[0].slug
+    assert log["date_attempted"] == "2025-07-01T00:00:00+00:00"
+    assert log["self_notes"] == 'Commas, "quotes"\nand newlines'
+
+
+@pytest.mark.django_db
+def test_empty_csv_has_a_header(client):
+    _, body = _get(client, "tags.csv")
+    assert body.decode().strip() == "name,description,created_at"
+
+
+@pytest.mark.django_db
+def test_gzipped_when_accepted(client, data):
+    response, body = _get(client, "questions.ndjson", accept_encoding="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    lines = gzip.decompress(body).decode().splitlines()
+    assert json.loads(lines[0])["tags"] == ["arrays", "graphs"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "accept_encoding, gzipped",
+    [
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, br", False),
+        ("*;q=0", False),
+        ("*, gzip;q=0", False),
+        ("identity, GZIP;q=0.5", True),
+        ("br, *", True),
+        ("deflate", False),
+    ],
+)
+def test_gzip_honours_q_values(client, data, accept_encoding, gzipped):
+    response, _ = _get(client, "tags.csv", accept_encoding=accept_encoding)
+    assert (response.get("Content-Encoding") == "gzip") is gzipped
+
+
+@pytest.mark.django_db
+def test_logs_without_a_user_follow_their_question(
+    client, data, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        QuestionLog.objects.create(question=data[1], outcome="Failed")
+    _, body = _get(client, "logs.ndjson")
+    logs = [json.loads(line) for line in body.decode().splitlines()]
+    assert [log["question"] for log in logs] == [data[0].slug, data[1].slug]
+
+
+@pytest.mark.django_db
+def test_tags_are_fetched_once_per_chunk(user, data):
+    with CaptureQueriesContext(connection) as ctx:
+        blocks = list(export.export_stream(user, "questions", "ndjson", chunk_size=2))
+    # One block and one tag query per chunk of two questions
+    assert len(blocks) == 3
+    assert len(ctx.captured_queries) == 1 + 3
+
+
+@pytest.mark.django_db
+def test_export_requires_authentication(data):
+    assert Client().get("/api/export/questions.csv").status_code in (401, 403)
+    assert Client().get("/api/export/users.csv").status_code == 404
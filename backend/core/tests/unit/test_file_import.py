@@ -0,0 +1,130 @@
+"""
+Tests for file imports, POST /api/import/<questions|logs>.<csv|ndjson>.
+"""
+
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core import file_import
+from backend.core.models import Question, QuestionLog, Tag
+
+
+def _post(client, path, body, content_type):
+    response = client.post(f"/api/import/{path}", data=body, content_type=content_type)
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def _ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+@pytest.mark.django_db
+def test_questions_csv_with_tags(client, user):
+    Tag.objects.create(name="graphs", user=user)
+    body = (
+        "﻿title,difficulty,content,tags,slug\n"
+        'Two sum,Easy,"<p>Hi</p><script>x()</script>",arrays;graphs,ignored\n'
+        "Word ladder,Hard,,graphs,\n"
+        ",Easy,,,\n"
+    )
+    result = _post(client, "questions.csv", body, "text/csv")
+    assert result["rows"] == 3
+    assert result["created"] == 2
+    assert result["error_count"] == 1
+    assert result["errors"][0]["line"] == 4
+    assert "title" in result["errors"][0]["errors"]
+
+    two_sum = Question.objects.get(title="Two sum")
+    assert two_sum.user == user
+    assert two_sum.content == "<p>Hi</p>"
+    assert sorted(two_sum.tags.values_list("name", flat=True)) == ["arrays", "graphs"]
+    assert Tag.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+def test_tag_names_of_other_users_are_reported(client, user, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    Tag.objects.create(name="taken", user=other)
+    body = _ndjson([{"title": "Mine", "tags": ["taken"]}, {"title": "Fine"}])
+    result = _post(client, "questions.ndjson", body, "application/x-ndjson")
+    assert result["created"] == 1
+    assert result["errors"] == [
+        {"line": 1, "errors": {"tags": ["Tag names not available: taken"]}}
+    ]
+
+
+@pytest.mark.django_db
+def test_logs_ndjson_by_slug(client, user):
+    question = Question.objects.create(title="Imported logs", user=user)
+    body = _ndjson(
+        [
+            {
+                "question": question.slug,
+                "outcome": "Solved",
+                "date_attempted": "2025-07-02T00:00:00+00:00",
+            },
+            {"question": question.pk, "outcome": "Failed"},
+            {"question": "no-such-question", "outcome": "Solved"},
+            {"question": question.slug, "outcome": "Maybe"},
+        ]
+    )
+    body += "not json\n[1]\n"
+    result = _post(client, "logs.ndjson", body, "application/x-ndjson")
+    assert result["rows"] == 6
+    assert result["created"] == 2
+    assert [error["line"] for error in result["errors"]] == [3, 4, 5, 6]
+
+    question.refresh_from_db()
+    assert question.attempts_count == 2
+    assert question.solved_count == 1
+    assert question.last_attempted_at == datetime(2025, 7, 2, tzinfo=timezone.utc)
+    assert QuestionLog.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+def test_multipart_upload(client):
+    upload = SimpleUploadedFile("questions.csv", b"title\nFrom a form\n")
+    response = client.post("/api/import/questions.csv", {"file": upload})
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert client.post("/api/import/questions.csv", {}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_unreadable_rest_of_file_is_reported(client):
+    body = b"title\nKept\n\xff\xfe broken\n"
+    result = _post(client, "questions.csv", body, "text/csv")
+    assert result["created"] == 1
+    assert "could not be read" in result["errors"][0]["errors"]
+
+
+@pytest.mark.django_db
+def test_queries_per_batch_do_not_grow_with_rows(user, rf):
+    request = rf.post("/")
+    request.user = user
+    rows = [{"title": f"Q{i}", "tags": ["a", "b"]} for i in range(40)]
+
+    def run(count, batch_size):
+        stream = _ndjson(rows[:count]).encode()
+        with CaptureQueriesContext(connection) as ctx:
+            result = file_import.import_file(
+                user,
+                "questions",
+                "ndjson",
+                io.BytesIO(stream),
+                context={"request": request},
+                batch_size=batch_size,
+            )
+        assert result.created == count
+        return len(ctx.captured_queries)
+
+    # Warm the tag catalog; later batches find the tags there
+    run(1, 20)
+    assert run(20, 20) == run(10, 20)
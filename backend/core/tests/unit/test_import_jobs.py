@@ -0,0 +1,393 @@
+"""
+Tests for platform import jobs: POST /api/import/<platform>/, the worker and
+GET /api/import/jobs/<id>/.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+
+from backend.core import import_jobs
+from backend.core.models import ImportJob, Question, QuestionLog
+from backend.core.platforms import (
+    PLATFORMS,
+    Completion,
+    Page,
+    Platform,
+    PlatformError,
+    ProfileNotFound,
+)
+from backend.core.platforms.codewars import CodewarsPlatform
+
+SOLVED_AT = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class FakePlatform(Platform):
+    name = "fake"
+    pages = []
+    error = None
+
+    def fetch(self, username):
+        for completions in self.pages:
+            yield Page(completions=completions, total_items=3)
+        if self.error:
+            raise self.error
+
+
+def _completion(n, languages=("python",)):
+    return Completion(
+        title=f"Kata {n}",
+        url=f"https://example.com/kata/{n}",
+        completed_at=SOLVED_AT + timedelta(days=n),
+        languages=languages,
+    )
+
+
+@pytest.fixture
+def fake_platform(monkeypatch):
+    monkeypatch.setitem(PLATFORMS, "fake", FakePlatform)
+    monkeypatch.setattr(FakePlatform, "pages", [[_completion(1), _completion(2)]])
+    monkeypatch.setattr(FakePlatform, "error", None)
+    with override_settings(IMPORT_QUEUE_BACKEND="database"):
+        yield FakePlatform
+
+
+def _start(client, platform="fake", username="someone"):
+    return client.post(
+        f"/api/import/{platform}/",
+        data=json.dumps({"username": username}),
+        content_type="application/json",
+    )
+
+
+def _run_worker():
+    call_command("run_import_worker", "--once", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_import_is_queued_then_run_by_the_worker(client, user, fake_platform):
+    fake_platform.pages = [[_completion(1), _completion(2)], [_completion(3)]]
+    response = _start(client)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert response["Location"] == f"/api/import/jobs/{job['id']}/"
+    # Nothing is fetched in the request
+    assert not Question.objects.exists()
+
+    _run_worker()
+    job = client.get(response["Location"]).json()
+    assert job["status"] == "succeeded"
+    assert job["pages_fetched"] == 2
+    assert job["items_fetched"] == job["total_items"] == 3
+    assert job["questions_created"] == job["logs_created"] == 3
+    assert job["finished_at"] is not None
+
+    question = Question.objects.get(user=user, source="https://example.com/kata/2")
+    assert question.title == "Kata 2"
+    assert question.solved_count == 1
+    log = QuestionLog.objects.get(question=question)
+    assert log.outcome == "Solved"
+    assert log.solution_approach == "python"
+    assert log.date_attempted == SOLVED_AT + timedelta(days=2)
+
+
+@pytest.mark.django_db
+def test_reimport_adds_only_what_is_new(client, user, fake_platform):
+    _start(client)
+    _run_worker()
+    fake_platform.pages = [[_completion(1), _completion(2), _completion(4)]]
+    job = _start(client).json()
+    _run_worker()
+
+    job = ImportJob.objects.get(pk=job["id"])
+    assert (job.questions_created, job.logs_created) == (1, 1)
+    assert Question.objects.filter(user=user).count() == 3
+    assert QuestionLog.objects.filter(user=user).count() == 3
+
+
+@pytest.mark.django_db
+def test_an_unfinished_job_is_not_started_twice(client, fake_platform):
+    first = _start(client).json()
+    assert _start(client).json()["id"] == first["id"]
+    assert _start(client, username="other").json()["id"] != first["id"]
+
+
+@pytest.mark.django_db
+def test_invalid_requests(client, fake_platform):
+    assert _start(client, username="").status_code == 400
+    assert _start(client, platform="nowhere").status_code == 404
+    assert not ImportJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_platform_errors_fail_the_job(client, fake_platform):
+    fake_platform.error = PlatformError("Upstream is down.")
+    job = _start(client).json()
+    _run_worker()
+    job = client.get(f"/api/import/jobs/{job['id']}/").json()
+    assert job["status"] == "failed"
+    assert job["error"] == "Upstream is down."
+    # The pages fetched before the error are kept
+    assert job["questions_created"] == 2
+
+
+@pytest.mark.django_db
+def test_jobs_run_once_unless_abandoned(user, fake_platform):
+    job, _ = import_jobs.start_import_job(user, "fake", "someone")
+    assert import_jobs.claim_job(job.pk) is not None
+    assert import_jobs.claim_job(job.pk) is None
+
+    # A worker died; the job can be claimed again until out of attempts
+    started = datetime.now(timezone.utc) - timedelta(hours=1)
+    ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=started)
+    with override_settings(IMPORT_JOB_MAX_ATTEMPTS=2):
+        assert import_jobs.claim_job(job.pk) is not None
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=started)
+        assert import_jobs.claim_job(job.pk) is None
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert job.error == "The import timed out."
+
+
+@pytest.mark.django_db
+def test_queue_messages_run_their_job(user, fake_platform):
+    job, _ = import_jobs.start_import_job(user, "fake", "someone")
+    body = json.dumps({"action": "import", "data": {"job_id": job.pk}})
+    assert import_jobs.handle_message(body).status == "succeeded"
+    # Delivered again
+    assert import_jobs.handle_message(body) is None
+    assert QuestionLog.objects.filter(user=user).count() == 2
+
+
+def _age_heartbeat(job):
+    ImportJob.objects.filter(pk=job.pk).update(
+        heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1)
+    )
+
+
+@pytest.mark.django_db
+def test_pages_keep_a_long_run_from_being_claimed_again(
+    user, fake_platform, monkeypatch
+):
+    job, _ = import_jobs.start_import_job(user, "fake", "someone")
+
+    def fetch(self, username):
+        yield Page(completions=[_completion(1)])
+        # Started long ago, but its last page was just saved
+        ImportJob.objects.filter(pk=job.pk).update(
+            started_at=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+        assert import_jobs.claim_job(job.pk) is None
+        yield Page(completions=[_completion(2)])
+
+    monkeypatch.setattr(fake_platform, "fetch", fetch)
+    assert import_jobs.run_job(job.pk).status == "succeeded"
+
+
+@pytest.mark.django_db
+def test_a_run_claimed_again_stops_at_its_next_page(
+    user, fake_platform, monkeypatch, settings
+):
+    settings.IMPORT_JOB_MAX_ATTEMPTS = 3
+    job, _ = import_jobs.start_import_job(user, "fake", "someone")
+    second = []
+
+    def fetch(self, username):
+        yield Page(completions=[_completion(1)])
+        if not second:
+            # The worker stalled; another one takes the job over
+            _age_heartbeat(job)
+            second.append(import_jobs.claim_job(job.pk))
+        yield Page(completions=[_completion(2)])
+
+    monkeypatch.setattr(fake_platform, "fetch", fetch)
+    assert import_jobs.run_job(job.pk) is None
+    assert second[0].attempts == 2
+
+    job.refresh_from_db()
+    assert (job.status, job.attempts, job.pages_fetched) == ("running", 2, 1)
+    # The stale run's second page was rolled back
+    assert Question.objects.filter(user=user).count() == 1
+    assert not Question.objects.filter(source="https://example.com/kata/2").exists()
+
+    # A later run finishes the import without duplicates
+    _age_heartbeat(job)
+    assert import_jobs.run_job(job.pk).status == "succeeded"
+    assert Question.objects.filter(user=user).count() == 2
+    assert QuestionLog.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "body",
+    ["not json", "[]", '{"action": "import"}', '{"action": "import", "data": 1}'],
+)
+def test_malformed_queue_messages_are_ignored(body):
+    assert import_jobs.handle_message(body) is None
+
+
+class FakeSQS:
+    def __init__(self, bodies):
+        self.messages = [
+            {"MessageId": str(i), "ReceiptHandle": f"receipt-{i}", "Body": body}
+            for i, body in enumerate(bodies)
+        ]
+        self.deleted = []
+        self.deferred = []
+
+    def receive_message(self, **kwargs):
+        messages, self.messages = self.messages, []
+        return {"Messages": messages}
+
+    def delete_message(self, QueueUrl, ReceiptHandle):
+        self.deleted.append(ReceiptHandle)
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        self.deferred.append(ReceiptHandle)
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    from backend import aws
+
+    queue = FakeSQS([])
+    monkeypatch.setattr(aws, "get_sqs_client", lambda **kwargs: queue)
+    with override_settings(IMPORT_QUEUE_BACKEND="sqs", IMPORT_QUEUE_URL="q"):
+        yield queue
+
+
+def _message(job_id):
+    return json.dumps({"action": "import", "data": {"job_id": job_id}})
+
+
+@pytest.mark.django_db
+def test_sqs_messages_are_deleted_once_their_job_finished(user, fake_platform, sqs):
+    queued, _ = import_jobs.start_import_job(user, "fake", "someone")
+    running, _ = import_jobs.start_import_job(user, "fake", "other")
+    import_jobs.claim_job(running.pk)
+    sqs.messages = FakeSQS([_message(queued.pk), _message(running.pk), "{"]).messages
+
+    _run_worker()
+    assert ImportJob.objects.get(pk=queued.pk).status == "succeeded"
+    # Still running on another worker: retried once it could have timed out
+    assert sqs.deferred == ["receipt-1"]
+    assert sqs.deleted == ["receipt-0", "receipt-2"]
+
+
+@pytest.mark.django_db
+def test_sqs_worker_survives_a_failing_message(user, fake_platform, sqs, monkeypatch):
+    from backend.core.management.commands import run_import_worker
+
+    attempted = []
+
+    def crash(job_id):
+        attempted.append(job_id)
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(run_import_worker, "run_job", crash)
+    sqs.messages = FakeSQS([_message(1), _message(2)]).messages
+    _run_worker()
+    assert attempted == [1, 2]
+    # Left on the queue for redelivery
+    assert sqs.deleted == sqs.deferred == []
+
+
+@pytest.mark.django_db
+def test_worker_fails_abandoned_jobs(user, fake_platform):
+    job, _ = import_jobs.start_import_job(user, "fake", "someone")
+    ImportJob.objects.filter(pk=job.pk).update(
+        status="running",
+        heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        attempts=1,
+    )
+    with override_settings(IMPORT_JOB_MAX_ATTEMPTS=1):
+        _run_worker()
+    job.refresh_from_db()
+    assert job.status == "failed"
+
+
+@pytest.mark.django_db
+def test_jobs_are_private(client, fake_platform):
+    other = get_user_model().objects.create_user(username="other", password="x")
+    job, _ = import_jobs.start_import_job(other, "fake", "someone")
+    assert client.get(f"/api/import/jobs/{job.pk}/").status_code == 404
+
+
+class _CodewarsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if not self.path.startswith("/users/someone/"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        page = int(self.path.rsplit("page=", 1)[1])
+        body = {
+            "totalPages": 2,
+            "totalItems": 3,
+            "data": [
+                {
+                    "id": f"id{page}{n}",
+                    "name": f"Kata {page}{n}",
+                    "completedLanguages": ["python", "go"],
+                    "completedAt": "2026-01-02T03:04:05.000Z",
+                }
+                for n in range(2 - page)
+            ],
+        }
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def codewars_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CodewarsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_codewars_pages(codewars_server):
+    pages = list(CodewarsPlatform(api_url=codewars_server).fetch("someone"))
+    assert [len(page.completions) for page in pages] == [2, 1]
+    completion = pages[0].completions[0]
+    assert completion.title == "Kata 00"
+    assert completion.url == "https://www.codewars.com/kata/id00"
+    assert completion.languages == ("python", "go")
+    assert completion.completed_at == SOLVED_AT
+    assert pages[0].total_items == 3
+
+    with pytest.raises(ProfileNotFound):
+        list(CodewarsPlatform(api_url=codewars_server).fetch("nobody"))
+
+
+@pytest.mark.django_db
+def test_sqs_queue_publishes_a_message_on_commit(
+    user, monkeypatch, django_capture_on_commit_callbacks
+):
+    from backend import aws
+
+    published = []
+    monkeypatch.setattr(
+        aws, "publish_sqs_message", lambda *args, **kwargs: published.append(args)
+    )
+    with override_settings(IMPORT_QUEUE_BACKEND="sqs", IMPORT_QUEUE_URL="q"):
+        with django_capture_on_commit_callbacks(execute=True):
+            job, _ = import_jobs.start_import_job(user, "codewars", "someone")
+            assert not published
+    assert published == [("q", "import", {"job_id": job.pk})]
@@ -0,0 +1,80 @@
+"""
+Tests for the per-route request metrics and the Prometheus endpoint.
+"""
+
+import pytest
+from django.test import Client, override_settings
+from prometheus_client import REGISTRY
+
+from backend.core.models import Question
+
+
+def _sample(name, route, method="GET", **labels):
+    value = REGISTRY.get_sample_value(
+        name, {"route": route, "method": method, **labels}
+    )
+    return value or 0
+
+
+@pytest.mark.django_db
+def test_requests_are_recorded_per_route(client, user):
+    Question.objects.create(title="Measured", user=user)
+    before = {
+        "count": _sample("http_request_duration_seconds_count", "question-list"),
+        "queries": _sample("http_request_db_queries_sum", "question-list"),
+        "serializer": _sample(
+            "http_request_serializer_duration_seconds_sum", "question-list"
+        ),
+        "size": _sample("http_response_size_bytes_sum", "question-list"),
+        "ok": _sample("http_requests_total", "question-list", status="200"),
+    }
+
+    response = client.get("/api/questions/")
+    assert response.status_code == 200
+
+    assert _sample("http_request_duration_seconds_count", "question-list") == (
+        before["count"] + 1
+    )
+    assert _sample("http_request_db_queries_sum", "question-list") > before["queries"]
+    assert (
+        _sample("http_request_serializer_duration_seconds_sum", "question-list")
+        > before["serializer"]
+    )
+    assert _sample("http_response_size_bytes_sum", "question-list") == (
+        before["size"] + len(response.content)
+    )
+    assert _sample("http_requests_total", "question-list", status="200") == (
+        before["ok"] + 1
+    )
+
+
+@pytest.mark.django_db
+def test_unmatched_routes_share_one_label(client):
+    before = _sample("http_requests_total", "<unmatched>", status="404")
+    client.get("/no/such/page/")
+    client.get("/another/missing/page/")
+    assert _sample("http_requests_total", "<unmatched>", status="404") == before + 2
+
+
+@pytest.mark.django_db
+@override_settings(DEBUG=True)
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.get("/api/tags/")
+    response = client.get("/api/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_db_queries_count{method="GET",route="tag-list-create"}' in body
+
+
+@override_settings(METRICS_TOKEN="secret")
+def test_metrics_endpoint_token(db):
+    assert Client().get("/api/metrics/").status_code == 403
+    response = Client().get("/api/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == 200
+
+
+@override_settings(METRICS_TOKEN="", DEBUG=False)
+def test_metrics_endpoint_is_hidden_without_a_token(db):
+    assert Client().get("/api/metrics/").status_code == 404
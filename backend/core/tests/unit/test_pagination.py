@@ -0,0 +1,146 @@
+"""
+Tests for keyset (cursor) pagination on the core list endpoints.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.models import Question, QuestionLog, Tag
+
+
+def _walk(client, url):
+    """Follow ``next`` links until exhausted, returning all result ids."""
+    ids = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        body = response.json()
+        ids.extend(item["id"] for item in body["results"])
+        url = body["next"]
+        pages += 1
+    return ids, pages
+
+
+@pytest.fixture()
+def questions(user):
+    created = [Question.objects.create(title=f"Q{i % 3}", user=user) for i in range(10)]
+    # Force ties on created_at and title so the id tie-breaker is exercised
+    same_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    Question.objects.filter(user=user).update(created_at=same_time)
+    return created
+
+
+@pytest.mark.django_db
+def test_unpaginated_request_returns_bare_list(client, questions):
+    response = client.get("/api/questions/")
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    assert len(response.json()) == 10
+
+
+@pytest.mark.django_db
+def test_question_pages_follow_meta_ordering(client, questions):
+    expected = list(
+        Question.objects.order_by("-created_at", "title", "id").values_list(
+            "id", flat=True
+        )
+    )
+    ids, pages = _walk(client, "/api/questions/?page_size=3")
+    assert ids == expected
+    assert pages == 4
+
+
+@pytest.mark.django_db
+def test_question_log_pages_handle_null_dates(client, user):
+    question = Question.objects.create(title="Logged", user=user)
+    for day in (1, 2, 2, None, 3, None, 1):
+        QuestionLog.objects.create(
+            question=question,
+            user=user,
+            date_attempted=(
+                datetime(2025, 7, day, tzinfo=timezone.utc) if day else None
+            ),
+        )
+    ids, _ = _walk(client, f"/api/questions/{question.id}/logs/?page_size=2")
+    logs = QuestionLog.objects.filter(question=question)
+    assert sorted(ids) == sorted(log.id for log in logs)
+    dates = [QuestionLog.objects.get(id=i).date_attempted for i in ids]
+    dated = [d for d in dates if d is not None]
+    assert dated == sorted(dated, reverse=True)
+    # NULLs sort as the largest value, i.e. first when descending
+    assert dates[:2] == [None, None]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page_size", [1, 2, 4])
+def test_descending_pages_cross_null_dates(client, user, page_size):
+    dates = [None, 3, None, 1, 3, None, 2]
+    for i, day in enumerate(dates):
+        Question.objects.create(
+            title=f"Q{i}",
+            user=user,
+            last_attempted_at=(
+                datetime(2025, 7, day, tzinfo=timezone.utc) if day else None
+            ),
+        )
+    url = f"/api/questions/?ordering=-last_attempted_at&page_size={page_size}"
+    ids, _ = _walk(client, url)
+    # NULLs sort as the largest value, so they come first; ties go by id
+    expected = sorted(
+        Question.objects.filter(user=user),
+        key=lambda q: (
+            q.last_attempted_at is not None,
+            -q.last_attempted_at.timestamp() if q.last_attempted_at else 0,
+            q.id,
+        ),
+    )
+    assert ids == [q.id for q in expected]
+
+
+@pytest.mark.django_db
+def test_tag_pages(client, user):
+    for i in range(5):
+        Tag.objects.create(name=f"tag-{i}", user=user)
+    ids, pages = _walk(client, "/api/tags/?page_size=2")
+    assert len(ids) == 5
+    assert pages == 3
+
+
+@pytest.mark.django_db
+def test_count_only_when_requested(client, questions):
+    with CaptureQueriesContext(connection) as ctx:
+        body = client.get("/api/questions/?page_size=5").json()
+    assert "count" not in body
+    assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+
+    body = client.get("/api/questions/?page_size=5&count=true").json()
+    assert body["count"] == 10
+
+
+@pytest.mark.django_db
+def test_deep_pages_use_keyset_not_offset(client, questions):
+    url = "/api/questions/?page_size=2"
+    for _ in range(3):
+        url = client.get(url).json()["next"]
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    question_sql = [
+        q["sql"] for q in ctx.captured_queries if 'FROM "core_question"' in q["sql"]
+    ]
+    assert question_sql
+    assert not any("OFFSET" in sql for sql in question_sql)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-base64!", "eyJvIjogWyJ4Il0sICJ2IjogWzFdfQ=="],
+    ids=["garbage cursor", "cursor for another ordering"],
+)
+def test_invalid_cursor_returns_404(client, questions, cursor):
+    response = client.get(f"/api/questions/?cursor={cursor}")
+    assert response.status_code == 404
@@ -0,0 +1,195 @@
+"""
+Tests for the platform HTTP client, against a local HTTP server.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.core.platforms import Platform, PlatformError
+from backend.core.platforms.http import (
+    PlatformClient,
+    ResponseCache,
+    TokenBucket,
+    fetch_ordered,
+    rate_limit,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled connections can be seen being reused
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address[1], self.headers))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            calls = sum(1 for path, _, _ in server.requests if path == self.path)
+        try:
+            if self.path.startswith("/pages/"):
+                time.sleep(0.02)
+                number = int(self.path.rsplit("/", 1)[1])
+                etag = f'"v{number}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                else:
+                    self._send(200, {"number": number}, headers={"ETag": etag})
+            elif self.path == "/flaky" and calls < 3:
+                self._send(503, headers={"Retry-After": "0"})
+            elif self.path == "/flaky":
+                self._send(200, {"ok": True})
+            else:
+                self._send(500)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.in_flight = server.max_in_flight = 0
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(**kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    return PlatformClient("test", TokenBucket(1000, 1000), **kwargs)
+
+
+def test_pages_are_fetched_concurrently_in_order_over_pooled_connections(server):
+    client = _client(pool_size=4)
+
+    def fetch(number):
+        return client.get(f"{server.url}/pages/{number}").json()["number"]
+
+    assert list(fetch_ordered(fetch, range(20), workers=4)) == list(range(20))
+    client.close()
+    assert server.max_in_flight > 1
+    # Four pooled keep-alive connections at most, not one per page
+    assert len({port for _, port, _ in server.requests}) <= 4
+
+
+def test_fetch_ordered_stops_with_its_consumer():
+    started = []
+
+    def fetch(number):
+        started.append(number)
+        return number
+
+    results = fetch_ordered(fetch, range(1000), workers=2)
+    assert next(results) == 0
+    results.close()
+    assert len(started) <= 4
+
+
+def test_cached_responses_are_revalidated(server, tmp_path):
+    client = _client(cache_dir=str(tmp_path))
+    url = f"{server.url}/pages/7"
+    first = client.get(url)
+    assert (first.status_code, first.from_cache) == (200, False)
+
+    again = _client(cache_dir=str(tmp_path)).get(url)
+    assert (again.status_code, again.from_cache) == (200, True)
+    assert again.json() == {"number": 7}
+    assert server.requests[-1][2]["If-None-Match"] == '"v7"'
+
+
+def test_cache_prunes_expired_then_least_recently_used_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_age=3600, max_bytes=250)
+    now = time.time()
+    for n, age in enumerate((7200, 300, 200, 100)):
+        url = f"https://example.com/{n}"
+        cache.set(url, {"body": "x" * 80})
+        os.utime(cache._path(url), (now - age, now - age))
+    # Read, so it counts as used just now
+    assert cache.get("https://example.com/1")
+
+    assert cache.prune() == 2
+    assert cache.get("https://example.com/0") is None
+    assert cache.get("https://example.com/2") is None
+    assert cache.get("https://example.com/1") and cache.get("https://example.com/3")
+
+
+def test_closing_a_client_prunes_its_cache(server, tmp_path):
+    client = _client(cache_dir=str(tmp_path), cache_max_bytes=0)
+    client.get(f"{server.url}/pages/1")
+    assert os.listdir(tmp_path)
+    client.close()
+    assert not os.listdir(tmp_path)
+
+
+def test_platforms_must_implement_fetch():
+    class Incomplete(Platform):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_retries_with_backoff(server):
+    assert _client().get(f"{server.url}/flaky").json() == {"ok": True}
+    assert [path for path, _, _ in server.requests] == ["/flaky"] * 3
+
+    # Out of retries, the last response is returned
+    assert _client(max_retries=1).get(f"{server.url}/down").status_code == 500
+    assert len(server.requests) == 5
+
+
+def test_unreachable_platform():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(PlatformError):
+        _client(max_retries=1).get(f"http://127.0.0.1:{port}/")
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    now, sleeps = [0.0], []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert sleeps == [0.5, 0.5]
+
+    # Idle time refills the bucket, up to its capacity
+    now[0] += 10
+    sleeps.clear()
+    for _ in range(2):
+        bucket.acquire()
+    assert sleeps == []
+
+
+def test_platforms_share_their_bucket():
+    assert rate_limit("shared", 1, 1) is rate_limit("shared", 5, 5)
+    assert rate_limit("shared", 1, 1) is not rate_limit("other", 1, 1)
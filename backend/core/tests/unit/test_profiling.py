@@ -0,0 +1,107 @@
+"""
+Tests for on-demand request profiling and its bounded profile store.
+"""
+
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client, override_settings
+
+from backend.core.models import RequestProfile
+from backend.core.profiling import load_summary, make_profile_token, profile_path
+
+
+@pytest.fixture()
+def profiling(settings, tmp_path):
+    settings.PROFILING_ENABLED = True
+    settings.PROFILE_DIR = str(tmp_path)
+    settings.PROFILE_MAX_COUNT = 3
+    return tmp_path
+
+
+def _profiled(client, url="/api/questions/"):
+    return client.get(url, HTTP_X_PROFILE=make_profile_token())
+
+
+@pytest.mark.django_db
+def test_signed_header_profiles_the_request(client, profiling):
+    response = _profiled(client)
+    assert response.status_code == 200
+
+    profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+    assert (profile.method, profile.path, profile.status_code) == (
+        "GET",
+        "/api/questions/",
+        200,
+    )
+    assert profile.user.username == "slugtestuser"
+    assert os.path.exists(profile_path(profile.name, ".prof"))
+
+    summary = load_summary(profile.name)
+    assert "cumulative" in summary["top_functions"]
+    assert len(summary["queries"]) == profile.query_count
+    assert any("core_question" in q["sql"] for q in summary["queries"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "headers",
+    [{}, {"HTTP_X_PROFILE": "forged"}, {"HTTP_X_PROFILE": "expired"}],
+    ids=["no header", "bad signature", "expired"],
+)
+def test_requests_without_a_valid_token_are_not_profiled(client, profiling, headers):
+    if headers.get("HTTP_X_PROFILE") == "expired":
+        headers = {"HTTP_X_PROFILE": make_profile_token(max_age=-1)}
+    response = client.get("/api/questions/", **headers)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response
+    assert not RequestProfile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_staff_can_profile_with_a_query_flag(client, user, profiling):
+    assert "X-Profile-Id" not in client.get("/api/questions/?profile=1")
+    user.is_staff = True
+    user.save()
+    assert "X-Profile-Id" in client.get("/api/questions/?profile=1")
+
+
+@pytest.mark.django_db
+def test_store_keeps_only_the_newest_profiles(client, profiling):
+    ids = [_profiled(client)["X-Profile-Id"] for _ in range(5)]
+    kept = list(RequestProfile.objects.values_list("pk", flat=True))
+    assert sorted(kept) == sorted(int(i) for i in ids[-3:])
+    assert len(list(profiling.iterdir())) == 3 * 2
+
+
+@pytest.mark.django_db
+def test_disabled_middleware_is_not_in_the_chain(client, tmp_path):
+    with override_settings(PROFILING_ENABLED=False, PROFILE_DIR=str(tmp_path)):
+        response = _profiled(Client())
+    assert "X-Profile-Id" not in response
+    assert not RequestProfile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_admin_lists_and_downloads_profiles(client, profiling, django_user_model):
+    profile_id = _profiled(client)["X-Profile-Id"]
+    django_user_model.objects.create_superuser("boss", "boss@example.com", "pw")
+    admin = Client()
+    admin.login(username="boss", password="pw")
+
+    assert admin.get("/admin/core/requestprofile/").status_code == 200
+    detail = admin.get(f"/admin/core/requestprofile/{profile_id}/change/")
+    assert detail.status_code == 200
+    assert b"core_question" in detail.content
+
+    download = admin.get(f"/admin/core/requestprofile/{profile_id}/download/")
+    assert download.status_code == 200
+    assert download["Content-Disposition"].startswith("attachment")
+
+
+def test_make_profile_token_command():
+    out = StringIO()
+    call_command("make_profile_token", "--minutes", "5", stdout=out)
+    assert out.getvalue().startswith("X-Profile: ")
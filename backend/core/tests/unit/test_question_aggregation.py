@@ -6,9 +6,13 @@ from datetime import datetime, timezone
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from backend.core.models import Question, QuestionLog
+from backend.core.signals import PendingAggregateDeltas, aggregate_stats
+from backend.core.versioning import user_data_version
 
 User = get_user_model()
 
@@ -34,13 +38,14 @@ class TestQuestionAggregation(TestCase):
         """Test that creating a log updates the question's aggregates."""
         attempt_date = datetime(2025, 7, 4, 12, 0, 0, tzinfo=timezone.utc)
 
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            date_attempted=attempt_date,
-            outcome="Solved",
-            time_spent_min=30,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                date_attempted=attempt_date,
+                outcome="Solved",
+                time_spent_min=30,
+            )
 
         # Refresh the question from database
         self.question.refresh_from_db()
@@ -58,24 +63,25 @@ class TestQuestionAggregation(TestCase):
         ]
 
         # Create three logs with different outcomes
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            date_attempted=dates[0],
-            outcome="Failed",
-        )
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            date_attempted=dates[1],
-            outcome="Partial",
-        )
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            date_attempted=dates[2],
-            outcome="Solved",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                date_attempted=dates[0],
+                outcome="Failed",
+            )
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                date_attempted=dates[1],
+                outcome="Partial",
+            )
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                date_attempted=dates[2],
+                outcome="Solved",
+            )
 
         # Refresh the question from database
         self.question.refresh_from_db()
@@ -86,11 +92,12 @@ class TestQuestionAggregation(TestCase):
 
     def test_log_update_recalculates_aggregates(self):
         """Test that updating a log recalculates the aggregates."""
-        log = QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Failed",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            log = QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Failed",
+            )
 
         # Initial state
         self.question.refresh_from_db()
@@ -98,7 +105,8 @@ class TestQuestionAggregation(TestCase):
 
         # Update the log to "Solved"
         log.outcome = "Solved"
-        log.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            log.save()
 
         # Check that aggregates were updated
         self.question.refresh_from_db()
@@ -107,16 +115,17 @@ class TestQuestionAggregation(TestCase):
     def test_log_deletion_updates_aggregates(self):
         """Test that deleting a log updates the aggregates."""
         # Create two logs
-        log1 = QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Solved",
-        )
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Failed",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            log1 = QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Solved",
+            )
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Failed",
+            )
 
         # Initial state: 2 attempts, 1 solved
         self.question.refresh_from_db()
@@ -124,7 +133,8 @@ class TestQuestionAggregation(TestCase):
         self.assertEqual(self.question.solved_count, 1)
 
         # Delete the solved log
-        log1.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            log1.delete()
 
         # Check that aggregates were updated
         self.question.refresh_from_db()
@@ -134,12 +144,13 @@ class TestQuestionAggregation(TestCase):
     def test_deleting_all_logs_resets_aggregates(self):
         """Test that deleting all logs resets aggregates to initial state."""
         # Create a log
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Solved",
-            date_attempted=datetime(2025, 7, 4, 12, 0, 0, tzinfo=timezone.utc),
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Solved",
+                date_attempted=datetime(2025, 7, 4, 12, 0, 0, tzinfo=timezone.utc),
+            )
 
         # Verify it's updated
         self.question.refresh_from_db()
@@ -148,7 +159,8 @@ class TestQuestionAggregation(TestCase):
         self.assertIsNotNone(self.question.last_attempted_at)
 
         # Delete all logs
-        QuestionLog.objects.filter(question=self.question).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.filter(question=self.question).delete()
 
         # Check that aggregates are reset
         self.question.refresh_from_db()
@@ -159,21 +171,23 @@ class TestQuestionAggregation(TestCase):
     def test_logs_without_date_attempted_handled_correctly(self):
         """Test that logs without date_attempted don't break aggregation."""
         # Create a log without date_attempted
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Solved",
-            # date_attempted is None
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Solved",
+                # date_attempted is None
+            )
 
         # Create a log with date_attempted
         attempt_date = datetime(2025, 7, 4, 12, 0, 0, tzinfo=timezone.utc)
-        QuestionLog.objects.create(
-            question=self.question,
-            user=self.user,
-            outcome="Failed",
-            date_attempted=attempt_date,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionLog.objects.create(
+                question=self.question,
+                user=self.user,
+                outcome="Failed",
+                date_attempted=attempt_date,
+            )
 
         # Check aggregates
         self.question.refresh_from_db()
@@ -184,29 +198,180 @@ class TestQuestionAggregation(TestCase):
 
     def test_multiple_solved_outcomes_counted_correctly(self):
         """Test that multiple 'Solved' outcomes are all counted."""
-        for i in range(3):
-            QuestionLog.objects.create(
-                question=self.question,
-                user=self.user,
-                outcome="Solved",
-                date_attempted=datetime(2025, 7, i + 1, 12, 0, 0, tzinfo=timezone.utc),
-            )
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                QuestionLog.objects.create(
+                    question=self.question,
+                    user=self.user,
+                    outcome="Solved",
+                    date_attempted=datetime(
+                        2025, 7, i + 1, 12, 0, 0, tzinfo=timezone.utc
+                    ),
+                )
 
         self.question.refresh_from_db()
         self.assertEqual(self.question.attempts_count, 3)
         self.assertEqual(self.question.solved_count, 3)
 
-    def test_signal_handles_no_question_gracefully(self):
-        """Test that signal handlers don't break if question becomes None
-        during processing."""
-        # This tests the robustness of our signal handlers
+    def test_log_creation_applies_delta_without_rescan(self):
+        """Test that creating a log updates aggregates without rescanning logs."""
         with patch("backend.core.signals.update_question_aggregates") as mock_update:
-            # Create a log (this will trigger the signal)
-            QuestionLog.objects.create(
+            with CaptureQueriesContext(connection) as ctx:
+                with self.captureOnCommitCallbacks(execute=True):
+                    QuestionLog.objects.create(
+                        question=self.question,
+                        user=self.user,
+                        outcome="Solved",
+                    )
+
+            mock_update.assert_not_called()
+        # The INSERT plus a single UPDATE that never reads the logs table
+        self.assertEqual(len(ctx.captured_queries), 2)
+        update_sql = ctx.captured_queries[1]["sql"]
+        self.assertTrue(update_sql.startswith("UPDATE"))
+        self.assertNotIn("core_questionlog", update_sql)
+
+    def test_moving_latest_attempt_earlier_rescans_last_attempted_at(self):
+        """Test that last_attempted_at falls back to the next latest log."""
+        dates = [datetime(2025, 7, d, 12, 0, 0, tzinfo=timezone.utc) for d in (1, 5)]
+        with self.captureOnCommitCallbacks(execute=True):
+            older, latest = (
+                QuestionLog.objects.create(
+                    question=self.question, user=self.user, date_attempted=date
+                )
+                for date in dates
+            )
+
+        latest.date_attempted = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+        with self.captureOnCommitCallbacks(execute=True):
+            latest.save()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.last_attempted_at, dates[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            older.delete()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.last_attempted_at, latest.date_attempted)
+
+    def test_moving_log_to_another_question_updates_both(self):
+        """Test that reassigning a log moves its counts between questions."""
+        other = Question.objects.create(title="Other", user=self.user)
+        date = datetime(2025, 7, 4, 12, 0, 0, tzinfo=timezone.utc)
+        with self.captureOnCommitCallbacks(execute=True):
+            log = QuestionLog.objects.create(
                 question=self.question,
                 user=self.user,
                 outcome="Solved",
+                date_attempted=date,
             )
 
-            # Verify update_question_aggregates was called
-            mock_update.assert_called_once_with(self.question)
+        log.question = other
+        with self.captureOnCommitCallbacks(execute=True):
+            log.save()
+
+        self.question.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(
+            (self.question.attempts_count, self.question.solved_count), (0, 0)
+        )
+        self.assertIsNone(self.question.last_attempted_at)
+        self.assertEqual((other.attempts_count, other.solved_count), (1, 1))
+        self.assertEqual(other.last_attempted_at, date)
+
+    def test_saving_unrelated_fields_skips_aggregates(self):
+        """Test that saves which can't change aggregates issue no extra queries."""
+        with self.captureOnCommitCallbacks(execute=True):
+            log = QuestionLog.objects.create(
+                question=self.question, user=self.user, outcome="Solved"
+            )
+        log.self_notes = "Use a hash map"
+
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                log.save(update_fields=["self_notes"])
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_writes_in_a_transaction_are_coalesced_after_commit(self):
+        """Test that many log writes in one transaction cost one update."""
+        aggregate_stats.reset()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                for day in range(1, 11):
+                    QuestionLog.objects.create(
+                        question=self.question,
+                        user=self.user,
+                        outcome="Solved" if day % 2 else "Failed",
+                        date_attempted=datetime(2025, 7, day, tzinfo=timezone.utc),
+                    )
+                self.question.refresh_from_db()
+                self.assertEqual(self.question.attempts_count, 0)
+
+        pending = [c for c in callbacks if isinstance(c, PendingAggregateDeltas)]
+        self.assertEqual(len(pending), 1)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.attempts_count, 10)
+        self.assertEqual(self.question.solved_count, 5)
+        self.assertEqual(
+            self.question.last_attempted_at, datetime(2025, 7, 10, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            aggregate_stats.snapshot(), {"updates": 1, "deferred": 10, "coalesced": 9}
+        )
+
+    def test_rolled_back_savepoint_discards_its_deltas(self):
+        """Test that deltas from a rolled back savepoint are never applied."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                QuestionLog.objects.create(
+                    question=self.question, user=self.user, outcome="Solved"
+                )
+                try:
+                    with transaction.atomic():
+                        QuestionLog.objects.create(
+                            question=self.question, user=self.user, outcome="Solved"
+                        )
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.attempts_count, 1)
+        self.assertEqual(self.question.solved_count, 1)
+
+    def test_deleting_a_log_never_drives_drifted_counts_negative(self):
+        """Test that a delete from a question whose counts drifted to 0 clamps."""
+        with self.captureOnCommitCallbacks(execute=True):
+            log = QuestionLog.objects.create(
+                question=self.question, user=self.user, outcome="Solved"
+            )
+        Question.objects.filter(pk=self.question.pk).update(
+            attempts_count=0, solved_count=0
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            log.delete()
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.attempts_count, 0)
+        self.assertEqual(self.question.solved_count, 0)
+
+    def test_data_version_is_bumped_after_the_aggregates(self):
+        """Test that no version seen with the old counts outlives the commit."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                self.question.title = "Renamed"
+                self.question.save()
+                QuestionLog.objects.create(
+                    question=self.question, user=self.user, outcome="Solved"
+                )
+
+        stale_versions = set()
+        for callback in callbacks:
+            self.question.refresh_from_db()
+            if self.question.attempts_count == 0:
+                stale_versions.add(user_data_version(self.user.pk))
+            callback()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.attempts_count, 1)
+        self.assertNotIn(user_data_version(self.user.pk), stale_versions)
@@ -0,0 +1,135 @@
+"""
+Tests for the bulk question endpoint, POST /api/questions/bulk/.
+"""
+
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.models import Question, Tag
+
+URL = "/api/questions/bulk/"
+
+
+def _post(client, payload):
+    return client.post(URL, data=json.dumps(payload), content_type="application/json")
+
+
+@pytest.fixture()
+def tags(user):
+    return [Tag.objects.create(name=f"bulk-{i}", user=user) for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_bulk_create_with_tags(client, user, tags):
+    payload = {
+        "create": [
+            {"title": "Two Sum", "tag_ids": [tags[0].id, tags[1].id]},
+            {"title": "Two Sum", "content": "<p>x</p><script>y</script>"},
+        ]
+    }
+    response = _post(client, payload)
+    assert response.status_code == 200, response.content
+    created = response.json()["created"]
+    assert [q["title"] for q in created] == ["Two Sum", "Two Sum"]
+    assert created[0]["slug"] != created[1]["slug"]
+    assert {t["id"] for t in created[0]["tags"]} == {tags[0].id, tags[1].id}
+    assert created[1]["content"] == "<p>x</p>"
+    assert Question.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_update_and_delete(client, user, tags):
+    keep = Question.objects.create(title="Keep", user=user)
+    keep.tags.set([tags[0]])
+    doomed = Question.objects.create(title="Doomed", user=user)
+    payload = {
+        "update": [{"id": keep.id, "title": "Kept", "tag_ids": [tags[2].id]}],
+        "delete": [doomed.id],
+    }
+    response = _post(client, payload)
+    assert response.status_code == 200, response.content
+    body = response.json()
+    assert body["updated"][0]["title"] == "Kept"
+    assert [t["id"] for t in body["updated"][0]["tags"]] == [tags[2].id]
+    assert body["deleted"] == [doomed.id]
+    assert not Question.objects.filter(id=doomed.id).exists()
+    keep.refresh_from_db()
+    assert keep.title == "Kept"
+
+
+@pytest.mark.django_db
+def test_bulk_reports_per_item_errors_and_writes_nothing(
+    client, user, tags, django_user_model
+):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    foreign_tag = Tag.objects.create(name="foreign", user=other)
+    existing = Question.objects.create(title="Existing", user=user)
+    payload = {
+        "create": [
+            {"title": "Fine"},
+            {"title": ""},
+            {"title": "Bad tag", "tag_ids": [foreign_tag.id]},
+        ],
+        "update": [{"id": existing.id, "difficulty": "Impossible"}, {"id": 99999}],
+        "delete": [88888],
+    }
+    response = _post(client, payload)
+    assert response.status_code == 400
+    errors = [(e["op"], e["index"]) for e in response.json()["errors"]]
+    assert errors == [
+        ("create", 1),
+        ("create", 2),
+        ("update", 0),
+        ("update", 1),
+        ("delete", 0),
+    ]
+    assert list(Question.objects.filter(user=user)) == [existing]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"update": [{"title": "no id"}]},
+        {"update": [{"id": 1}, {"id": 1}]},
+        {"update": [{"id": 1}], "delete": [1]},
+    ],
+    ids=["update without id", "duplicate update ids", "update and delete"],
+)
+def test_bulk_rejects_malformed_envelopes(client, payload):
+    assert _post(client, payload).status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_oversized_batches(client, monkeypatch):
+    from backend.core.serializers import QuestionBulkSerializer
+
+    monkeypatch.setattr(QuestionBulkSerializer, "MAX_ITEMS", 2)
+    payload = {"create": [{"title": "a"}, {"title": "b"}, {"title": "c"}]}
+    assert _post(client, payload).status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_query_count_is_constant(client, user, tags):
+    def count(n):
+        payload = {
+            "create": [
+                {"title": f"Q{i}", "tag_ids": [t.id for t in tags]} for i in range(n)
+            ]
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            assert _post(client, payload).status_code == 200
+        return len(ctx.captured_queries)
+
+    count(1)  # warm the tag catalog cache
+    assert count(50) == count(5)
+
+
+@pytest.mark.django_db
+def test_bulk_created_questions_are_searchable(client, user):
+    _post(client, {"create": [{"title": "Dijkstra shortest path"}]})
+    response = client.get("/api/questions/?q=dijkstra")
+    assert [q["title"] for q in response.json()] == ["Dijkstra shortest path"]
@@ -0,0 +1,114 @@
+"""
+Tests for server-side filtering and sorting on /api/questions/.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.core.models import Question, Tag
+
+
+def _titles(client, query):
+    response = client.get(f"/api/questions/?{query}")
+    assert response.status_code == 200, response.content
+    return [q["title"] for q in response.json()]
+
+
+@pytest.fixture()
+def tags(user):
+    return {name: Tag.objects.create(name=name, user=user) for name in ("dp", "graph")}
+
+
+@pytest.fixture()
+def questions(user, tags):
+    rows = [
+        ("Easy DP", "Easy", "LeetCode", True, 4, 4, (2025, 7, 1), ["dp"]),
+        ("Medium Graph", "Medium", "LeetCode", True, 4, 1, (2025, 7, 3), ["graph"]),
+        ("Hard Both", "Hard", "Interview", False, 2, 1, (2025, 6, 1), ["dp", "graph"]),
+        ("Untouched", "Medium", "", True, 0, 0, None, []),
+    ]
+    created = {}
+    for title, difficulty, source, active, attempts, solved, day, tag_names in rows:
+        question = Question.objects.create(
+            title=title,
+            user=user,
+            difficulty=difficulty,
+            source=source,
+            is_active=active,
+            attempts_count=attempts,
+            solved_count=solved,
+            last_attempted_at=datetime(*day, tzinfo=timezone.utc) if day else None,
+        )
+        question.tags.set([tags[name] for name in tag_names])
+        created[title] = question
+    return created
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("difficulty=Easy,Hard", {"Easy DP", "Hard Both"}),
+        ("difficulty=Easy&difficulty=Medium", {"Easy DP", "Medium Graph", "Untouched"}),
+        ("source=LeetCode", {"Easy DP", "Medium Graph"}),
+        ("is_active=false", {"Hard Both"}),
+        ("attempts_count_min=3", {"Easy DP", "Medium Graph"}),
+        ("solved_count_max=1", {"Medium Graph", "Hard Both", "Untouched"}),
+        ("last_attempted_at_after=2025-06-15T00:00:00Z", {"Easy DP", "Medium Graph"}),
+        ("last_attempted_at_before=2025-06-15T00:00:00Z", {"Hard Both"}),
+        ("difficulty=Medium&attempts_count_min=1", {"Medium Graph"}),
+    ],
+    ids=[
+        "difficulty comma list",
+        "difficulty repeated params",
+        "source exact match",
+        "inactive only",
+        "attempts lower bound",
+        "solved upper bound",
+        "attempted after",
+        "attempted before",
+        "combined filters",
+    ],
+)
+def test_question_filters(client, questions, query, expected):
+    assert set(_titles(client, query)) == expected
+
+
+@pytest.mark.django_db
+def test_tag_filters_any_and_all(client, questions, tags):
+    dp, graph = tags["dp"].id, tags["graph"].id
+    any_titles = _titles(client, f"tags={dp},{graph}")
+    assert sorted(any_titles) == ["Easy DP", "Hard Both", "Medium Graph"]
+    assert _titles(client, f"tags={dp},{graph}&tags_match=all") == ["Hard Both"]
+
+
+@pytest.mark.django_db
+def test_solve_ratio_ordering(client, questions):
+    assert _titles(client, "ordering=-solve_ratio") == [
+        "Easy DP",
+        "Hard Both",
+        "Medium Graph",
+        "Untouched",
+    ]
+
+
+@pytest.mark.django_db
+def test_solve_ratio_ordering_paginates(client, questions):
+    url = "/api/questions/?ordering=-solve_ratio&page_size=1"
+    titles = []
+    while url:
+        body = client.get(url).json()
+        titles.extend(q["title"] for q in body["results"])
+        url = body["next"]
+    assert titles == ["Easy DP", "Hard Both", "Medium Graph", "Untouched"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    ["difficulty=Impossible", "attempts_count_min=abc", "tags_match=some"],
+    ids=["bad difficulty", "non-numeric range", "bad tags_match"],
+)
+def test_invalid_filters_return_400(client, questions, query):
+    assert client.get(f"/api/questions/?{query}").status_code == 400
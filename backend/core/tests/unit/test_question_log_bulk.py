@@ -0,0 +1,105 @@
+"""
+Tests for bulk QuestionLog ingestion, POST /api/logs/bulk/.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.models import Question, QuestionLog
+
+URL = "/api/logs/bulk/"
+
+
+def _post(client, payload):
+    return client.post(URL, data=json.dumps(payload), content_type="application/json")
+
+
+@pytest.fixture()
+def questions(user):
+    return [Question.objects.create(title=f"Log bulk {i}", user=user) for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_bulk_logs_recompute_aggregates_per_question(client, questions):
+    first, second, untouched = questions
+    logs = [
+        {"question": first.id, "outcome": "Solved", "date_attempted": f"2025-07-0{d}"}
+        for d in (1, 3)
+    ] + [
+        {"question": first.id, "outcome": "Failed", "date_attempted": "2025-07-02"},
+        {"question": second.id, "outcome": "Partial"},
+    ]
+    response = _post(client, {"logs": logs})
+    assert response.status_code == 201, response.content
+    assert response.json()["created"] == 4
+    assert len(response.json()["ids"]) == 4
+
+    for question in questions:
+        question.refresh_from_db()
+    assert (first.attempts_count, first.solved_count) == (3, 2)
+    assert first.last_attempted_at == datetime(2025, 7, 3, tzinfo=timezone.utc)
+    assert (second.attempts_count, second.solved_count) == (1, 0)
+    assert second.last_attempted_at is None
+    assert untouched.attempts_count == 0
+
+
+@pytest.mark.django_db
+def test_bulk_logs_report_per_item_errors_and_write_nothing(
+    client, questions, django_user_model
+):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    foreign = Question.objects.create(title="Foreign", user=other)
+    logs = [
+        {"question": questions[0].id},
+        {"question": foreign.id},
+        {"question": questions[1].id, "outcome": "Maybe"},
+        {},
+    ]
+    response = _post(client, {"logs": logs})
+    assert response.status_code == 400
+    assert [e["index"] for e in response.json()["errors"]] == [1, 2, 3]
+    assert not QuestionLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_logs_reject_malformed_question_ids_per_item(client, questions):
+    logs = [{"question": [questions[0].id]}, {"question": {"id": questions[0].id}}]
+    response = _post(client, {"logs": logs})
+    assert response.status_code == 400
+    assert [e["index"] for e in response.json()["errors"]] == [0, 1]
+    assert not QuestionLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_logs_accept_numeric_string_question_ids(client, questions):
+    response = _post(client, {"logs": [{"question": str(questions[0].id)}]})
+    assert response.status_code == 201, response.content
+    assert QuestionLog.objects.get().question_id == questions[0].id
+
+
+@pytest.mark.django_db
+def test_bulk_logs_query_count_is_constant(client, questions):
+    def count(n):
+        logs = [{"question": questions[i % 2].id} for i in range(n)]
+        with CaptureQueriesContext(connection) as ctx:
+            assert _post(client, {"logs": logs}).status_code == 201
+        return len(ctx.captured_queries)
+
+    count(1)  # warm the cached session user
+    assert count(60) == count(6)
+
+
+@pytest.mark.django_db
+def test_single_log_writes_still_update_aggregates(
+    client, questions, django_capture_on_commit_callbacks
+):
+    question = questions[0]
+    _post(client, {"logs": [{"question": question.id, "outcome": "Solved"}]})
+    with django_capture_on_commit_callbacks(execute=True):
+        QuestionLog.objects.create(question=question, user=question.user)
+    question.refresh_from_db()
+    assert (question.attempts_count, question.solved_count) == (2, 1)
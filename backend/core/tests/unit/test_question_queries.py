@@ -0,0 +1,113 @@
+"""
+Query-count tests for the question read paths.
+
+The list and retrieve endpoints must issue a constant number of queries no
+matter how many questions or tags a user has.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from backend.core.models import Question, Tag
+from backend.core.views.question import (
+    QuestionListCreateView,
+    QuestionRetrieveUpdateDestroyView,
+)
+
+
+def _create_questions(user, count, tags):
+    questions = []
+    for i in range(count):
+        question = Question.objects.create(title=f"Question {i}", user=user)
+        question.tags.set(tags)
+        questions.append(question)
+    return questions
+
+
+def _warm_user_cache(client):
+    """Resolve the session user once, so every count sees a cached user"""
+    client.get("/api/accounts/identity/")
+
+
+def _count_queries(func):
+    with CaptureQueriesContext(connection) as ctx:
+        response = func()
+    assert response.status_code == 200
+    return len(ctx.captured_queries), response
+
+
+@pytest.fixture()
+def tags(user):
+    return [Tag.objects.create(name=f"tag-{i}", user=user) for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_question_list_query_count_is_constant(client, user, tags):
+    _create_questions(user, 2, tags)
+    _warm_user_cache(client)
+    small_count, _ = _count_queries(lambda: client.get("/api/questions/"))
+
+    _create_questions(user, 20, tags)
+    large_count, response = _count_queries(lambda: client.get("/api/questions/"))
+
+    assert large_count == small_count
+    assert len(response.json()) == 22
+    assert all(len(q["tags"]) == 3 for q in response.json())
+
+
+@pytest.mark.django_db
+def test_question_retrieve_query_count(client, user, tags):
+    (question,) = _create_questions(user, 1, tags)
+    url = f"/api/questions/{question.id}/"
+    _warm_user_cache(client)
+    baseline, _ = _count_queries(lambda: client.get(url))
+
+    question.tags.add(*[Tag.objects.create(name=f"x-{i}", user=user) for i in range(5)])
+    count, response = _count_queries(lambda: client.get(url))
+
+    assert count == baseline
+    assert len(response.json()["tags"]) == 8
+
+
+@pytest.mark.django_db
+def test_question_list_only_loads_rendered_columns(client, user, tags):
+    _create_questions(user, 1, tags)
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/api/questions/")
+    question_sql = next(
+        q["sql"] for q in ctx.captured_queries if 'FROM "core_question"' in q["sql"]
+    )
+    assert '"core_question"."solved_count"' not in question_sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "view_cls, kwargs_fn",
+    [
+        (QuestionListCreateView, lambda questions: {}),
+        (
+            QuestionRetrieveUpdateDestroyView,
+            lambda questions: {"pk": questions[0].pk},
+        ),
+    ],
+    ids=["generic list view", "generic detail view"],
+)
+def test_generic_question_views_query_count_is_constant(
+    user, tags, view_cls, kwargs_fn
+):
+    factory = APIRequestFactory()
+    view = view_cls.as_view()
+
+    def call(questions):
+        request = factory.get("/api/questions/")
+        force_authenticate(request, user=user)
+        return view(request, **kwargs_fn(questions))
+
+    questions = _create_questions(user, 2, tags)
+    small_count, _ = _count_queries(lambda: call(questions))
+    questions += _create_questions(user, 10, tags)
+    large_count, _ = _count_queries(lambda: call(questions))
+
+    assert large_count == small_count
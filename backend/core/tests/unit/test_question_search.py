@@ -0,0 +1,115 @@
+"""
+Tests for full-text question search (?q=) on both SQLite FTS5 and PostgreSQL.
+"""
+
+import pytest
+
+from backend.core.models import Question
+from backend.core.search import fts5_query
+
+
+def _search(client, query):
+    response = client.get(f"/api/questions/?q={query}")
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+@pytest.fixture()
+def questions(user):
+    return {
+        "title": Question.objects.create(
+            title="Binary tree traversal", content="Walk every node.", user=user
+        ),
+        "content": Question.objects.create(
+            title="Warmup",
+            content="Use a binary heap to merge the lists quickly.",
+            user=user,
+        ),
+        "source": Question.objects.create(
+            title="Two sum", source="Binary Interview Co", user=user
+        ),
+        "other": Question.objects.create(
+            title="Valid parentheses", content="Use a stack.", user=user
+        ),
+    }
+
+
+@pytest.mark.django_db
+def test_search_matches_title_content_and_source(client, questions):
+    titles = {q["title"] for q in _search(client, "binary")}
+    assert titles == {"Binary tree traversal", "Warmup", "Two sum"}
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(client, questions):
+    results = _search(client, "binary")
+    assert results[0]["title"] == "Binary tree traversal"
+    ranks = [q["search_rank"] for q in results]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+@pytest.mark.django_db
+def test_search_returns_highlighted_snippet(client, questions):
+    (result,) = _search(client, "heap")
+    assert "<mark>heap</mark>" in result["search_snippet"]
+
+
+@pytest.mark.django_db
+def test_search_stems_words(client, questions):
+    assert [q["title"] for q in _search(client, "merging")] == ["Warmup"]
+
+
+@pytest.mark.django_db
+def test_search_sees_updates_and_deletes(client, questions):
+    question = questions["other"]
+    question.title = "Balanced brackets"
+    question.save()
+    assert [q["title"] for q in _search(client, "brackets")] == ["Balanced brackets"]
+    question.delete()
+    assert _search(client, "brackets") == []
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_to_user(client, questions, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    Question.objects.create(title="Binary search", user=other)
+    assert "Binary search" not in {q["title"] for q in _search(client, "binary")}
+
+
+@pytest.mark.django_db
+def test_search_paginates_by_rank(client, questions):
+    expected = [q["id"] for q in _search(client, "binary")]
+    ids, url = [], "/api/questions/?q=binary&page_size=1"
+    while url:
+        body = client.get(url).json()
+        ids.extend(q["id"] for q in body["results"])
+        url = body["next"]
+    assert ids == expected
+
+
+@pytest.mark.django_db
+def test_search_combines_with_filters(client, questions):
+    questions["content"].difficulty = "Hard"
+    questions["content"].save()
+    results = _search(client, "binary&difficulty=Hard")
+    assert [q["title"] for q in results] == ["Warmup"]
+
+
+@pytest.mark.django_db
+def test_plain_list_has_no_search_fields(client, questions):
+    question = client.get("/api/questions/").json()[0]
+    assert "search_rank" not in question
+    assert "search_snippet" not in question
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("binary tree", '"binary" "tree"'),
+        ('NEAR(a b) OR "x', '"NEAR" "a" "b" "OR" "x"'),
+        ("***", ""),
+    ],
+    ids=["plain words", "operators are quoted", "no words"],
+)
+def test_fts5_query_quotes_user_input(text, expected):
+    assert fts5_query(text) == expected
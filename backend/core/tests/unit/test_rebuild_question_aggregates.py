@@ -0,0 +1,107 @@
+"""
+Tests for the rebuild_question_aggregates management command.
+"""
+
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from backend.core.models import Question, QuestionLog
+
+
+def _rebuild(*args):
+    out = StringIO()
+    call_command("rebuild_question_aggregates", *args, stdout=out)
+    return out.getvalue()
+
+
+def _aggregates(question):
+    question.refresh_from_db()
+    return (
+        question.attempts_count,
+        question.solved_count,
+        question.last_attempted_at,
+    )
+
+
+@pytest.fixture()
+def questions(user, django_capture_on_commit_callbacks):
+    questions = [Question.objects.create(title=f"Q{i}", user=user) for i in range(5)]
+    with django_capture_on_commit_callbacks(execute=True):
+        for i, question in enumerate(questions[:4]):
+            for day in range(1, i + 2):
+                QuestionLog.objects.create(
+                    question=question,
+                    user=user,
+                    outcome="Solved" if day % 2 else "Failed",
+                    date_attempted=datetime(2025, 7, day, tzinfo=timezone.utc),
+                )
+    return questions
+
+
+@pytest.fixture()
+def drifted(questions):
+    expected = [_aggregates(q) for q in questions]
+    Question.objects.filter(pk__in=[q.pk for q in questions[1:]]).update(
+        attempts_count=99, solved_count=42, last_attempted_at=None
+    )
+    return expected
+
+
+@pytest.mark.django_db
+def test_dry_run_reports_drift_without_writing(questions, drifted):
+    output = _rebuild("--dry-run", "--chunk-size", "2")
+    assert "4 questions have drifted aggregates" in output
+    assert f"question {questions[1].pk}: stored [99, 42, None]" in output
+    assert _aggregates(questions[1]) == (99, 42, None)
+
+
+@pytest.mark.django_db
+def test_rebuild_fixes_drift(questions, drifted):
+    output = _rebuild("--chunk-size", "2")
+    assert "4 questions updated in 3 chunks" in output
+    assert [_aggregates(q) for q in questions] == drifted
+    assert _aggregates(questions[4]) == (0, 0, None)
+    assert "0 questions have drifted" in _rebuild("--dry-run")
+
+
+@pytest.mark.django_db
+def test_rebuild_only_selected_users(questions, drifted, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    foreign = Question.objects.create(title="Foreign", user=other, attempts_count=7)
+    _rebuild("--user", other.username)
+    assert _aggregates(foreign) == (0, 0, None)
+    assert _aggregates(questions[1]) == (99, 42, None)
+
+
+@pytest.mark.django_db
+def test_rebuild_resumes_from_checkpoint(questions, drifted, user, tmp_path):
+    checkpoint = tmp_path / "rebuild.json"
+    first = (questions[0].pk, questions[1].pk)
+    checkpoint.write_text(
+        json.dumps({"users": None, "chunk_size": 2, "completed": [list(first)]})
+    )
+    output = _rebuild("--chunk-size", "2", "--checkpoint", str(checkpoint))
+    assert "Resuming: 1 of 3 chunks already done" in output
+    # The first chunk was recorded as done, so it was skipped
+    assert _aggregates(questions[1]) == (99, 42, None)
+    assert [_aggregates(q) for q in questions[2:]] == drifted[2:]
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_rejects_mismatched_checkpoint(questions, tmp_path):
+    checkpoint = tmp_path / "rebuild.json"
+    checkpoint.write_text(json.dumps({"users": None, "chunk_size": 5, "completed": []}))
+    with pytest.raises(CommandError):
+        _rebuild("--chunk-size", "2", "--checkpoint", str(checkpoint))
+
+
+@pytest.mark.django_db
+def test_sqlite_rebuilds_in_one_process(questions, drifted):
+    output = _rebuild("--chunk-size", "2", "--workers", "4")
+    assert "using a single worker" in output
+    assert [_aggregates(q) for q in questions] == drifted
@@ -0,0 +1,117 @@
+"""
+Tests for the versioned per-user response cache on the read endpoints.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.cache import cache_stats
+from backend.core.models import Question, QuestionLog, Tag
+
+
+def _core_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if '"core_' in q["sql"]]
+
+
+@pytest.fixture()
+def question(user):
+    return Question.objects.create(title="Cached", user=user)
+
+
+@pytest.fixture()
+def stats():
+    caches["responses"].stats.reset()
+    return lambda: cache_stats("responses")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/questions/",
+        "/api/questions/{question}/",
+        "/api/questions/{question}/logs/",
+        "/api/tags/",
+    ],
+)
+def test_repeated_reads_are_served_from_cache(client, question, stats, url):
+    url = url.format(question=question.id)
+    first = client.get(url)
+    assert first.status_code == 200
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(url)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second["Content-Type"] == first["Content-Type"]
+    assert second["ETag"] == first["ETag"]
+    assert _core_queries(ctx) == []
+    assert stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+@pytest.mark.django_db
+def test_query_params_are_part_of_the_key(client, user, stats):
+    Question.objects.create(title="Easy", difficulty="Easy", user=user)
+    Question.objects.create(title="Hard", difficulty="Hard", user=user)
+
+    easy = client.get("/api/questions/?difficulty=Easy&ordering=title").json()
+    hard = client.get("/api/questions/?difficulty=Hard&ordering=title").json()
+    assert [q["title"] for q in easy] == ["Easy"]
+    assert [q["title"] for q in hard] == ["Hard"]
+
+    # Same parameters in another order share the entry
+    client.get("/api/questions/?ordering=title&difficulty=Easy")
+    assert stats()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_cached_responses(
+    client, user, question, django_capture_on_commit_callbacks
+):
+    url = "/api/questions/"
+    assert client.get(url).json()[0]["attempts_count"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        QuestionLog.objects.create(question=question, user=user, outcome="Solved")
+    assert client.get(url).json()[0]["attempts_count"] == 1
+
+    tag = Tag.objects.create(name="fresh", user=user)
+    assert [t["name"] for t in client.get("/api/tags/").json()] == ["fresh"]
+
+    question.tags.add(tag)
+    assert [t["name"] for t in client.get(url).json()[0]["tags"]] == ["fresh"]
+
+
+@pytest.mark.django_db
+def test_cached_responses_are_per_user(client, question, django_user_model):
+    client.get("/api/questions/")
+    django_user_model.objects.create_user(username="other", password="pw")
+    client.login(username="other", password="pw")
+    assert client.get("/api/questions/").json() == []
+
+
+@pytest.mark.django_db
+def test_errors_are_not_cached(client, stats):
+    assert client.get("/api/questions/999999/").status_code == 404
+    assert client.get("/api/questions/999999/").status_code == 404
+    assert stats()["hits"] == 0
+
+
+@pytest.mark.django_db
+def test_cache_size_is_bounded(client, user, settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "responses": {
+            "BACKEND": "backend.core.cache.CountingLocMemCache",
+            "LOCATION": "responses-bounded",
+            "OPTIONS": {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 3},
+        },
+    }
+    caches["responses"].clear()
+    caches["responses"].stats.reset()
+    for difficulty in ("Easy", "Medium", "Hard", "Easy&ordering=title"):
+        client.get(f"/api/questions/?difficulty={difficulty}")
+    assert len(caches["responses"]._cache) <= 3
+    assert cache_stats("responses")["evictions"] == 1
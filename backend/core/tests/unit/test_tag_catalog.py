@@ -0,0 +1,89 @@
+"""
+Tests for the per-user tag catalog cache and the paths that use it.
+"""
+
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.core.models import Tag
+from backend.core.tag_catalog import get_tag_catalog
+
+
+def _post(client, url, payload):
+    return client.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+def _put(client, url, payload):
+    return client.put(url, data=json.dumps(payload), content_type="application/json")
+
+
+def _tag_lookups(ctx):
+    """Direct Tag reads, i.e. not a question's tags read through the join"""
+    return [
+        q["sql"]
+        for q in ctx.captured_queries
+        if 'FROM "core_tag"' in q["sql"] and "JOIN" not in q["sql"]
+    ]
+
+
+@pytest.fixture()
+def tags(user):
+    return [Tag.objects.create(name=f"catalog-{i}", user=user) for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_catalog_maps_ids_and_names(user, tags):
+    catalog = get_tag_catalog(user)
+    assert catalog.ids == {t.id for t in tags}
+    assert catalog.id_for("catalog-1") == tags[1].id
+    assert catalog.id_for("missing") is None
+
+
+@pytest.mark.django_db
+def test_warm_catalog_makes_no_tag_queries(client, user, tags):
+    get_tag_catalog(user)
+    with CaptureQueriesContext(connection) as ctx:
+        question = _post(
+            client, "/api/questions/", {"title": "Q", "tag_ids": [tags[0].id]}
+        )
+        duplicate = _post(client, "/api/tags/", {"name": "catalog-2"})
+        rename = _put(client, f"/api/tags/{tags[0].id}/", {"name": "catalog-1"})
+    assert question.status_code == 201, question.content
+    assert duplicate.status_code == 400
+    assert duplicate.json() == {"error": "Tag with this name already exists."}
+    assert rename.status_code == 400
+    assert _tag_lookups(ctx) == []
+
+
+@pytest.mark.django_db
+def test_tag_writes_invalidate_catalog(client, user, tags):
+    assert get_tag_catalog(user).id_for("fresh") is None
+    created = _post(client, "/api/tags/", {"name": "fresh"}).json()
+    assert get_tag_catalog(user).id_for("fresh") == created["id"]
+
+    response = _post(
+        client, "/api/questions/", {"title": "Q", "tag_ids": [created["id"]]}
+    )
+    assert response.status_code == 201
+
+    tags[0].delete()
+    response = _post(client, "/api/questions/", {"title": "Q", "tag_ids": [tags[0].id]})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_rename_to_own_name_is_allowed(client, tags):
+    response = _put(client, f"/api/tags/{tags[0].id}/", {"name": "catalog-0"})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_name_taken_by_another_user_is_rejected(client, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="pw")
+    Tag.objects.create(name="shared", user=other)
+    response = _post(client, "/api/tags/", {"name": "shared"})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Tag with this name already exists."}
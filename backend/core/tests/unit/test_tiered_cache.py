@@ -0,0 +1,193 @@
+"""
+Tests for the two-tier (per-worker L1 + shared L2) cache backend.
+
+Workers are simulated with backend instances that each get their own L1.
+The shared tier is a file-based cache; set ``TEST_REDIS_URL`` to run the
+same tests against Redis.
+"""
+
+import os
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from backend.core import cache as cache_module
+from backend.core.cache import TieredCache, check_shared_cache
+
+REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+@pytest.fixture(params=["file", "redis"])
+def shared(request, tmp_path):
+    if request.param == "redis":
+        if not REDIS_URL:
+            pytest.skip("TEST_REDIS_URL is not set")
+        backend = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    else:
+        backend = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "shared"),
+        }
+    with override_settings(CACHES={"default": backend, "tiered-test": backend}):
+        caches["tiered-test"].clear()
+        yield "tiered-test"
+        caches["tiered-test"].clear()
+
+
+@pytest.fixture()
+def worker(shared, monkeypatch):
+    """Build a backend with an L1 of its own, as in a separate process"""
+
+    def build(**options):
+        monkeypatch.setattr(cache_module, "_tiers", {})
+        options.setdefault("SYNC_INTERVAL", 0)
+        backend = TieredCache(shared, {"OPTIONS": options})
+        backend.stats.reset()
+        return backend
+
+    return build
+
+
+def test_reads_are_served_from_l1(worker):
+    cache = worker()
+    cache.set("key", {"a": 1})
+    caches["tiered-test"].set("key", "changed behind our back")
+    assert cache.get("key") == {"a": 1}
+    assert cache.stats.snapshot()["hits"] == 1
+
+
+def test_workers_share_l2(worker):
+    first, second = worker(), worker()
+    first.set("session", {"user": 1})
+    assert second.get("session") == {"user": 1}
+    assert second.stats.snapshot()["l2_hits"] == 1
+    assert second.get("missing", "default") == "default"
+
+
+def test_writes_invalidate_other_workers_l1(worker):
+    first, second = worker(), worker()
+    first.set("key", "old")
+    assert second.get("key") == "old"
+
+    first.set("key", "new")
+    assert second.get("key") == "new"
+
+    first.delete("key")
+    assert second.get("key") is None
+    assert second.stats.snapshot()["invalidations"] == 2
+
+
+def test_incr_and_add_go_through_l2(worker):
+    first, second = worker(), worker()
+    assert first.add("counter", 1)
+    assert not second.add("counter", 5)
+    assert second.get("counter") == 1
+    assert first.incr("counter") == 2
+    assert second.get("counter") == 2
+
+
+def test_sync_interval_bounds_replays(worker, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    first, second = worker(), worker(SYNC_INTERVAL=10)
+    first.set("key", "old")
+    assert second.get("key") == "old"
+
+    first.set("key", "new")
+    assert second.get("key") == "old"
+    now[0] += 10
+    assert second.get("key") == "new"
+
+
+def test_l1_entries_expire(worker, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = worker(L1_TIMEOUT=5)
+    cache.set("key", "cached")
+    caches["tiered-test"].set("key", "changed behind our back")
+    now[0] += 5
+    assert cache.get("key") == "changed behind our back"
+
+
+def test_l1_evicts_least_recently_used(worker):
+    cache = worker(MAX_ENTRIES=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert set(cache._tier.entries) == {cache.make_key("a"), cache.make_key("c")}
+    assert cache.stats.snapshot()["evictions"] == 1
+    # Evicted from L1 only
+    assert cache.get("b") == 2
+
+
+def test_values_read_are_copies(worker):
+    cache = worker()
+    cache.set("session", {"user": 1})
+    cache.get("session")["user"] = 2
+    assert cache.get("session") == {"user": 1}
+
+
+def test_clear_resets_other_workers(worker):
+    first, second = worker(), worker()
+    first.set("key", "value")
+    assert second.get("key") == "value"
+    first.clear()
+    assert second.get("key") is None
+
+
+def test_invalidation_log_is_a_bounded_ring(worker, monkeypatch):
+    monkeypatch.setattr(TieredCache, "LOG_SIZE", 4)
+    monkeypatch.setattr(TieredCache, "MAX_REPLAY", 4)
+    first, second = worker(), worker()
+    for key in "abcdef":
+        first.set(key, 1)
+        second.get(key)
+
+    for key in "abc":
+        first.set(key, 2)
+    assert second.get("d") == 1
+    assert second.stats.snapshot()["invalidations"] == 3
+
+    # Five writes overflow the four slots: the L1 (d, e, f) is dropped
+    for key in "abcde":
+        first.set(key, 3)
+    assert second.get("f") == 1
+    assert second.stats.snapshot()["invalidations"] == 6
+    assert [second.get(key) for key in "abcde"] == [3] * 5
+
+    log = caches["tiered-test"].get_many([f"tiered-cache:log:{i}" for i in range(20)])
+    assert set(log) == {f"tiered-cache:log:{i}" for i in range(4)}
+
+
+def test_l1_keeps_entries_no_longer_than_l2(worker, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    first, second = worker(L1_TIMEOUT=5), worker(L1_TIMEOUT=5)
+    first.set("key", "short-lived", timeout=2)
+    assert second.get("key") == "short-lived"
+    _, expires = second._tier.entries[second.make_key("key")]
+    assert expires <= now[0] + 2
+
+
+def test_file_based_l2_is_reported(tmp_path, settings):
+    settings.DEBUG = False
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        },
+        "tiered": {"BACKEND": "backend.core.cache.TieredCache", "LOCATION": "shared"},
+    }
+    assert [message.id for message in check_shared_cache()] == ["core.W001"]
+
+
+@pytest.mark.django_db
+def test_sessions_use_the_tiered_cache(client):
+    assert isinstance(caches["default"], TieredCache)
+    assert client.get("/api/questions/").status_code == 200
@@ -1,9 +1,13 @@
 # flake8: noqa
 import json
+from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from backend.core.utils import sanitize_html
+from backend.core.models import Question
+from backend.core.utils import SlugGenerator, sanitize_html
 
 
 @pytest.mark.django_db
@@ -36,6 +40,72 @@ def test_question_api_slug_handling(client, payload, expected_status, slug_check
         assert slug_check in data["slug"]
 
 
+@pytest.mark.django_db
+class TestGenerateUniqueSlugs:
+    """Test cases for batch slug allocation"""
+
+    def test_generates_one_slug_per_title(self):
+        slugs = SlugGenerator.generate_unique_slugs(
+            Question, ["Two Sum", "", "Two Sum"]
+        )
+        assert len(set(slugs)) == 3
+        assert slugs[0].startswith("two-sum-")
+        assert slugs[1].startswith("untitled-")
+
+    def test_retries_only_colliding_candidates(self, user):
+        Question.objects.create(title="Taken", slug="taken-aaaa", user=user)
+        candidates = iter(
+            [("taken-aaaa", "aaaa"), ("free-bbbb", "bbbb"), ("taken-cccc", "cccc")]
+        )
+        with patch.object(
+            SlugGenerator,
+            "generate_slug_candidate",
+            side_effect=lambda base: next(candidates),
+        ):
+            slugs = SlugGenerator.generate_unique_slugs(Question, ["Taken", "Free"])
+        assert slugs == ["taken-cccc", "free-bbbb"]
+
+    def test_long_titles_fit_the_slug_field(self):
+        (slug,) = SlugGenerator.generate_unique_slugs(Question, ["x" * 255])
+        assert len(slug) <= Question._meta.get_field("slug").max_length
+
+
+@pytest.mark.django_db
+class TestOptimisticSlugAllocation:
+    """Test cases for slug allocation that relies on the unique index"""
+
+    def test_create_does_not_check_slug_first(self, user):
+        with CaptureQueriesContext(connection) as ctx:
+            question = Question.objects.create(title="Two Sum", user=user)
+        assert question.slug.startswith("two-sum-")
+        assert not [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+
+    def test_create_retries_colliding_slug(self, user):
+        Question.objects.create(title="Taken", slug="taken-aaaa", user=user)
+        candidates = iter([("taken-aaaa", "aaaa"), ("taken-bbbb", "bbbb")])
+        with patch.object(
+            SlugGenerator,
+            "generate_slug_candidate",
+            side_effect=lambda base: next(candidates),
+        ):
+            question = Question.objects.create(title="Taken", user=user)
+        assert question.slug == "taken-bbbb"
+        assert Question.objects.filter(user=user).count() == 2
+
+    def test_bulk_create_retries_only_colliding_slugs(self, user):
+        Question.objects.create(title="Taken", slug="taken-aaaa", user=user)
+        objs = [
+            Question(title="Taken", slug="taken-aaaa", user=user),
+            Question(title="Free", slug="free-bbbb", user=user),
+        ]
+        created = SlugGenerator.bulk_create_with_unique_slugs(
+            Question, objs, ["Taken", "Free"]
+        )
+        assert created[0].slug.startswith("taken-") and created[0].slug != "taken-aaaa"
+        assert created[1].slug == "free-bbbb"
+        assert Question.objects.filter(user=user).count() == 3
+
+
 class TestSanitizeHtml:
     """Test cases for the sanitize_html utility function"""
 
@@ -1,9 +1,14 @@
-from django.urls import path
+from django.urls import path, re_path
 from rest_framework.routers import DefaultRouter
 
+from .views.export import ExportView
+from .views.file_import import FileImportView
 from .views.health import health
+from .views.import_job import ImportJobCreateView, ImportJobDetailView
+from .views.metrics import metrics
 from .views.question import QuestionViewSet
 from .views.question_log import (
+    QuestionLogBulkCreateView,
     QuestionLogListCreateView,
     QuestionLogRetrieveUpdateDestroyView,
 )
@@ -14,6 +19,7 @@ router.register(r"questions", QuestionViewSet, basename="question")
 
 urlpatterns = [
     path("health/", health, name="health"),
+    path("metrics/", metrics, name="metrics"),
     path(
         "questions/<int:question_id>/logs/",
         QuestionLogListCreateView.as_view(),
@@ -24,6 +30,31 @@ urlpatterns = [
         QuestionLogRetrieveUpdateDestroyView.as_view(),
         name="questionlog-detail",
     ),
+    path(
+        "logs/bulk/",
+        QuestionLogBulkCreateView.as_view(),
+        name="questionlog-bulk-create",
+    ),
+    re_path(
+        r"^export/(?P<kind>questions|tags|logs)\.(?P<fmt>csv|ndjson)$",
+        ExportView.as_view(),
+        name="export",
+    ),
+    re_path(
+        r"^import/(?P<kind>questions|logs)\.(?P<fmt>csv|ndjson)$",
+        FileImportView.as_view(),
+        name="file-import",
+    ),
+    path(
+        "import/jobs/<int:pk>/",
+        ImportJobDetailView.as_view(),
+        name="import-job-detail",
+    ),
+    path(
+        "import/<slug:platform>/",
+        ImportJobCreateView.as_view(),
+        name="import-job-create",
+    ),
     path("tags/", TagListCreateView.as_view(), name="tag-list-create"),
     path("tags/<int:pk>/", TagRetrieveUpdateDestroyView.as_view(), name="tag-detail"),
 ]
@@ -1,9 +1,9 @@
 import re
 import secrets
-from typing import Optional, Type
+from typing import Callable, Dict, List, Optional, Sequence, Type
 
 import nh3
-from django.db import models
+from django.db import IntegrityError, connections, models, router, transaction
 from django.utils.text import slugify
 
 
@@ -43,11 +43,18 @@ class SlugGenerator:
 
     This class provides methods to generate URL-friendly slugs from titles
     and ensure uniqueness within a given model class.
+
+    Slugs carry a random suffix, so collisions are rare. Instead of checking
+    for a free slug before every insert, ``save_with_unique_slug`` and
+    ``bulk_create_with_unique_slugs`` write optimistically and lean on the
+    unique index, only retrying the rows that actually collided.
     """
 
     # Use a more secure random source instead of time-based hashing
     _HASH_LENGTH = 8
     _MAX_RETRIES = 100  # Prevent infinite loops
+    # Leave room for the hash suffix and counter within SlugField(max_length=255)
+    _MAX_BASE_LENGTH = 200
 
     @staticmethod
     def generate_slug_candidate(base_slug: str) -> tuple[str, str]:
@@ -101,6 +108,157 @@ class SlugGenerator:
             f"{SlugGenerator._MAX_RETRIES} attempts"
         )
 
+    @staticmethod
+    def base_slug(title: Optional[str]) -> str:
+        """
+        Slugify a title, falling back to "untitled" for empty results.
+
+        Args:
+            title: The title to convert to a slug
+
+        Returns:
+            The base slug
+        """
+        base_slug = slugify(title or "")[: SlugGenerator._MAX_BASE_LENGTH]
+        return base_slug.strip("-") or "untitled"
+
+    @classmethod
+    def generate_unique_slugs(
+        cls, model_class: Type[models.Model], titles: List[str]
+    ) -> List[str]:
+        """
+        Generate unique slugs for many titles, checking collisions in batches.
+
+        Each round issues a single ``slug__in`` query and only regenerates the
+        candidates that collided (with the database or within the batch).
+
+        Args:
+            model_class: The Django model class to check against
+            titles: The titles to convert to slugs
+
+        Returns:
+            A list of unique slugs, in the same order as ``titles``
+
+        Raises:
+            RuntimeError: If unable to generate unique slugs after max retries
+        """
+        bases = [cls.base_slug(title) for title in titles]
+        slugs: Dict[int, str] = {}
+        pending = list(range(len(titles)))
+
+        for _ in range(cls._MAX_RETRIES):
+            if not pending:
+                break
+            candidates = {i: cls.generate_slug_candidate(bases[i])[0] for i in pending}
+            taken = set(
+                model_class.objects.filter(slug__in=candidates.values()).values_list(
+                    "slug", flat=True
+                )
+            )
+            taken.update(slugs.values())
+            pending = []
+            for i, candidate in candidates.items():
+                if candidate in taken:
+                    pending.append(i)
+                else:
+                    slugs[i] = candidate
+                    taken.add(candidate)
+
+        if pending:
+            raise RuntimeError(
+                "Unable to generate unique slugs after "
+                f"{SlugGenerator._MAX_RETRIES} attempts"
+            )
+        return [slugs[i] for i in range(len(titles))]
+
+    @classmethod
+    def save_with_unique_slug(
+        cls, instance: models.Model, title: Optional[str], save: Callable[[], None]
+    ) -> None:
+        """
+        Give ``instance`` a random slug and ``save()`` it, retrying with a new
+        slug if the insert hits the unique index.
+
+        Outside a transaction the insert is the only query. Inside one, each
+        attempt runs in a savepoint so a collision doesn't abort the
+        transaction.
+
+        Args:
+            instance: The unsaved model instance
+            title: The title to convert to a slug
+            save: Performs the actual insert
+
+        Raises:
+            RuntimeError: If unable to generate unique slug after max retries
+        """
+        model_class = type(instance)
+        using = router.db_for_write(model_class, instance=instance)
+        base_slug = cls.base_slug(title)
+        for _ in range(cls._MAX_RETRIES):
+            instance.slug = cls.generate_slug_candidate(base_slug)[0]
+            try:
+                if connections[using].in_atomic_block:
+                    with transaction.atomic(using=using):
+                        save()
+                else:
+                    save()
+                return
+            except IntegrityError:
+                if not cls._slugs_taken(model_class, [instance.slug], using):
+                    raise
+        instance.slug = ""
+        raise RuntimeError(
+            "Unable to generate unique slug after "
+            f"{SlugGenerator._MAX_RETRIES} attempts"
+        )
+
+    @classmethod
+    def bulk_create_with_unique_slugs(
+        cls,
+        model_class: Type[models.Model],
+        objs: Sequence[models.Model],
+        titles: Sequence[Optional[str]],
+    ) -> List[models.Model]:
+        """
+        ``bulk_create`` objects whose slugs came from ``generate_unique_slugs``.
+
+        If another writer took one of the slugs in the meantime, the insert is
+        rolled back to a savepoint, only the colliding objects get new slugs
+        (one ``slug__in`` query), and the insert is retried.
+
+        Raises:
+            RuntimeError: If unable to generate unique slugs after max retries
+        """
+        using = router.db_for_write(model_class)
+        for _ in range(cls._MAX_RETRIES):
+            try:
+                with transaction.atomic(using=using):
+                    return model_class.objects.using(using).bulk_create(objs)
+            except IntegrityError:
+                taken = cls._slugs_taken(model_class, [o.slug for o in objs], using)
+                if not taken:
+                    raise
+                colliding = [i for i, obj in enumerate(objs) if obj.slug in taken]
+                new_slugs = cls.generate_unique_slugs(
+                    model_class, [titles[i] for i in colliding]
+                )
+                for i, slug in zip(colliding, new_slugs):
+                    objs[i].slug = slug
+        raise RuntimeError(
+            "Unable to generate unique slugs after "
+            f"{SlugGenerator._MAX_RETRIES} attempts"
+        )
+
+    @staticmethod
+    def _slugs_taken(
+        model_class: Type[models.Model], slugs: List[str], using: str
+    ) -> set:
+        return set(
+            model_class.objects.using(using)
+            .filter(slug__in=slugs)
+            .values_list("slug", flat=True)
+        )
+
     @classmethod
     def generate_unique_slug(cls, model_class: Type[models.Model], title: str) -> str:
         """
@@ -113,13 +271,7 @@ class SlugGenerator:
         Returns:
             A unique slug
         """
-        if not title:
-            title = "untitled"
-
-        base_slug = slugify(title)
-        if not base_slug:
-            base_slug = "untitled"
-
+        base_slug = cls.base_slug(title)
         slug_candidate, hash_suffix = cls.generate_slug_candidate(base_slug)
         return cls.ensure_unique_slug(
             model_class, slug_candidate, base_slug, hash_suffix
@@ -0,0 +1,89 @@
+"""
+Cache-backed version counters.
+
+A version is a nanosecond timestamp kept in the Django cache. Readers use it
+to key (or validate) data derived from the database, and writers bump it
+whenever that data changes. Because a missing counter restarts at the
+current time, never at an old value, an evicted counter can't bring back
+data cached under an earlier version.
+
+``user_data_version`` changes whenever any of a user's questions, logs or
+tags change. It drives the ETag headers of the read endpoints.
+"""
+
+import threading
+import time
+import weakref
+from typing import Optional, Set
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key: str) -> int:
+    """Return the current version stored under ``key``, starting it if unset."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key: str) -> None:
+    """
+    Move ``key`` to a new version.
+
+    Inside a transaction the version is bumped again on commit, so nothing
+    read (and cached) before the commit can carry the final version.
+    """
+    _bump(key)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        _pending_bumps(connection.alias).keys.add(key)
+
+
+def _bump(key: str) -> None:
+    current = cache.get(key) or 0
+    cache.set(key, max(time.time_ns(), current + 1), timeout=None)
+
+
+class _PendingBumps:
+    """``on_commit`` callback bumping each key of a transaction once."""
+
+    def __init__(self):
+        self.keys: Set[str] = set()
+        self.applied = False
+
+    def __call__(self) -> None:
+        self.applied = True
+        for key in sorted(self.keys):
+            _bump(key)
+
+
+# The pending bumps of each connection (connections are per thread). Only the
+# registered on_commit callback holds them strongly: a savepoint rollback that
+# discards it drops only keys already bumped for writes that were undone.
+_pending = threading.local()
+
+
+def _pending_bumps(alias: str) -> _PendingBumps:
+    refs = _pending.__dict__.setdefault("refs", {})
+    pending = refs[alias]() if alias in refs else None
+    if pending is None or pending.applied:
+        pending = _PendingBumps()
+        transaction.on_commit(pending, using=alias)
+        refs[alias] = weakref.ref(pending)
+    return pending
+
+
+def _user_data_key(user_id: int) -> str:
+    return f"user-data-version:{user_id}"
+
+
+def user_data_version(user_id: int) -> int:
+    return get_version(_user_data_key(user_id))
+
+
+def bump_user_data_version(user_id: Optional[int]) -> None:
+    if user_id is not None:
+        bump_version(_user_data_key(user_id))
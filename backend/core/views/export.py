@@ -0,0 +1,59 @@
+import logging
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from ..export import FORMATS, export_stream
+from ..request_logging import log_request
+
+logger = logging.getLogger(__name__)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip, honouring q-values: a
+    coding with ``q=0`` is refused, and ``gzip`` itself overrides ``*``.
+    """
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class ExportView(APIView):
+    """
+    Stream all of the user's questions, tags or logs as CSV or NDJSON,
+    gzipped on the fly when the client accepts it.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is CSV/NDJSON whatever Accept says; errors are still JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, kind, fmt):
+        log_request(logger, request, "Export", kind)
+        stream = export_stream(request.user, kind, fmt)
+        gzipped = _accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        response = StreamingHttpResponse(
+            compress_sequence(stream) if gzipped else stream,
+            content_type=f"{FORMATS[fmt]}; charset=utf-8",
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
@@ -0,0 +1,38 @@
+import io
+import logging
+from dataclasses import asdict
+
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..file_import import import_file
+from ..request_logging import log_request
+
+logger = logging.getLogger(__name__)
+
+
+class FileImportView(APIView):
+    """
+    Import questions or logs from a CSV or NDJSON file, sent either as the
+    raw request body or as the ``file`` field of a multipart form.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, kind, fmt):
+        if request.content_type.startswith("multipart/form-data"):
+            stream = request.FILES.get("file")
+            if stream is None:
+                return Response({"file": ["No file was submitted."]}, status=400)
+        else:
+            # Read lazily; request.data would load the whole body
+            stream = request.stream or io.BytesIO()
+        result = import_file(
+            request.user, kind, fmt, stream, context={"request": request}
+        )
+        # Logged afterwards: the payload preview must not read the stream first
+        log_request(logger, request, "Import", kind)
+        if result.error_count:
+            logger.warning("Import of %s: %d rows rejected", kind, result.error_count)
+        return Response(asdict(result))
@@ -0,0 +1,52 @@
+import logging
+
+from django.urls import reverse
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..import_jobs import start_import_job
+from ..models import ImportJob
+from ..platforms import PLATFORMS
+from ..request_logging import log_request
+from ..serializers import ImportJobSerializer, ImportRequestSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobCreateView(APIView):
+    """
+    Start importing the user's history from a platform. The import runs in
+    the background; the response is the queued job, whose URL is in the
+    Location header.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, platform):
+        log_request(logger, request, "Import", platform)
+        if platform not in PLATFORMS:
+            return Response({"detail": f"Unknown platform: {platform}"}, status=404)
+        serializer = ImportRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+        job, created = start_import_job(
+            request.user, platform, serializer.validated_data["username"]
+        )
+        if not created:
+            logger.info("Import job %s already in progress", job.pk)
+        return Response(
+            ImportJobSerializer(job).data,
+            status=202,
+            headers={"Location": reverse("import-job-detail", args=[job.pk])},
+        )
+
+
+class ImportJobDetailView(generics.RetrieveAPIView):
+    """An import job of the user, with its progress counters."""
+
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
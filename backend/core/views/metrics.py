@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from ..metrics import render_metrics
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint; needs ``METRICS_TOKEN`` as a bearer if set,
+    and is hidden unless ``DEBUG`` when it isn't.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=403)
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,89 @@
+import hashlib
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import urlencode
+
+from ..versioning import user_data_version
+
+
+class ConditionalGetMixin:
+    """
+    Weak ETag support for list and detail reads.
+
+    The ETag comes from the user's data version, which every change to their
+    questions, logs or tags bumps, so a matching ``If-None-Match`` gets a 304
+    before any query or serializer runs. No ``Last-Modified`` is sent: it
+    only has one-second resolution, and a write within the same second would
+    then be answered with a stale 304.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        # Read the version first: a change made while the response is being
+        # built then yields a stale ETag rather than a stale 304 later on
+        version = user_data_version(request.user.pk)
+        etag = f'W/"{request.user.pk}-{version}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.versioned_response(
+                handler, version, request, *args, **kwargs
+            )
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            # Per-user data: browsers may keep it but must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def versioned_response(self, handler, version, request, *args, **kwargs):
+        """Build the full response for data at ``version``."""
+        return handler(request, *args, **kwargs)
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Serve repeated reads from a per-user response cache.
+
+    Rendered JSON bodies are stored in the ``RESPONSE_CACHE_ALIAS`` cache,
+    keyed by user, data version, URL and (sorted) query parameters. Writes
+    bump the version, so entries never need deleting: stale ones just stop
+    being looked up and age out, or get culled by the cache's size bound.
+    """
+
+    # Larger bodies (e.g. unpaginated dumps) aren't worth a cache slot
+    response_cache_max_bytes = 256 * 1024
+
+    def versioned_response(self, handler, version, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            # The browsable API embeds per-request details (CSRF token, forms)
+            return handler(request, *args, **kwargs)
+
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = self.response_cache_key(request, version)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(partial(self._store_response, cache, key))
+        return response
+
+    def response_cache_key(self, request, version):
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        url = request.build_absolute_uri(request.path)
+        digest = hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+        return f"response:{request.user.pk}:{version}:{digest}"
+
+    def _store_response(self, cache, key, response):
+        if len(response.content) <= self.response_cache_max_bytes:
+            cache.set(key, (response.content, response["Content-Type"]))
@@ -1,11 +1,20 @@
 import logging
 
+from django.db.models import Prefetch
 from rest_framework import generics, permissions, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from ..models import Question
-from ..serializers import QuestionSerializer
+from ..bulk import bulk_write_questions
+from ..filters import QuestionFilterBackend, QuestionOrderingFilter
+from ..models import Question, Tag
+from ..pagination import KeysetPagination
+from ..request_logging import log_request
+from ..serializers import QuestionBulkSerializer, QuestionSerializer, TagSerializer
+from .mixins import CachedResponseMixin, ConditionalGetMixin
+
+logger = logging.getLogger(__name__)
 
 
 class QuestionExceptionMixin:
@@ -13,22 +22,18 @@ class QuestionExceptionMixin:
     def handle_request_with_logging_dispatch(
         self, dispatch_func, request, *args, **kwargs
     ):
-        logger = logging.getLogger(__name__)
-        logger.info(f"Dispatching {request.method} {request.path} for Question")
-        logger.info(
-            f"Incoming payload: {request.body}"
-        )  # Log raw body instead of .data
+        log_request(logger, request, "Question")
         try:
             response = dispatch_func(request, *args, **kwargs)
         except ValidationError as exc:
-            logger.warning(f"Validation error during dispatch: {exc}")
+            logger.warning("Validation error during dispatch: %s", exc)
             response = Response(
                 exc.detail,
                 status=400,
                 headers={"Content-Type": "application/json"},
             )
         except Exception as exc:
-            logger.error(f"Unexpected error during dispatch: {exc}")
+            logger.error("Unexpected error during dispatch: %s", exc)
             response = Response(
                 {"error": str(exc)},
                 status=500,
@@ -36,50 +41,133 @@ class QuestionExceptionMixin:
             )
 
         valid_status = {
-            "POST": {201},
+            "POST": {200, 201},
             "PUT": {200, 202},
             "PATCH": {200, 202},
             "DELETE": {204, 200},
-            "GET": {200},
+            "GET": {200, 304},
         }.get(request.method, {200})
         if response.status_code not in valid_status:
-            response_data = getattr(response, "data", None)
-            logger.error(f"Error {request.method} {request.path}: {response_data}")
+            logger.error(
+                "Error %s %s: %s",
+                request.method,
+                request.path,
+                getattr(response, "data", None),
+            )
         return response
 
 
-class QuestionViewSet(QuestionExceptionMixin, viewsets.ModelViewSet):
+class QuestionQuerysetMixin:
+    """
+    Shared queryset for the question views.
+
+    Reads prefetch the nested tags in a single query and only load the
+    columns the serializer renders, so listing N questions costs a constant
+    number of queries. Writes get full instances so ``save()`` persists
+    every field.
+    """
+
+    # Columns rendered by QuestionSerializer, plus the user FK for ownership
+    read_columns = (
+        "id",
+        "user_id",
+        "title",
+        "slug",
+        "content",
+        "difficulty",
+        "source",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "last_attempted_at",
+        "attempts_count",
+    )
+
+    def get_queryset(self):  # type: ignore[override]
+        queryset = Question.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch(
+                "tags",
+                queryset=Tag.objects.only(*TagSerializer.Meta.fields),
+            )
+        )
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = queryset.only(*self.read_columns)
+        return queryset
+
+
+class QuestionViewSet(
+    QuestionExceptionMixin,
+    QuestionQuerysetMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
+    pagination_class = KeysetPagination
+    filter_backends = [QuestionFilterBackend, QuestionOrderingFilter]
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def dispatch(self, request, *args, **kwargs):
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Dispatch method called with request: {request}")
-        logger.debug(f"Request body: {request.body}")
-        logger.debug(f"Request data before dispatch: {getattr(request, 'data', None)}")
-
         # Use the mixin's logging/exception handling for dispatch
-        response = self.handle_request_with_logging_dispatch(
+        return self.handle_request_with_logging_dispatch(
             lambda req, *a, **kw: super(QuestionViewSet, self).dispatch(req, *a, **kw),
             request,
             *args,
             **kwargs,
         )
 
-        logger.debug(f"Request data after dispatch: {getattr(request, 'data', None)}")
-        return response
-
-    def get_queryset(self):  # type: ignore[override]
-        return Question.objects.filter(user=self.request.user)
-
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["post"], serializer_class=QuestionBulkSerializer)
+    def bulk(self, request):
+        """
+        Create, update and delete many questions in one transaction.
+
+        Body: ``{"create": [...], "update": [{"id": ..., ...}], "delete": [ids]}``.
+        If any item is invalid nothing is written and per-item errors are
+        returned as ``{"errors": [{"op", "index", "errors"}]}``.
+        """
+        envelope = QuestionBulkSerializer(data=request.data)
+        envelope.is_valid(raise_exception=True)
+        result = bulk_write_questions(
+            request.user,
+            **envelope.validated_data,
+            context=self.get_serializer_context(),
+        )
+        if result.errors:
+            return Response({"errors": result.errors}, status=400)
+
+        written = {
+            question.pk: question
+            for question in self.get_queryset().filter(
+                pk__in=[q.pk for q in result.created + result.updated]
+            )
+        }
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "created": QuestionSerializer(
+                    [written[q.pk] for q in result.created], many=True, context=context
+                ).data,
+                "updated": QuestionSerializer(
+                    [written[q.pk] for q in result.updated], many=True, context=context
+                ).data,
+                "deleted": result.deleted,
+            }
+        )
+
 
-class QuestionListCreateView(QuestionExceptionMixin, generics.ListCreateAPIView):
+class QuestionListCreateView(
+    QuestionExceptionMixin,
+    QuestionQuerysetMixin,
+    ConditionalGetMixin,
+    generics.ListCreateAPIView,
+):
+    pagination_class = KeysetPagination
+    filter_backends = [QuestionFilterBackend, QuestionOrderingFilter]
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -93,15 +181,15 @@ class QuestionListCreateView(QuestionExceptionMixin, generics.ListCreateAPIView)
             **kwargs,
         )
 
-    def get_queryset(self):  # type: ignore[override]
-        return Question.objects.filter(user=self.request.user)
-
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
 class QuestionRetrieveUpdateDestroyView(
-    QuestionExceptionMixin, generics.RetrieveUpdateDestroyAPIView
+    QuestionExceptionMixin,
+    QuestionQuerysetMixin,
+    ConditionalGetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
 ):
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -116,9 +204,6 @@ class QuestionRetrieveUpdateDestroyView(
             **kwargs,
         )
 
-    def get_queryset(self):  # type: ignore[override]
-        return Question.objects.filter(user=self.request.user)
-
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -4,29 +4,32 @@ from rest_framework import generics, permissions, viewsets
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from ..bulk import bulk_create_question_logs
 from ..models import QuestionLog
-from ..serializers import QuestionLogSerializer
+from ..pagination import KeysetPagination
+from ..request_logging import log_request
+from ..serializers import QuestionLogBulkSerializer, QuestionLogSerializer
+from .mixins import CachedResponseMixin, ConditionalGetMixin
 
 logger = logging.getLogger(__name__)
 
 
 class QuestionLogExceptionMixin:
     def handle_request_with_logging(self, action, request, *args, **kwargs):
-        logger.info(f"Entering the {action} method for QuestionLog")
-        logger.info(f"Incoming payload: {request.data}")
+        log_request(logger, request, "QuestionLog", action)
         try:
             super_method = getattr(super(), action)
             response = super_method(request, *args, **kwargs)
         except ValidationError as exc:
-            logger.warning(f"Validation error {action} QuestionLog: {exc}")
+            logger.warning("Validation error %s QuestionLog: %s", action, exc)
             return Response(exc.detail, status=400)
         except Exception as exc:
-            logger.error(f"Unexpected error {action} QuestionLog: {exc}")
+            logger.error("Unexpected error %s QuestionLog: %s", action, exc)
             return Response({"error": str(exc)}, status=500)
 
         expected_status = 201 if action == "create" else 200
         if response.status_code != expected_status:
-            logger.error(f"Error {action} QuestionLog: {response.data}")
+            logger.error("Error %s QuestionLog: %s", action, response.data)
         return response
 
 
@@ -41,7 +44,10 @@ class QuestionLogViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class QuestionLogListCreateView(QuestionLogExceptionMixin, generics.ListCreateAPIView):
+class QuestionLogListCreateView(
+    QuestionLogExceptionMixin, CachedResponseMixin, generics.ListCreateAPIView
+):
+    pagination_class = KeysetPagination
     serializer_class = QuestionLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -60,7 +66,9 @@ class QuestionLogListCreateView(QuestionLogExceptionMixin, generics.ListCreateAP
 
 
 class QuestionLogRetrieveUpdateDestroyView(
-    QuestionLogExceptionMixin, generics.RetrieveUpdateDestroyAPIView
+    QuestionLogExceptionMixin,
+    ConditionalGetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
 ):
     serializer_class = QuestionLogSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -78,3 +86,29 @@ class QuestionLogRetrieveUpdateDestroyView(
             logger.warning(f"Object not found for update: {exc}")
             return Response({"detail": "Not found."}, status=404)
         return self.handle_request_with_logging("update", request, *args, **kwargs)
+
+
+class QuestionLogBulkCreateView(generics.GenericAPIView):
+    """
+    Ingest many logs, across any of the user's questions, in one request.
+    Question aggregates are recomputed once per question touched.
+    """
+
+    serializer_class = QuestionLogBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        envelope = self.get_serializer(data=request.data)
+        envelope.is_valid(raise_exception=True)
+        result = bulk_create_question_logs(
+            request.user,
+            envelope.validated_data["logs"],
+            context=self.get_serializer_context(),
+        )
+        if result.errors:
+            logger.warning("Bulk log ingestion rejected: %d errors", len(result.errors))
+            return Response({"errors": result.errors}, status=400)
+        return Response(
+            {"created": len(result.created), "ids": [log.pk for log in result.created]},
+            status=201,
+        )
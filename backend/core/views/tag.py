@@ -1,35 +1,55 @@
 import logging
 
+from django.db import IntegrityError, transaction
 from rest_framework import generics, permissions
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from ..models import Tag
+from ..pagination import KeysetPagination
+from ..request_logging import log_request
 from ..serializers import TagSerializer
+from ..tag_catalog import get_tag_catalog
+from .mixins import CachedResponseMixin, ConditionalGetMixin
 
 logger = logging.getLogger(__name__)
 
+TAG_EXISTS = "Tag with this name already exists."
+
 
 class TagExceptionMixin:
     def handle_request_with_logging(self, action, request, *args, **kwargs):
-        logger.info(f"Entering the {action} method for Tag")
-        logger.info(f"Incoming payload: {request.data}")
+        log_request(logger, request, "Tag", action)
         try:
             super_method = getattr(super(), action)
             response = super_method(request, *args, **kwargs)
         except ValidationError as exc:
-            logger.warning(f"Validation error {action} Tag: {exc}")
+            logger.warning("Validation error %s Tag: %s", action, exc)
             return Response(exc.detail, status=400)
         except Exception as exc:
-            logger.error(f"Unexpected error {action} Tag: {exc}")
+            logger.error("Unexpected error %s Tag: %s", action, exc)
             return Response({"error": str(exc)}, status=500)
         expected_status = 201 if action == "create" else 200
         if response.status_code != expected_status:
-            logger.error(f"Error {action} Tag: {response.data}")
+            logger.error("Error %s Tag: %s", action, response.data)
         return response
 
+    def save_unique(self, serializer, **kwargs):
+        """
+        Save a tag, reporting a name taken by another user's tag (which the
+        owner's tag catalog can't see) as a validation error.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            raise ValidationError({"error": TAG_EXISTS})
+
 
-class TagListCreateView(TagExceptionMixin, generics.ListCreateAPIView):
+class TagListCreateView(
+    TagExceptionMixin, CachedResponseMixin, generics.ListCreateAPIView
+):
+    pagination_class = KeysetPagination
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -37,17 +57,17 @@ class TagListCreateView(TagExceptionMixin, generics.ListCreateAPIView):
         return Tag.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        self.save_unique(serializer, user=self.request.user)
 
     def create(self, request, *args, **kwargs):
         tag_name = request.data.get("name")
-        if Tag.objects.filter(name=tag_name).exists():
-            return Response({"error": "Tag with this name already exists."}, status=400)
+        if get_tag_catalog(request.user).id_for(tag_name) is not None:
+            return Response({"error": TAG_EXISTS}, status=400)
         return self.handle_request_with_logging("create", request, *args, **kwargs)
 
 
 class TagRetrieveUpdateDestroyView(
-    TagExceptionMixin, generics.RetrieveUpdateDestroyAPIView
+    TagExceptionMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -55,13 +75,12 @@ class TagRetrieveUpdateDestroyView(
     def get_queryset(self):  # type: ignore
         return Tag.objects.filter(user=self.request.user)
 
+    def perform_update(self, serializer):
+        self.save_unique(serializer)
+
     def update(self, request, *args, **kwargs):
         tag_name = request.data.get("name")
-        tag_id = self.kwargs.get("pk")
-        if (
-            Tag.objects.filter(name=tag_name, user=self.request.user)
-            .exclude(id=tag_id)
-            .exists()
-        ):
-            return Response({"error": "Tag with this name already exists."}, status=400)
+        existing_id = get_tag_catalog(request.user).id_for(tag_name)
+        if existing_id not in (None, self.kwargs.get("pk")):
+            return Response({"error": TAG_EXISTS}, status=400)
         return super().update(request, *args, **kwargs)
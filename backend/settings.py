@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv  # Added for python-dotenv
@@ -55,14 +56,20 @@ INSTALLED_APPS = [
 
 AUTH_USER_MODEL = "auth.User"
 
+# Session users are resolved from a cached snapshot (backend/accounts/backends.py)
+AUTHENTICATION_BACKENDS = ["backend.accounts.backends.CachedModelBackend"]
+
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # Added for CORS (must be first)
+    "backend.core.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Removes itself unless PROFILING_ENABLED
+    "backend.core.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -159,6 +166,46 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# On-demand request profiling (backend/core/profiling.py)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "False") == "True"
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(
+    tempfile.gettempdir(), "interview_q-profiles"
+)
+PROFILE_MAX_COUNT = int(os.environ.get("PROFILE_MAX_COUNT", "200"))
+
+# Bearer token required to scrape /api/metrics/. When empty the endpoint is
+# only served with DEBUG on, and answers 404 otherwise.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Fraction of API requests logged at INFO (errors are always logged), and how
+# much of each request body those records include
+REQUEST_LOG_SAMPLE_RATE = float(os.environ.get("REQUEST_LOG_SAMPLE_RATE", "0.1"))
+REQUEST_LOG_MAX_PAYLOAD = int(os.environ.get("REQUEST_LOG_MAX_PAYLOAD", "512"))
+
+# Queue of the platform import jobs (backend/core/import_jobs.py): "sqs"
+# (IMPORT_QUEUE_URL), "database" (run_import_worker) or "thread" (in process)
+IMPORT_QUEUE_URL = os.environ.get("IMPORT_QUEUE_URL", "")
+IMPORT_QUEUE_REGION = os.environ.get("IMPORT_QUEUE_REGION", "")
+IMPORT_QUEUE_BACKEND = os.environ.get("IMPORT_QUEUE_BACKEND") or (
+    "sqs" if IMPORT_QUEUE_URL else "thread" if DEBUG else "database"
+)
+# Seconds after which a running job is presumed dead and may run again
+IMPORT_JOB_TIMEOUT = int(os.environ.get("IMPORT_JOB_TIMEOUT", str(15 * 60)))
+IMPORT_JOB_MAX_ATTEMPTS = int(os.environ.get("IMPORT_JOB_MAX_ATTEMPTS", "3"))
+# Pages an import fetches at once, and where platform responses are cached
+# for conditional requests (backend/core/platforms/http.py); empty disables
+IMPORT_FETCH_WORKERS = int(os.environ.get("IMPORT_FETCH_WORKERS", "4"))
+IMPORT_HTTP_CACHE_DIR = os.environ.get(
+    "IMPORT_HTTP_CACHE_DIR", os.path.join(tempfile.gettempdir(), "interview_q-import")
+)
+# Seconds an unused cached response is kept, and the cache's size limit
+IMPORT_HTTP_CACHE_MAX_AGE = int(
+    os.environ.get("IMPORT_HTTP_CACHE_MAX_AGE", str(30 * 24 * 3600))
+)
+IMPORT_HTTP_CACHE_MAX_BYTES = int(
+    os.environ.get("IMPORT_HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -166,14 +213,19 @@ LOGGING = {
         "console": {
             "class": "logging.StreamHandler",
         },
+        # Writes to the console from a background thread
+        "queue": {
+            "()": "backend.core.request_logging.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console"],
+        },
     },
     "root": {
-        "handlers": ["console"],
+        "handlers": ["queue"],
         "level": "INFO",
     },
     "loggers": {
         "backend.core.views": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
@@ -215,15 +267,44 @@ SESSION_COOKIE_AGE = 60 * 60 * 24 * 14  # 2 weeks in seconds
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Do not expire session on browser close
 
 
-# Use Memcached for session and cache backend
+# Sessions live in the default cache: a per-worker L1 in front of a cache
+# shared by all workers (see backend.core.cache.TieredCache). Set
+# SHARED_CACHE_URL to redis://... in production; otherwise the shared tier is
+# a file-based cache, which only spans the workers of one host and can lose
+# invalidations between them (``manage.py check`` warns outside DEBUG).
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+SHARED_CACHE_URL = os.environ.get("SHARED_CACHE_URL", "")
+if SHARED_CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": SHARED_CACHE_URL,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": SHARED_CACHE_URL
+        or os.path.join(tempfile.gettempdir(), "interview_q-cache"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+        "BACKEND": "backend.core.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"MAX_ENTRIES": 1000, "L1_TIMEOUT": 5, "SYNC_INTERVAL": 0.5},
+    },
+    "shared": SHARED_CACHE,
+    # Rendered GET responses, kept apart so they can't cull sessions
+    "responses": {
+        "BACKEND": "backend.core.cache.CountingLocMemCache",
+        "LOCATION": "responses",
+        "TIMEOUT": 60 * 10,
+        "OPTIONS": {"MAX_ENTRIES": 2000, "CULL_FREQUENCY": 4},
+    },
 }
+RESPONSE_CACHE_ALIAS = "responses"
 
 
 # Temporary fix for HTTPS while /health endpoint is having issues
@@ -251,7 +332,7 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "backend.settings.CsrfExemptSessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
+        "backend.accounts.authentication.ApiTokenAuthentication",
     ],
 }
 
@@ -5,9 +5,11 @@ import time
 
 import pytest
 import requests
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.core.management import call_command
-from django.test import Client
+from django.test import Client, override_settings
 
 BASE_URL = "https://127.0.0.1:8000/api"
 
@@ -86,6 +88,24 @@ def logged_in_session(django_server_url, registered_user):
     return session, username
 
 
+@pytest.fixture(scope="session", autouse=True)
+def private_shared_cache(tmp_path_factory):
+    """Keep the shared cache away from the one a local dev server uses"""
+    shared = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path_factory.mktemp("shared-cache")),
+    }
+    with override_settings(CACHES={**settings.CACHES, "shared": shared}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start each test with empty caches; database IDs get reused"""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
 @pytest.fixture(scope="function")
 def reset_database():
     call_command("flush", verbosity=0, interactive=False)
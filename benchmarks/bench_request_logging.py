@@ -0,0 +1,100 @@
+"""
+Per-request logging overhead: old view logging vs. sampled queued logging.
+
+"before" replays what ``QuestionViewSet`` logged per request: two INFO
+f-strings (one with the full body) and four DEBUG f-strings built even with
+DEBUG off, written synchronously by a file handler. "after" calls
+``log_request`` through a ``QueueListenerHandler`` feeding the same kind of
+file handler, at the given sample rate.
+
+    DJANGO_DEBUG=True python benchmarks/bench_request_logging.py --requests 20000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from backend.core.request_logging import (  # noqa: E402
+    QueueListenerHandler,
+    log_request,
+)
+
+
+def _before(logger, request):
+    logger.debug(f"Dispatch method called with request: {request}")
+    logger.debug(f"Request body: {request.body}")
+    logger.debug(f"Request data before dispatch: {getattr(request, 'data', None)}")
+    logger.info(f"Dispatching {request.method} {request.path} for Question")
+    logger.info(f"Incoming payload: {request.body}")
+    logger.debug(f"Request data after dispatch: {getattr(request, 'data', None)}")
+
+
+def _after(logger, request):
+    log_request(logger, request, "Question")
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _run(name, log, logger, requests):
+    start = time.perf_counter()
+    for request in requests:
+        log(logger, request)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>18}: {elapsed / len(requests) * 1e6:7.1f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--payload", type=int, default=4096, help="body bytes")
+    args = parser.parse_args()
+
+    factory = RequestFactory()
+    body = b'{"title": "' + b"x" * args.payload + b'"}'
+
+    def requests():
+        return [
+            factory.post("/api/questions/", body, content_type="application/json")
+            for _ in range(args.requests)
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_file = logging.FileHandler(os.path.join(tmp, "before.log"))
+        _run("before", _before, _logger("before", sync_file), requests())
+        sync_file.close()
+
+        for rate in (1.0, 0.1):
+            queued = QueueListenerHandler(
+                [logging.FileHandler(os.path.join(tmp, f"after-{rate}.log"))]
+            )
+            with override_settings(REQUEST_LOG_SAMPLE_RATE=rate):
+                _run(
+                    f"after (rate {rate})",
+                    _after,
+                    _logger(f"after-{rate}", queued),
+                    requests(),
+                )
+            queued.close()
+
+
+if __name__ == "__main__":
+    main()
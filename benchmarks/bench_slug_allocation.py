@@ -0,0 +1,71 @@
+"""
+Question create throughput: check-then-insert slugs vs. optimistic inserts.
+
+"before" allocates the slug with ``SlugGenerator.generate_unique_slug`` (an
+``exists()`` query per candidate) and then inserts; "after" is the current
+``Question.save``, which inserts and only retries on a unique violation.
+
+Runs against a throwaway test database for the configured backend:
+
+    DJANGO_DEBUG=True python benchmarks/bench_slug_allocation.py --creates 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from backend.core.models import Question  # noqa: E402
+from backend.core.utils import SlugGenerator  # noqa: E402
+
+
+def _before(user, title):
+    slug = SlugGenerator.generate_unique_slug(Question, title)
+    Question.objects.create(title=title, slug=slug, user=user)
+
+
+def _after(user, title):
+    Question.objects.create(title=title, user=user)
+
+
+def _run(name, create, user, creates):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        for i in range(creates):
+            create(user, f"Benchmark question {i % 50}")
+        elapsed = time.perf_counter() - start
+    print(
+        f"{name:>7}: {creates / elapsed:8.0f} creates/s, "
+        f"{len(ctx.captured_queries) / creates:.2f} queries/create"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--creates", type=int, default=1000)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = get_user_model().objects.create_user(username="bench", password="x")
+        print(f"{args.creates} creates on {connection.vendor}")
+        _run("before", _before, user, args.creates)
+        _run("after", _after, user, args.creates)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
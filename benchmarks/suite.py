@@ -0,0 +1,365 @@
+"""
+Benchmark suite for the hot API paths, with JSON results and regression checks.
+
+Cases, each timed per operation at every data size:
+
+- ``question_list``: first keyset page (``page_size=50``) of the user's
+  questions, through the view (query, pagination, serialization, rendering)
+- ``question_detail``: one question by id, through the view
+- ``tag_validation``: ``QuestionSerializer`` validating ``tag_ids`` against
+  the (warm) tag catalog
+- ``sanitize_html``: ``sanitize_html`` on a 4 KB document
+- ``question_create``: POST of a question with content and three tags. Slugs
+  get a random suffix, so this is the optimistic insert; the retry after a
+  slug collision is not measured
+- ``log_create``: POST of a log, including the aggregate signal handler
+
+The data set is seeded into a throwaway test database for the configured
+backend (``DJANGO_DEBUG=True`` for SQLite, otherwise PostgreSQL from the
+``RDS_*`` settings). ``--sizes`` gives the number of questions, each with
+one log and two tags; sizes run in ascending order and each tops up the
+previous one. The response cache is bypassed so reads measure real work.
+
+    DJANGO_DEBUG=True python benchmarks/suite.py --sizes 1000,100000,1000000
+    python benchmarks/suite.py --sizes 1000 --baseline benchmarks/results/x.json
+
+Results are written as JSON (``--output``, by default under
+``benchmarks/results/``). With ``--baseline`` every case also present in the
+baseline file is compared: a median slower by more than ``--threshold``
+(a fraction, default 0.2) or any extra query per operation is a regression,
+and the script exits with status 1.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_test_environment,
+)
+from rest_framework.test import APIClient  # noqa: E402
+
+from backend.core.models import Question, QuestionLog, Tag  # noqa: E402
+from backend.core.serializers import QuestionSerializer  # noqa: E402
+from backend.core.signals import recompute_question_aggregates  # noqa: E402
+from backend.core.utils import sanitize_html  # noqa: E402
+
+DEFAULT_SIZES = "1000,100000,1000000"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+SEED_CHUNK = 5000
+TAG_COUNT = 20
+# Cases that take microseconds get this many times more iterations
+FAST_CASE_FACTOR = 10
+
+CONTENT = (
+    "<p>Given an array of <b>integers</b>, return the indices of two numbers"
+    " that add up to a target.</p>\\n\\n<pre><code>nums = [2, 7, 11, 15]</code>"
+    "</pre>\n\n\n<script>alert('x')</script><a href='#' onclick='x()'>hint</a>"
+)
+HTML_DOCUMENT = (CONTENT * (4096 // len(CONTENT) + 1))[:4096]
+
+
+class Dataset:
+    """The benchmark user's questions, tags and logs, grown one size at a time."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.user = get_user_model().objects.create_user(
+            username="bench", password="bench"
+        )
+        self.tag_ids = [
+            tag.pk
+            for tag in Tag.objects.bulk_create(
+                Tag(name=f"bench-tag-{i}", user=self.user) for i in range(TAG_COUNT)
+            )
+        ]
+        self.question_ids = []
+
+    @property
+    def size(self) -> int:
+        return len(self.question_ids)
+
+    def grow(self, size: int) -> None:
+        """Seed questions (with tags and logs) until there are ``size``."""
+        through = Question.tags.through
+        for start in range(self.size, size, SEED_CHUNK):
+            numbers = range(start, min(start + SEED_CHUNK, size))
+            questions = Question.objects.bulk_create(
+                Question(
+                    user=self.user,
+                    title=f"Benchmark question {n}",
+                    slug=f"benchmark-question-{n}",
+                    content=CONTENT,
+                    source="LeetCode",
+                    difficulty=("Easy", "Medium", "Hard")[n % 3],
+                )
+                for n in numbers
+            )
+            through.objects.bulk_create(
+                through(question_id=question.pk, tag_id=tag_id)
+                for question in questions
+                for tag_id in self.rng.sample(self.tag_ids, 2)
+            )
+            QuestionLog.objects.bulk_create(
+                QuestionLog(
+                    user=self.user,
+                    question=question,
+                    date_attempted=datetime.now(timezone.utc),
+                    time_spent_min=self.rng.randint(5, 60),
+                    outcome=self.rng.choice(("Solved", "Partial", "Failed")),
+                )
+                for question in questions
+            )
+            ids = [question.pk for question in questions]
+            recompute_question_aggregates(ids)
+            self.question_ids.extend(ids)
+
+
+def _cases(data: Dataset, client: APIClient):
+    """``(name, op, fast)`` for each case; ``op(i)`` runs one operation."""
+    rng = data.rng
+    request = SimpleNamespace(user=data.user)
+
+    def question_list(i):
+        response = client.get("/api/questions/", {"page_size": 50})
+        assert response.status_code == 200, response.status_code
+
+    def question_detail(i):
+        pk = rng.choice(data.question_ids)
+        response = client.get(f"/api/questions/{pk}/")
+        assert response.status_code == 200, response.status_code
+
+    def tag_validation(i):
+        serializer = QuestionSerializer(
+            data={"title": "Validated", "tag_ids": rng.sample(data.tag_ids, 3)},
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+
+    def sanitize(i):
+        sanitize_html(HTML_DOCUMENT)
+
+    def question_create(i):
+        response = client.post(
+            "/api/questions/",
+            {
+                "title": f"Benchmark question {i % 50}",
+                "content": CONTENT,
+                "difficulty": "Medium",
+                "tag_ids": rng.sample(data.tag_ids, 3),
+            },
+            format="json",
+        )
+        assert response.status_code == 201, response.status_code
+
+    def log_create(i):
+        pk = rng.choice(data.question_ids)
+        response = client.post(
+            f"/api/questions/{pk}/logs/",
+            {
+                "question": pk,
+                "date_attempted": datetime.now(timezone.utc).isoformat(),
+                "time_spent_min": 30,
+                "outcome": rng.choice(("Solved", "Failed")),
+            },
+            format="json",
+        )
+        assert response.status_code == 201, response.status_code
+
+    # Reads first, so the writes don't change what they read
+    return [
+        ("question_list", question_list, False),
+        ("question_detail", question_detail, False),
+        ("tag_validation", tag_validation, True),
+        ("sanitize_html", sanitize, True),
+        ("question_create", question_create, False),
+        ("log_create", log_create, False),
+    ]
+
+
+def _measure(op, iterations: int, warmup: int) -> dict:
+    for i in range(warmup):
+        op(i)
+    timings = []
+    for i in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        op(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    # Counted separately so capturing doesn't skew the timings
+    with CaptureQueriesContext(connection) as ctx:
+        op(warmup + iterations)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "queries": len(ctx.captured_queries),
+    }
+
+
+def run(sizes, iterations: int, warmup: int, seed: int) -> list:
+    rng = random.Random(seed)
+    random.seed(seed)
+    results = []
+    data = Dataset(rng)
+    client = APIClient()
+    client.force_authenticate(data.user)
+    for size in sizes:
+        start = time.perf_counter()
+        data.grow(size)
+        print(
+            f"{connection.vendor}, {size} rows "
+            f"(seeded in {time.perf_counter() - start:.1f}s)"
+        )
+        for name, op, fast in _cases(data, client):
+            n = iterations * FAST_CASE_FACTOR if fast else iterations
+            result = _measure(op, n, warmup)
+            print(
+                f"  {name:>16}: median {result['median_ms']:9.3f} ms, "
+                f"p95 {result['p95_ms']:9.3f} ms, {result['queries']} queries"
+            )
+            results.append(
+                {"database": connection.vendor, "rows": size, "case": name, **result}
+            )
+    return results
+
+
+def _key(result: dict):
+    return result["database"], result["rows"], result["case"]
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """The regressions of ``results`` against ``baseline``, as messages."""
+    previous = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        label = "{}/{}/{}".format(*_key(result))
+        change = result["median_ms"] / before["median_ms"] - 1
+        print(f"  {label:>40}: {change:+7.1%} median")
+        if change > threshold:
+            regressions.append(
+                f"{label}: median {before['median_ms']} -> "
+                f"{result['median_ms']} ms ({change:+.1%})"
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{label}: queries {before['queries']} -> {result['queries']}"
+            )
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help="comma-separated question counts"
+    )
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results JSON file")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown of a case's median",
+    )
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    setup_test_environment(debug=False)
+    # Request records would flood the console and time its I/O
+    logging.getLogger("backend.core.views").setLevel(logging.WARNING)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        # Bypass the response cache so repeated reads do the work every time
+        with override_settings(
+            CACHES={
+                **settings.CACHES,
+                "benchmark": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+            },
+            RESPONSE_CACHE_ALIAS="benchmark",
+        ):
+            results = run(sizes, args.iterations, args.warmup, args.seed)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    now = datetime.now(timezone.utc)
+    output = args.output or RESULTS_DIR / (
+        f"{connection.vendor}-{now:%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "meta": {
+                    "created_at": now.isoformat(),
+                    "commit": _git_commit(),
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "machine": platform.platform(),
+                    "iterations": args.iterations,
+                    "seed": args.seed,
+                },
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"results written to {output}")
+
+    if args.baseline:
+        print(f"compared to {args.baseline}:")
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("regressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+gunicorn settings read from the working directory (see Procfile).
+
+Workers share Prometheus metrics through PROMETHEUS_MULTIPROC_DIR; see
+backend/core/metrics.py.
+"""
+
+import glob
+import os
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "interview_q-prometheus"),
+)
+
+
+def on_starting(server):
+    # Samples of a previous run would otherwise be added to this one's
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)